@@ -143,11 +143,34 @@ def display_processing_status(controller: DataController):
     with col2:
         if status['cache_valid']:
             st.info(f"💾 Using cached data (expires: {status['cache_expires'][:19]})")
+        elif status['cache_available'] and status['refreshing']:
+            age_minutes = int((status['data_age_seconds'] or 0) // 60)
+            stages = ", ".join(sorted({state['stage'] for state in status['refresh'].values()
+                                       if state['stage'] in ("queued", "waiting", "fetching", "analyzing")}))
+            st.info(f"🔄 Refreshing in the background ({stages}); showing data from {age_minutes} min ago")
         elif status['cache_available']:
             st.warning("⚠️ Cache expired, refresh recommended")
         else:
             st.info("🆕 No cached data available")
 
+def display_live_sentiment(controller: DataController, stock_limit: int):
+    """Display the running per-text sentiment totals kept up to date by each fetch."""
+    live_mentions = controller.get_live_sentiment(stock_limit)
+    if not live_mentions:
+        return
+    
+    st.subheader("⚡ Live Sentiment")
+    st.caption(f"Averaged per post, title and comment as of "
+               f"{live_mentions[0].last_updated.strftime('%H:%M:%S')}; "
+               "only new and edited texts are scored on each fetch")
+    df = pd.DataFrame([{
+        'Ticker': stock.ticker,
+        'Texts': stock.mention_count,
+        'Sentiment Score': format_sentiment_score(stock.sentiment_score),
+        'Sentiment': stock.sentiment_category
+    } for stock in live_mentions])
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
 def create_sentiment_charts(stock_mentions: list[StockMention]):
     """Create interactive charts for sentiment analysis."""
     if not stock_mentions:
@@ -411,28 +434,8 @@ def main():
         post_limit = st.slider("Reddit Posts to Analyze", 10, 500, 200, 10)
         stock_limit = st.slider("Top Stocks to Show", 5, 50, 20, 1)
         
-        # Store settings in session state to detect changes
-        if 'prev_post_limit' not in st.session_state:
-            st.session_state.prev_post_limit = post_limit
-        if 'prev_stock_limit' not in st.session_state:
-            st.session_state.prev_stock_limit = stock_limit
-        
-        # Check if settings changed
-        settings_changed = (
-            st.session_state.prev_post_limit != post_limit or 
-            st.session_state.prev_stock_limit != stock_limit
-        )
-        
-        if settings_changed:
-            st.session_state.prev_post_limit = post_limit
-            st.session_state.prev_stock_limit = stock_limit
-            # Clear cache when settings change
-            try:
-                controller.force_refresh(post_limit, stock_limit)
-                st.success("⚡ Settings updated! Fetching new data...")
-                st.rerun()
-            except:
-                pass  # Handle gracefully if controller not initialized yet
+        # Results are cached per (post limit, stock limit), so moving a slider
+        # reuses or derives a cached result instead of refetching everything
         
         # Refresh button - now clears cache for fresh data
         if st.button("🔄 Refresh Data", type="primary", use_container_width=True):
@@ -478,6 +481,7 @@ def main():
             create_sentiment_charts(stock_data)
             analyze_market_insights(stock_data)
             create_sentiment_timeline(stock_data)
+            display_live_sentiment(controller, stock_limit)
             
         else:
             st.warning("📭 No stock data found. This could be due to:")
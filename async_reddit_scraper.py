@@ -0,0 +1,248 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+import aiohttp
+from models import RedditPost
+from reddit_scraper import parse_listing, parse_comments
+
+
+class AsyncTokenBucket:
+    def __init__(self, rate: float = 1.0, capacity: float = 1.0):
+        """
+        Initialize an asyncio token bucket rate limiter.
+        
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class AsyncRedditScraper:
+    def __init__(self, user_agent: str = "RedditSentimentTracker/1.0",
+                 base_url: str = "https://www.reddit.com",
+                 requests_per_second: float = 1.0, burst: int = 1,
+                 max_connections: int = 10, timeout: float = 10.0):
+        """
+        Initialize an asyncio Reddit scraper using JSON feeds (no authentication required).
+        
+        Use as an async context manager (or call close()) so the pooled
+        connections are released.
+        
+        Args:
+            user_agent: User agent string for requests
+            base_url: Reddit origin; point this at a local server in tests
+            requests_per_second: Sustained request rate shared by all coroutines
+            burst: Number of requests allowed back to back before throttling
+            max_connections: Size of the keep-alive connection pool
+            timeout: Total timeout per request in seconds
+        """
+        self.user_agent = user_agent
+        self.base_url = base_url.rstrip('/')
+        self.rate_limiter = AsyncTokenBucket(requests_per_second, burst)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> "AsyncRedditScraper":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP session and its connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled keep-alive session on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': self.user_agent},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def _make_request(self, path: str) -> dict:
+        """
+        Make a rate-limited request to a Reddit JSON endpoint.
+        
+        Args:
+            path: Path and query relative to base_url
+        
+        Returns:
+            Parsed JSON response
+        
+        Raises:
+            Exception: If request fails
+        """
+        await self.rate_limiter.acquire()
+        
+        try:
+            async with self._get_session().get(self.base_url + path) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise Exception(f"Failed to fetch data from Reddit: {str(e)}")
+        except ValueError as e:
+            raise Exception(f"Failed to parse Reddit JSON response: {str(e)}")
+    
+    async def _get_listing(self, subreddit_name: str, feed: str, limit: int) -> List[RedditPost]:
+        """Page through a subreddit listing (hot/new) until limit posts are collected."""
+        all_posts = []
+        after = None
+        posts_per_request = min(100, limit)  # Reddit max is ~100 per request
+        
+        while len(all_posts) < limit:
+            current_limit = min(posts_per_request, limit - len(all_posts))
+            path = f"/r/{subreddit_name}/{feed}.json?limit={current_limit}"
+            if after:
+                path += f"&after={after}"
+            
+            posts_batch, after = parse_listing(await self._make_request(path))
+            
+            if not posts_batch:
+                break  # No more posts available
+            
+            all_posts.extend(posts_batch)
+            
+            if not after:
+                break  # No more pages
+        
+        return all_posts[:limit]
+    
+    async def get_hot_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100) -> List[RedditPost]:
+        """
+        Fetch hot posts from a subreddit with pagination support.
+        
+        Raises:
+            Exception: If fetch fails
+        """
+        try:
+            return await self._get_listing(subreddit_name, "hot", limit)
+        except Exception as e:
+            raise Exception(f"Failed to fetch posts from r/{subreddit_name}: {str(e)}")
+    
+    async def get_new_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100) -> List[RedditPost]:
+        """
+        Fetch newest posts from a subreddit with pagination support.
+        
+        Raises:
+            Exception: If fetch fails
+        """
+        try:
+            return await self._get_listing(subreddit_name, "new", limit)
+        except Exception as e:
+            raise Exception(f"Failed to fetch new posts from r/{subreddit_name}: {str(e)}")
+    
+    async def get_post_comments(self, post_id: str, limit: int = 50) -> List[str]:
+        """
+        Fetch top-level comments for a specific post.
+        
+        Raises:
+            Exception: If fetch fails
+        """
+        try:
+            data = await self._make_request(f"/comments/{post_id}.json?limit={limit}")
+            return parse_comments(data, limit)
+        except Exception as e:
+            raise Exception(f"Failed to fetch comments for post {post_id}: {str(e)}")
+    
+    async def _get_post_comments_or_empty(self, post_id: str, limit: int) -> List[str]:
+        """Fetch comments for a post, returning an empty list if fetching fails."""
+        try:
+            return await self.get_post_comments(post_id, limit)
+        except Exception:
+            return []
+    
+    async def get_posts_with_comments(self, subreddit_name: str = "wallstreetbets",
+                                      post_limit: int = 50, comment_limit: int = 20,
+                                      use_new_feed: bool = False) -> List[RedditPost]:
+        """
+        Fetch posts and fan out comment fetches for all of them concurrently.
+        
+        A failed comment fetch leaves that post with empty comments.
+        """
+        if use_new_feed:
+            posts = await self.get_new_posts(subreddit_name, post_limit)
+        else:
+            posts = await self.get_hot_posts(subreddit_name, post_limit)
+        
+        all_comments = await asyncio.gather(
+            *(self._get_post_comments_or_empty(post.id, comment_limit) for post in posts)
+        )
+        for post, comments in zip(posts, all_comments):
+            post.comments = comments
+        
+        return posts
+    
+    async def get_subreddits_posts(self, subreddit_names: List[str], limit: int = 100,
+                                   use_new_feed: bool = False) -> Dict[str, List[RedditPost]]:
+        """
+        Fetch listings for several subreddits concurrently under the shared rate limit.
+        
+        Returns:
+            Dictionary mapping subreddit name to its posts (empty list if that fetch failed)
+        """
+        fetch = self.get_new_posts if use_new_feed else self.get_hot_posts
+        results = await asyncio.gather(
+            *(fetch(name, limit) for name in subreddit_names), return_exceptions=True
+        )
+        return {
+            name: [] if isinstance(result, Exception) else result
+            for name, result in zip(subreddit_names, results)
+        }
+    
+    async def get_mixed_feed(self, subreddit_name: str = "wallstreetbets",
+                             total_limit: int = 50) -> List[RedditPost]:
+        """
+        Get a mix of hot (70%) and new (30%) posts, fetched concurrently.
+        """
+        try:
+            hot_limit = int(total_limit * 0.7)
+            new_limit = total_limit - hot_limit
+            
+            hot_posts, new_posts = await asyncio.gather(
+                self.get_hot_posts(subreddit_name, hot_limit),
+                self.get_new_posts(subreddit_name, new_limit)
+            )
+            
+            # Combine and remove duplicates by ID
+            seen_ids = set()
+            mixed_posts = []
+            
+            for post in hot_posts + new_posts:
+                if post.id not in seen_ids:
+                    seen_ids.add(post.id)
+                    mixed_posts.append(post)
+            
+            # Sort by creation time (newest first) and limit
+            mixed_posts.sort(key=lambda x: x.created_utc, reverse=True)
+            return mixed_posts[:total_limit]
+        
+        except Exception:
+            # Fallback to just hot posts
+            return await self.get_hot_posts(subreddit_name, total_limit)
\ No newline at end of file
@@ -0,0 +1,80 @@
+import argparse
+import random
+import time
+from typing import List
+from stock_extractor import StockExtractor
+
+
+WORDS = [
+    "the", "market", "is", "going", "to", "print", "calls", "puts", "I", "think", "this",
+    "DD", "YOLO", "earnings", "guidance", "revenue", "EPS", "CEO", "said", "moon", "bag",
+    "holders", "BUY", "SELL", "HOLD", "short", "squeeze", "IV", "crush", "theta", "gang",
+    "FOMO", "Q3", "beat", "miss", "shares", "strike", "expiry", "100k", "loss", "porn",
+]
+TICKERS = ["AAPL", "TSLA", "GME", "AMC", "NVDA", "SPY", "PLTR", "MSFT", "amd", "$COIN", "(BB)"]
+
+
+def build_corpus(total_bytes: int, text_length: int, seed: int = 0) -> List[str]:
+    """
+    Generate WSB-style texts of roughly text_length characters each.
+    
+    Args:
+        total_bytes: Approximate size of the corpus
+        text_length: Approximate length of each text (comments ~100, DD posts ~5000)
+        seed: Random seed so runs are comparable
+    
+    Returns:
+        List of texts
+    """
+    rng = random.Random(seed)
+    texts = []
+    size = 0
+    while size < total_bytes:
+        words = []
+        length = 0
+        while length < text_length:
+            word = rng.choice(TICKERS) if rng.random() < 0.05 else rng.choice(WORDS)
+            words.append(word + rng.choice([" ", " ", " ", ", ", ". ", "!\n"]))
+            length += len(words[-1])
+        text = "".join(words)
+        texts.append(text)
+        size += len(text)
+    return texts
+
+
+def run(engine: str, texts: List[str], repeat: int) -> float:
+    """Return the best throughput of an engine over the corpus in MB/s."""
+    extractor = StockExtractor(matcher=engine, memo_size=0)
+    extractor.extract_tickers("warm up AAPL")
+    megabytes = sum(len(text) for text in texts) / 1e6
+    
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            extractor.extract_tickers(text)
+        best = min(best, time.perf_counter() - start)
+    return megabytes / best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare ticker matcher throughput against the regex path")
+    parser.add_argument("--megabytes", type=float, default=5.0, help="Corpus size per text shape")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per engine (best is reported)")
+    args = parser.parse_args()
+    
+    engines = ["regex", "token", "trie"]
+    for label, text_length in (("comments (~100 chars)", 100), ("DD posts (~5000 chars)", 5000)):
+        texts = build_corpus(int(args.megabytes * 1e6), text_length)
+        
+        reference = [StockExtractor(matcher="regex", memo_size=0).extract_tickers(text) for text in texts]
+        for engine in engines[1:]:
+            extractor = StockExtractor(matcher=engine, memo_size=0)
+            assert [extractor.extract_tickers(text) for text in texts] == reference, engine
+        
+        print(label)
+        baseline = None
+        for engine in engines:
+            throughput = run(engine, texts, args.repeat)
+            baseline = baseline or throughput
+            print(f"  {engine:<6} {throughput:8.1f} MB/s  ({throughput / baseline:.2f}x)")
\ No newline at end of file
@@ -1,27 +1,103 @@
-import json
+import hashlib
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import logging
 from reddit_scraper import RedditScraper
+from response_cache import ResponseCache
+from score_cache import ScoreCache
 from stock_extractor import StockExtractor
 from sentiment_analyzer import SentimentAnalyzer
-from models import StockMention, RedditPost, SentimentResult
+from models import StockMention, RedditPost, SentimentResult, TickerIndex
+from parallel_pipeline import ParallelPipeline
+from post_store import PostStore
+from sentiment_aggregator import SentimentAggregator
+from refresh_lock import RefreshLock
+from json_snapshot import JsonSnapshot
+
+
+# Refresh stages during which another refresh of the same request is not started
+_REFRESH_RUNNING = ("queued", "waiting", "fetching", "analyzing")
 
 
 class DataController:
-    def __init__(self, cache_duration_minutes: int = 30):
+    # Refreshes in flight or finished in this process, by cache file and request key;
+    # shared by every controller so a rerun that builds a new one sees them
+    _refreshes: Dict[str, Dict] = {}
+    _refreshes_lock = threading.Lock()
+    # Serializes read-modify-write of cache files between threads (a file lock
+    # does the same between processes, see _store_entry)
+    _cache_lock = threading.Lock()
+    # Last time each cached result was served in this process, by cache file and
+    # request key; exact hits only record it here and it reaches the file with
+    # the next write, so serving a result never rewrites the cache
+    _last_used: Dict[str, str] = {}
+    
+    def __init__(self, cache_duration_minutes: int = 30, response_cache_dir: str = ".reddit_cache",
+                 subreddits: Optional[List[str]] = None, parallel_workers: int = 1,
+                 score_cache_path: str = ".sentiment_cache.sqlite", sentence_window: Optional[int] = None,
+                 store_path: str = ".reddit_store.sqlite", store_retention_days: int = 7,
+                 feed: str = "hot", max_cached_results: int = 16, background_refresh: bool = True,
+                 max_stale_minutes: int = 1440, refresh_wait_seconds: float = 300,
+                 refresh_retry_seconds: float = 300, aggregate_path: Optional[str] = None):
         """
         Initialize the data controller with all processing components.
         
         Args:
             cache_duration_minutes: How long to cache data before refreshing
+            response_cache_dir: Directory for cached Reddit HTTP responses
+            subreddits: Subreddits to ingest (defaults to wallstreetbets only)
+            parallel_workers: Processes used for extraction and scoring of large
+                corpora (defaults to 1, which keeps everything in-process)
+            score_cache_path: SQLite file caching sentiment scores across refreshes
+            sentence_window: Score only this many sentences around each ticker
+                mention instead of whole texts (None scores whole texts)
+            store_path: SQLite file keeping posts, comments, per-text scores and
+                mentions across refreshes
+            store_retention_days: Posts not fetched for this long are pruned from the store
+            feed: Listing to ingest, "hot" or "new"
+            max_cached_results: Request shapes (subreddits, feed, post_limit,
+                top_stocks_limit) whose results are cached at once
+            background_refresh: Serve an expired result immediately and rebuild
+                it in a background thread instead of blocking the caller
+            max_stale_minutes: How long past expiry a result may still be served
+                (and is kept in the cache) while it is being rebuilt
+            refresh_wait_seconds: How long a refresh waits for another thread or
+                process already refreshing the same request before giving up
+            refresh_retry_seconds: How long after a failed background refresh
+                of a request another one may be started
+            aggregate_path: JSON checkpoint of the live per-ticker sentiment
+                totals (defaults to a file next to store_path)
         """
-        self.reddit_scraper = RedditScraper()
+        # Subreddit names are case-insensitive; lower-case them so rankings and
+        # cache keys do not depend on how a name was typed
+        self.subreddits = list(dict.fromkeys(name.lower() for name in subreddits or ["wallstreetbets"]))
+        self.feed = feed
+        self.reddit_scraper = RedditScraper(response_cache=ResponseCache(response_cache_dir))
         self.stock_extractor = StockExtractor()
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer = SentimentAnalyzer(score_cache=ScoreCache(score_cache_path),
+                                                    sentence_window=sentence_window,
+                                                    find_tickers=self.stock_extractor.extract_tickers)
+        self.parallel_pipeline = ParallelPipeline(max_workers=parallel_workers)
+        self.post_store = PostStore(store_path)
+        self.store_retention = timedelta(days=store_retention_days)
+        aggregate_path = aggregate_path or os.path.splitext(store_path)[0] + ".aggregate.json"
+        self.sentiment_aggregator = SentimentAggregator(aggregate_path)
+        # When the live totals were last brought up to date (the checkpoint's time after a restart)
+        self._aggregate_updated: Optional[datetime] = (
+            datetime.fromtimestamp(os.path.getmtime(aggregate_path)) if os.path.exists(aggregate_path) else None
+        )
         self.cache_duration = timedelta(minutes=cache_duration_minutes)
         self.cache_file = "data_cache.json"
+        self.max_cached_results = max_cached_results
+        self.background_refresh = background_refresh
+        self.max_stale = timedelta(minutes=max_stale_minutes)
+        self.refresh_wait = refresh_wait_seconds
+        self.refresh_retry = timedelta(seconds=refresh_retry_seconds)
+        # Request shape of the last process_reddit_data call, whose cached result
+        # get_cached_data, get_subreddit_rankings and get_processing_status report
+        self._last_request: Optional[Dict] = None
         
         # Set up logging
         logging.basicConfig(level=logging.INFO)
@@ -34,167 +110,697 @@ class DataController:
         Args:
             post_limit: Number of Reddit posts to fetch
             top_stocks_limit: Number of top mentioned stocks to return
-            
+        
         Returns:
             List of StockMention objects with sentiment analysis
         """
         try:
             self.logger.info(f"Starting data processing pipeline with {post_limit} posts")
+            request = self._request_shape(post_limit, top_stocks_limit)
+            self._last_request = request
             
-            # Step 1: Check cache first
-            cached_data = self._load_cache()
-            if cached_data and self._is_cache_valid(cached_data):
+            # Step 1: Check cache first (this request shape, or one derivable from a larger one)
+            cached_result = self._get_cached_result(request)
+            if cached_result is not None:
                 self.logger.info("Using cached data")
-                return self._deserialize_stock_mentions(cached_data['stock_mentions'])
+                return cached_result
+            
+            # Stale-while-revalidate: an expired result is served as is while a worker rebuilds it
+            if self.background_refresh:
+                stale_result = self._get_stale_result(request)
+                if stale_result is not None:
+                    self.logger.info("Using expired cached data while refreshing in the background")
+                    self._start_background_refresh(request)
+                    return stale_result
+            
+            result = self._refresh(request)
+            if result is None:
+                return self._get_fallback_data(request)
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"Error in data processing pipeline: {str(e)}")
+            return self._get_fallback_data(self._last_request)
+    
+    def _refresh(self, request: Dict) -> Optional[List[StockMention]]:
+        """
+        Fetch and analyze the posts of a request, recording progress for get_processing_status.
+        
+        Refreshes are single-flight per request shape: a file lock in the
+        cache directory lets one thread or process crawl while the others
+        wait for it and are then served its result from the cache.
+        
+        Args:
+            request: Request shape to rebuild
+        
+        Returns:
+            List of StockMention objects, or None if no posts were retrieved
+            or another refresh did not finish in time
+        """
+        lock = RefreshLock(self._refresh_lock_path(request))
+        if not lock.acquire(timeout=0):
+            # Report the wait unless this process is the one refreshing (its progress is more useful)
+            reported = self._claim_refresh_state(request, stage="waiting", started=datetime.now().isoformat(),
+                                                 finished=None, posts=None, error=None)
+            if not lock.acquire(timeout=self.refresh_wait):
+                self.logger.warning("Timed out waiting for another refresh of the same request")
+                if reported:
+                    self._set_refresh_state(request, stage="failed", finished=datetime.now().isoformat(),
+                                            error="Timed out waiting for another refresh")
+                return None
+        
+        try:
+            # The refresh we waited for (if any) may already have produced this result
+            shared_result = self._get_cached_result(request)
+            if shared_result is not None:
+                self.logger.info("Using the result of a concurrent refresh")
+                self._set_refresh_state(request, stage="done", finished=datetime.now().isoformat())
+                return shared_result
             
             # Step 2: Scrape Reddit data
-            self.logger.info("Fetching Reddit posts...")
-            posts = self.reddit_scraper.get_hot_posts(limit=post_limit)
+            self._set_refresh_state(request, stage="fetching", started=datetime.now().isoformat(),
+                                    finished=None, posts=None, error=None)
+            self.logger.info(f"Fetching Reddit posts from r/{'+'.join(self.subreddits)}...")
+            posts = self._fetch_posts(request["post_limit"])
             
             if not posts:
                 self.logger.warning("No posts retrieved from Reddit")
-                return self._get_fallback_data()
+                self._set_refresh_state(request, stage="failed", finished=datetime.now().isoformat(),
+                                        error="No posts retrieved")
+                return None
             
             self.logger.info(f"Retrieved {len(posts)} posts from Reddit")
+            self._set_refresh_state(request, stage="analyzing", posts=len(posts))
+            result = self._analyze_posts(posts, request)
+            self._set_refresh_state(request, stage="done", finished=datetime.now().isoformat())
+            return result
+        except Exception as e:
+            self._set_refresh_state(request, stage="failed", finished=datetime.now().isoformat(), error=str(e))
+            raise
+        finally:
+            lock.release()
+    
+    def _refresh_lock_path(self, request: Dict) -> str:
+        """Lock file serializing refreshes of one request shape into one cache file."""
+        directory = os.path.join(os.path.dirname(os.path.abspath(self.cache_file)), ".refresh_locks")
+        digest = hashlib.sha1(self._request_key(request).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(directory, f"{os.path.basename(self.cache_file)}.{digest}.lock")
+    
+    def _start_background_refresh(self, request: Dict) -> bool:
+        """
+        Rebuild a request's result in a daemon thread unless one is already running.
+        
+        The new result replaces the served one in a single cache write, so
+        readers see either the old or the new result, never a mix. After a
+        failed refresh, no new one starts until refresh_retry has passed, so
+        reruns of a failing dashboard do not each start a full crawl.
+        
+        Args:
+            request: Request shape to rebuild
+        
+        Returns:
+            True if a refresh was started
+        """
+        state_key = self._refresh_state_key(request)
+        with DataController._refreshes_lock:
+            state = DataController._refreshes.get(state_key)
+            if state is not None and state["stage"] in _REFRESH_RUNNING:
+                return False
+            if state is not None and state["stage"] == "failed" and state.get("finished"):
+                if datetime.now() - datetime.fromisoformat(state["finished"]) < self.refresh_retry:
+                    return False
+            DataController._refreshes[state_key] = {
+                "cache_file": os.path.abspath(self.cache_file),
+                "request": request,
+                "stage": "queued",
+                "started": datetime.now().isoformat(),
+                "finished": None,
+                "posts": None,
+                "error": None
+            }
+        
+        thread = threading.Thread(target=self._run_background_refresh, args=(request,),
+                                  name=f"refresh-{self._request_key(request)}", daemon=True)
+        thread.start()
+        return True
+    
+    def _run_background_refresh(self, request: Dict) -> None:
+        """Thread body of a background refresh."""
+        try:
+            self._refresh(request)
+        except Exception as e:
+            self.logger.error(f"Error in background refresh: {str(e)}")
+    
+    def _refresh_state_key(self, request: Dict) -> str:
+        """Key a refresh by the cache file it writes and its request shape."""
+        return f"{os.path.abspath(self.cache_file)}|{self._request_key(request)}"
+    
+    def _set_refresh_state(self, request: Dict, **fields) -> None:
+        """Update the progress of a request's refresh."""
+        state_key = self._refresh_state_key(request)
+        with DataController._refreshes_lock:
+            state = DataController._refreshes.setdefault(state_key, {
+                "cache_file": os.path.abspath(self.cache_file),
+                "request": request
+            })
+            state.update(fields)
+    
+    def _claim_refresh_state(self, request: Dict, **fields) -> bool:
+        """Update a request's refresh progress unless a refresh in this process is under way."""
+        state_key = self._refresh_state_key(request)
+        with DataController._refreshes_lock:
+            state = DataController._refreshes.get(state_key)
+            if state is not None and state.get("stage") in _REFRESH_RUNNING and state["stage"] != "queued":
+                return False
+            DataController._refreshes[state_key] = dict(state or {}, cache_file=os.path.abspath(self.cache_file),
+                                                        request=request, **fields)
+            return True
+    
+    def get_refresh_states(self) -> Dict[str, Dict]:
+        """
+        Get the progress of refreshes of this controller's cache file in this process.
+        
+        Returns:
+            Dictionary mapping request key to its last refresh: stage ("queued",
+            "waiting", "fetching", "analyzing", "done" or "failed"), start and
+            finish times, posts fetched and error
+        """
+        cache_file = os.path.abspath(self.cache_file)
+        with DataController._refreshes_lock:
+            return {
+                self._request_key(state["request"]): dict(state)
+                for state in DataController._refreshes.values()
+                if state["cache_file"] == cache_file
+            }
+    
+    def _fetch_posts(self, post_limit: int) -> List[RedditPost]:
+        """Fetch up to post_limit posts from the configured subreddits and feed."""
+        if len(self.subreddits) == 1:
+            if self.feed == "new":
+                return self.reddit_scraper.get_new_posts(self.subreddits[0], limit=post_limit)
+            return self.reddit_scraper.get_hot_posts(self.subreddits[0], limit=post_limit)
+        if self.feed == "new":
+            return self.reddit_scraper.get_multi_subreddit_posts(self.subreddits, limit=post_limit,
+                                                                 use_new_feed=True)
+        return self.reddit_scraper.get_multi_subreddit_posts(self.subreddits, limit=post_limit)
+    
+    def _analyze_posts(self, posts: List[RedditPost], request: Dict,
+                       timestamp: Optional[datetime] = None) -> List[StockMention]:
+        """
+        Extract, score and cache the top stocks of a list of posts.
+        
+        Args:
+            posts: Posts in listing order
+            request: Request shape the result is cached under
+            timestamp: Time the posts were fetched (defaults to now)
+        
+        Returns:
+            List of StockMention objects sorted by mention count
+        """
+        top_stocks_limit = request["top_stocks_limit"]
+        
+        # Only new or edited posts need extraction and scoring; the rest come from the store
+        known_scores = self._load_from_store(posts)
+        
+        # Keep the live per-ticker totals in step with the fetched window
+        self._update_aggregate(posts)
+        
+        # Step 3: Extract stock mentions (one pass builds the ticker -> text index)
+        self.logger.info("Extracting stock tickers...")
+        ticker_index = self.parallel_pipeline.build_index(self.stock_extractor, posts)
+        top_mentioned = ticker_index.top_mentioned(top_stocks_limit)
+        
+        if not top_mentioned:
+            self.logger.warning("No stock tickers found in posts")
+            return []
+        
+        self.logger.info(f"Found {len(top_mentioned)} top mentioned stocks")
+        
+        # Step 4: Analyze sentiment for each stock
+        self.logger.info("Analyzing sentiment...")
+        try:
+            self._apply_known_scores(ticker_index, known_scores)
+            # Score every needed snippet in one batch (sharded across processes for large corpora)
+            self.parallel_pipeline.score_snippets(self.sentiment_analyzer, self.stock_extractor,
+                                                  ticker_index, list(top_mentioned))
+        except Exception as e:
+            self.logger.error(f"Batch sentiment scoring failed, scoring per ticker: {str(e)}")
+        
+        stock_mentions = []
+        
+        for ticker, mention_count in top_mentioned.items():
+            try:
+                sentiment_result = self.sentiment_analyzer.analyze_indexed_sentiment(ticker_index, ticker)
+                
+                stock_mention = StockMention(
+                    ticker=ticker,
+                    mention_count=mention_count,
+                    sentiment_score=sentiment_result.compound_score,
+                    sentiment_category=sentiment_result.category,
+                    last_updated=datetime.now()
+                )
+                
+                stock_mentions.append(stock_mention)
             
-            # Step 3: Extract stock mentions
-            self.logger.info("Extracting stock tickers...")
-            top_mentioned = self.stock_extractor.get_top_mentioned(posts, limit=top_stocks_limit)
-            
-            if not top_mentioned:
-                self.logger.warning("No stock tickers found in posts")
-                return []
-            
-            self.logger.info(f"Found {len(top_mentioned)} top mentioned stocks")
-            
-            # Step 4: Analyze sentiment for each stock
-            self.logger.info("Analyzing sentiment...")
-            stock_mentions = []
-            
-            for ticker, mention_count in top_mentioned.items():
-                try:
-                    sentiment_result = self.sentiment_analyzer.analyze_stock_sentiment(posts, ticker)
-                    
-                    stock_mention = StockMention(
-                        ticker=ticker,
-                        mention_count=mention_count,
-                        sentiment_score=sentiment_result.compound_score,
-                        sentiment_category=sentiment_result.category,
-                        last_updated=datetime.now()
-                    )
-                    
-                    stock_mentions.append(stock_mention)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error analyzing sentiment for {ticker}: {str(e)}")
-                    # Create a neutral sentiment entry for failed analysis
-                    stock_mention = StockMention(
-                        ticker=ticker,
-                        mention_count=mention_count,
-                        sentiment_score=0.0,
-                        sentiment_category="Neutral",
-                        last_updated=datetime.now()
-                    )
-                    stock_mentions.append(stock_mention)
-            
-            # Step 5: Sort by mention count (descending)
-            stock_mentions.sort(key=lambda x: x.mention_count, reverse=True)
-            
-            # Step 6: Cache the results
-            self._save_cache(stock_mentions, posts)
-            
-            self.logger.info(f"Data processing completed successfully with {len(stock_mentions)} stocks")
-            return stock_mentions
-            
+            except Exception as e:
+                self.logger.error(f"Error analyzing sentiment for {ticker}: {str(e)}")
+                # Create a neutral sentiment entry for failed analysis
+                stock_mention = StockMention(
+                    ticker=ticker,
+                    mention_count=mention_count,
+                    sentiment_score=0.0,
+                    sentiment_category="Neutral",
+                    last_updated=datetime.now()
+                )
+                stock_mentions.append(stock_mention)
+        
+        # Step 5: Sort by mention count (descending)
+        stock_mentions.sort(key=lambda x: x.mention_count, reverse=True)
+        
+        # Step 6: Cache the results along with per-subreddit rankings from the same pass
+        subreddit_rankings = {
+            subreddit: ticker_index.top_mentioned(top_stocks_limit, subreddit=subreddit)
+            for subreddit in self.subreddits
+        }
+        self._save_cache(stock_mentions, posts, subreddit_rankings, request=request, timestamp=timestamp)
+        self._save_to_store(posts, ticker_index)
+        
+        self.logger.info(f"Data processing completed successfully with {len(stock_mentions)} stocks")
+        return stock_mentions
+    
+    def _update_aggregate(self, posts: List[RedditPost]) -> None:
+        """
+        Add new and edited texts of the posts to the live sentiment totals.
+        
+        Texts of posts that left the fetched window are retracted, and the
+        totals are checkpointed when anything changed. A failure is logged
+        and leaves the totals as they were; the refresh itself goes on.
+        
+        Args:
+            posts: Posts as currently fetched
+        """
+        try:
+            retracted = self.sentiment_aggregator.retain_posts(post.id for post in posts)
+            scored = self.sentiment_aggregator.sync_posts(posts, self.stock_extractor,
+                                                          self.sentiment_analyzer)
+            if retracted or scored:
+                self.sentiment_aggregator.checkpoint()
+            self._aggregate_updated = datetime.now()
         except Exception as e:
-            self.logger.error(f"Error in data processing pipeline: {str(e)}")
-            return self._get_fallback_data()
+            self.logger.error(f"Updating live sentiment totals failed: {str(e)}")
+    
+    def get_live_sentiment(self, top_stocks_limit: int = 20) -> List[StockMention]:
+        """
+        Get the most mentioned stocks from the live sentiment totals.
+        
+        The totals follow the posts of the last fetch of any request shape,
+        scoring only texts that are new or edited since the fetch before.
+        
+        Args:
+            top_stocks_limit: Number of stocks to return
+        
+        Returns:
+            StockMention objects sorted by the number of texts mentioning each
+            stock, empty if nothing has been fetched yet
+        """
+        counts = self.sentiment_aggregator.get_mention_counts()
+        stock_mentions = []
+        for ticker in list(counts)[:top_stocks_limit]:
+            sentiment_result = self.sentiment_aggregator.get_sentiment(ticker)
+            stock_mentions.append(StockMention(
+                ticker=ticker,
+                mention_count=counts[ticker],
+                sentiment_score=sentiment_result.compound_score,
+                sentiment_category=sentiment_result.category,
+                last_updated=self._aggregate_updated
+            ))
+        return stock_mentions
     
     def get_cached_data(self) -> Optional[List[StockMention]]:
         """
         Get cached data if available and valid.
         
+        The result of the request shape last passed to process_reddit_data is
+        returned when it is cached, otherwise the most recently stored result.
+        
         Returns:
             List of StockMention objects from cache, or None if no valid cache
         """
-        cached_data = self._load_cache()
+        cached_data = self._current_entry()
         if cached_data and self._is_cache_valid(cached_data):
             return self._deserialize_stock_mentions(cached_data['stock_mentions'])
         return None
     
+    def get_subreddit_rankings(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-subreddit mention rankings from the last processed data.
+        
+        Returns:
+            Dictionary mapping subreddit name to {ticker: mention_count}, sorted by count
+        """
+        cached_data = self._current_entry()
+        if cached_data:
+            return cached_data.get("subreddit_rankings", {})
+        return {}
+    
     def force_refresh(self, post_limit: int = 200, top_stocks_limit: int = 20) -> List[StockMention]:
         """
-        Force refresh data by clearing cache and processing new data.
+        Force refresh data by dropping the cached result of this request and processing new data.
+        
+        Results cached for other request shapes are kept.
         
         Args:
             post_limit: Number of Reddit posts to fetch
             top_stocks_limit: Number of top mentioned stocks to return
-            
+        
         Returns:
             List of StockMention objects with fresh data
         """
-        self._clear_cache()
+        self._drop_entry(self._request_shape(post_limit, top_stocks_limit))
         return self.process_reddit_data(post_limit, top_stocks_limit)
     
     def get_processing_status(self) -> Dict[str, any]:
         """
         Get status information about the data processing components.
         
+        Cache freshness (cache_valid, last_update, data_age_seconds, ...) is
+        that of the result served for the request shape last passed to
+        process_reddit_data.
+        
         Returns:
             Dictionary with status information
         """
-        cached_data = self._load_cache()
+        cached_data = self._current_entry()
         cache_valid = cached_data and self._is_cache_valid(cached_data)
         
         status = {
             "reddit_scraper_ready": self.reddit_scraper.is_authenticated(),
+            "rate_limit": self.reddit_scraper.get_rate_limit_state(),
+            "response_cache": self.reddit_scraper.get_cache_stats(),
+            "extraction_memo": self.stock_extractor.get_memo_stats(),
+            "score_cache": self.sentiment_analyzer.get_cache_stats(),
+            "sentiment_kernel": self.sentiment_analyzer.get_kernel_stats(),
             "cache_available": cached_data is not None,
             "cache_valid": cache_valid,
             "last_update": None,
-            "cache_expires": None
+            "cache_expires": None,
+            "data_age_seconds": None,
+            "serving_stale": bool(cached_data) and not cache_valid,
+            "refresh": self.get_refresh_states(),
+            "cache_snapshot": self._cache_snapshot().get_stats()
         }
+        status["refreshing"] = any(state.get("stage") in _REFRESH_RUNNING for state in status["refresh"].values())
         
         if cached_data:
             status["last_update"] = cached_data.get("timestamp")
+            try:
+                cache_time = datetime.fromisoformat(cached_data["timestamp"])
+                status["data_age_seconds"] = (datetime.now() - cache_time).total_seconds()
+            except Exception:
+                pass
             if cache_valid:
                 cache_time = datetime.fromisoformat(cached_data["timestamp"])
                 status["cache_expires"] = (cache_time + self.cache_duration).isoformat()
         
         return status
     
+    def _load_from_store(self, posts: List[RedditPost]) -> Dict[str, tuple]:
+        """
+        Upsert the fetched posts and reuse the analysis stored for unchanged ones.
+        
+        Tickers of known texts are seeded into the extractor's memo. Known
+        scores are returned so they can be put on the ticker index.
+        """
+        try:
+            changed = self.post_store.upsert_posts(posts)
+            known_tickers, known_scores = self.post_store.get_known_texts(
+                posts, self.stock_extractor.universe_fingerprint(), self.sentiment_analyzer.version
+            )
+            self.stock_extractor.remember(known_tickers)
+            self.logger.info(f"{len(changed)} of {len(posts)} posts are new or changed")
+            return known_scores
+        except Exception as e:
+            self.logger.error(f"Error reading the post store: {str(e)}")
+            return {}
+    
+    def _apply_known_scores(self, ticker_index: TickerIndex, known_scores: Dict[str, tuple]) -> None:
+        """Put stored scores on the index so only new texts are scored."""
+        if not known_scores:
+            return
+        for snippet_id, text in enumerate(ticker_index.snippets):
+            scores = known_scores.get(text)
+            if scores is not None and snippet_id not in ticker_index.snippet_scores:
+                ticker_index.snippet_scores[snippet_id] = self.sentiment_analyzer._result_from_scores(*scores)
+    
+    def _save_to_store(self, posts: List[RedditPost], ticker_index: TickerIndex) -> None:
+        """Store this refresh's mentions and scores, and prune posts past the retention window."""
+        try:
+            tickers_by_text = {}
+            for ticker, snippet_ids in ticker_index.ticker_snippets.items():
+                for snippet_id in snippet_ids:
+                    tickers_by_text.setdefault(ticker_index.snippets[snippet_id], set()).add(ticker)
+            scores_by_text = {
+                ticker_index.snippets[snippet_id]: self.sentiment_analyzer._scores_of(result)
+                for snippet_id, result in ticker_index.snippet_scores.items()
+            }
+            self.post_store.save_analysis(posts, tickers_by_text, scores_by_text,
+                                          self.stock_extractor.universe_fingerprint(),
+                                          self.sentiment_analyzer.version)
+            self.post_store.prune(datetime.now() - self.store_retention)
+        except Exception as e:
+            self.logger.error(f"Error saving to the post store: {str(e)}")
+    
+    def _cache_snapshot(self) -> JsonSnapshot:
+        """Process-wide holder of the parsed cache file."""
+        return JsonSnapshot.for_path(self.cache_file)
+    
+    def _current_entry(self) -> Optional[Dict]:
+        """
+        Get the cached result of the request shape last passed to process_reddit_data.
+        
+        Before the first request, the top level of the cache file (the most
+        recently stored result) is used. Once a request was made, results of
+        other shapes are never returned in its place.
+        """
+        cached_data = self._load_cache()
+        if cached_data and self._last_request is not None:
+            return cached_data.get("results", {}).get(self._request_key(self._last_request))
+        return cached_data
+    
     def _load_cache(self) -> Optional[Dict]:
-        """Load cached data from file."""
+        """
+        Load cached data, parsing the file only if it changed since it was last read.
+        
+        The returned dictionary is shared by every reader in the process and
+        must not be modified.
+        """
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
+            return self._cache_snapshot().load()
         except Exception as e:
             self.logger.error(f"Error loading cache: {str(e)}")
         return None
     
-    def _save_cache(self, stock_mentions: List[StockMention], posts: List[RedditPost]) -> None:
-        """Save data to cache file."""
+    def _save_cache(self, stock_mentions: List[StockMention], posts: List[RedditPost],
+                    subreddit_rankings: Optional[Dict[str, Dict[str, int]]] = None,
+                    request: Optional[Dict] = None, timestamp: Optional[datetime] = None) -> None:
+        """
+        Save a result to the cache file.
+        
+        The top level of the file holds the most recently stored result, so
+        readers that ignore request shapes keep working. Results for every
+        request shape are kept under "results", evicted by TTL and then LRU.
+        
+        Args:
+            stock_mentions: Result to cache
+            posts: Posts the result was computed from, in listing order
+            subreddit_rankings: Per-subreddit rankings from the same pass
+            request: Request shape the result answers (see _request_shape)
+            timestamp: Time the posts were fetched (defaults to now)
+        """
         try:
-            cache_data = {
-                "timestamp": datetime.now().isoformat(),
+            entry = {
+                "timestamp": (timestamp or datetime.now()).isoformat(),
                 "stock_mentions": self._serialize_stock_mentions(stock_mentions),
+                "subreddit_rankings": subreddit_rankings or {},
                 "post_count": len(posts),
-                "cache_duration_minutes": self.cache_duration.total_seconds() / 60
+                "post_ids": [post.id for post in posts],
+                "request": request
             }
-            
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
-                
+            self._store_entry(entry)
             self.logger.info("Data cached successfully")
-            
+        
         except Exception as e:
             self.logger.error(f"Error saving cache: {str(e)}")
     
+    def _cache_lock_path(self) -> str:
+        """Lock file serializing read-modify-write of the cache file between processes."""
+        directory = os.path.join(os.path.dirname(os.path.abspath(self.cache_file)), ".refresh_locks")
+        return os.path.join(directory, f"{os.path.basename(self.cache_file)}.lock")
+    
+    def _mark_used(self, request: Dict) -> None:
+        """Record that the cached result of a request shape was just served."""
+        with DataController._cache_lock:
+            DataController._last_used[self._refresh_state_key(request)] = datetime.now().isoformat()
+    
+    def _store_entry(self, entry: Dict) -> None:
+        """Write an entry as the most recently stored result, evicting stale and excess ones."""
+        with DataController._cache_lock, RefreshLock(self._cache_lock_path()):
+            # The loaded snapshot is shared, so build the new document from copies
+            cached_data = self._load_cache() or {}
+            results = dict(cached_data.get("results", {}))
+            
+            # Bring in the hits this process served since the file was last written
+            prefix = f"{os.path.abspath(self.cache_file)}|"
+            for key, result in results.items():
+                last_used = DataController._last_used.get(prefix + key)
+                if last_used is not None and last_used > result.get("last_used", ""):
+                    results[key] = dict(result, last_used=last_used)
+            
+            entry = dict(entry, last_used=datetime.now().isoformat())
+            if entry.get("request"):
+                results[self._request_key(entry["request"])] = entry
+            
+            # TTL first (results stay servable while stale), then least recently used beyond the cap
+            results = {key: result for key, result in results.items() if self._is_servable(result)}
+            if len(results) > self.max_cached_results:
+                recent = sorted(results, key=lambda key: results[key]["last_used"], reverse=True)
+                results = {key: results[key] for key in recent[:self.max_cached_results]}
+            
+            cache_data = dict(entry)
+            cache_data["cache_duration_minutes"] = self.cache_duration.total_seconds() / 60
+            cache_data["results"] = results
+            
+            # Written to a temp file and renamed over the cache, so readers never see a torn file
+            self._cache_snapshot().save(cache_data)
+    
+    def _request_shape(self, post_limit: int, top_stocks_limit: int) -> Dict:
+        """Describe a request by everything its result depends on."""
+        return {
+            "subreddits": list(self.subreddits),
+            "feed": self.feed,
+            "post_limit": post_limit,
+            "top_stocks_limit": top_stocks_limit
+        }
+    
+    @staticmethod
+    def _request_key(request: Dict) -> str:
+        """Key a request shape in the results cache, e.g. "wallstreetbets+stocks|hot|200|20"."""
+        return (f"{'+'.join(request['subreddits'])}|{request['feed']}|"
+                f"{request['post_limit']}|{request['top_stocks_limit']}")
+    
+    def _get_cached_result(self, request: Dict) -> Optional[List[StockMention]]:
+        """
+        Answer a request from the results cache.
+        
+        An exact match is returned as is. Otherwise a valid result for the
+        same subreddits and feed can answer a smaller request: with the same
+        post limit and a larger stock limit, its rankings are truncated (the
+        ranking of a smaller limit is a prefix of a larger one); with a larger
+        post limit, the first post_limit of its posts are reloaded from the
+        post store and re-ranked, reusing the stored mentions and scores.
+        
+        Args:
+            request: Request shape to answer
+        
+        Returns:
+            List of StockMention objects, or None if the request must be fetched
+        """
+        cached_data = self._load_cache()
+        if not cached_data:
+            return None
+        
+        results = cached_data.get("results", {})
+        key = self._request_key(request)
+        entry = results.get(key)
+        if entry is not None and self._is_cache_valid(entry):
+            self._mark_used(request)
+            return self._deserialize_stock_mentions(entry["stock_mentions"])
+        
+        candidates = [
+            result for result in results.values()
+            if result.get("request") and self._is_cache_valid(result)
+            and result["request"]["subreddits"] == request["subreddits"]
+            and result["request"]["feed"] == request["feed"]
+            and result["request"]["post_limit"] >= request["post_limit"]
+            and (result["request"]["post_limit"] > request["post_limit"]
+                 or result["request"]["top_stocks_limit"] >= request["top_stocks_limit"])
+        ]
+        # Prefer truncating a ranking over re-ranking posts, then the freshest result
+        candidates.sort(key=lambda result: (result["request"]["post_limit"] == request["post_limit"],
+                                            result["timestamp"]), reverse=True)
+        
+        for source in candidates:
+            try:
+                if source["request"]["post_limit"] == request["post_limit"]:
+                    return self._truncate_result(source, request)
+                
+                post_ids = source.get("post_ids", [])[:request["post_limit"]]
+                posts = self.post_store.get_posts(post_ids)
+                if len(posts) == len(post_ids):
+                    self.logger.info(f"Deriving {key} from {len(post_ids)} cached posts")
+                    return self._analyze_posts(posts, request,
+                                               timestamp=datetime.fromisoformat(source["timestamp"]))
+            except Exception as e:
+                self.logger.error(f"Error deriving cached result: {str(e)}")
+        return None
+    
+    def _get_stale_result(self, request: Dict) -> Optional[List[StockMention]]:
+        """Return an expired result of exactly this request shape, if it is still servable."""
+        cached_data = self._load_cache()
+        if not cached_data:
+            return None
+        entry = cached_data.get("results", {}).get(self._request_key(request))
+        if entry is None or not self._is_servable(entry):
+            return None
+        return self._deserialize_stock_mentions(entry["stock_mentions"])
+    
+    def _truncate_result(self, source: Dict, request: Dict) -> List[StockMention]:
+        """Cache and return the top top_stocks_limit of a larger ranking of the same posts."""
+        top_stocks_limit = request["top_stocks_limit"]
+        entry = dict(source)
+        entry["request"] = request
+        entry["stock_mentions"] = source["stock_mentions"][:top_stocks_limit]
+        entry["subreddit_rankings"] = {
+            subreddit: dict(list(ranking.items())[:top_stocks_limit])
+            for subreddit, ranking in source.get("subreddit_rankings", {}).items()
+        }
+        self._store_entry(entry)
+        return self._deserialize_stock_mentions(entry["stock_mentions"])
+    
+    def _drop_entry(self, request: Dict) -> bool:
+        """
+        Remove the cached result of one request shape, keeping the results of every other shape.
+        
+        Returns:
+            True if a result was removed
+        """
+        key = self._request_key(request)
+        with DataController._cache_lock, RefreshLock(self._cache_lock_path()):
+            DataController._last_used.pop(self._refresh_state_key(request), None)
+            cached_data = self._load_cache()
+            if not cached_data:
+                return False
+            results = {k: result for k, result in cached_data.get("results", {}).items() if k != key}
+            
+            if cached_data.get("request") != request:
+                if len(results) == len(cached_data.get("results", {})):
+                    return False
+                self._cache_snapshot().save(dict(cached_data, results=results))
+                return True
+            
+            # The top level mirrored the dropped result; the most recently used remaining one replaces it
+            if not results:
+                return self._cache_snapshot().delete()
+            cache_data = dict(max(results.values(), key=lambda result: result["last_used"]))
+            cache_data["cache_duration_minutes"] = self.cache_duration.total_seconds() / 60
+            cache_data["results"] = results
+            self._cache_snapshot().save(cache_data)
+            return True
+    
     def _clear_cache(self) -> None:
         """Clear the cache file."""
         try:
-            if os.path.exists(self.cache_file):
-                os.remove(self.cache_file)
+            if self._cache_snapshot().delete():
                 self.logger.info("Cache cleared")
         except Exception as e:
             self.logger.error(f"Error clearing cache: {str(e)}")
@@ -207,6 +813,14 @@ class DataController:
         except Exception:
             return False
     
+    def _is_servable(self, cached_data: Dict) -> bool:
+        """Check if cached data is fresh or expired by no more than the stale window."""
+        try:
+            cache_time = datetime.fromisoformat(cached_data["timestamp"])
+            return datetime.now() - cache_time < self.cache_duration + self.max_stale
+        except Exception:
+            return False
+    
     def _serialize_stock_mentions(self, stock_mentions: List[StockMention]) -> List[Dict]:
         """Convert StockMention objects to JSON-serializable format."""
         return [
@@ -233,15 +847,21 @@ class DataController:
             for item in data
         ]
     
-    def _get_fallback_data(self) -> List[StockMention]:
+    def _get_fallback_data(self, request: Optional[Dict] = None) -> List[StockMention]:
         """
         Get fallback data when main processing fails.
-        First tries cached data, then returns empty list.
+        First tries cached data of the failed request (even if expired), then returns empty list.
+        
+        A result cached for another request shape (other subreddits or limits)
+        is never served in its place; without a request, the most recently
+        stored result is used.
         """
         self.logger.info("Attempting to use fallback data")
         
         # Try to use cached data even if expired
         cached_data = self._load_cache()
+        if cached_data and request is not None:
+            cached_data = cached_data.get("results", {}).get(self._request_key(request))
         if cached_data and "stock_mentions" in cached_data:
             self.logger.info("Using expired cached data as fallback")
             return self._deserialize_stock_mentions(cached_data["stock_mentions"])
@@ -276,7 +896,7 @@ class DataController:
         
         Args:
             posts: List of RedditPost objects
-            
+        
         Returns:
             Dictionary with sentiment distribution
         """
@@ -0,0 +1,145 @@
+import json
+import os
+import stat
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+
+class JsonSnapshot:
+    # One holder per file, shared by everything in the process that reads it
+    _instances: Dict[str, "JsonSnapshot"] = {}
+    _instances_lock = threading.Lock()
+    
+    @classmethod
+    def for_path(cls, path: str) -> "JsonSnapshot":
+        """
+        Get the process-wide snapshot holder of a file.
+        
+        Args:
+            path: JSON file
+        
+        Returns:
+            The holder every caller in this process shares for that file
+        """
+        key = os.path.abspath(path)
+        with cls._instances_lock:
+            snapshot = cls._instances.get(key)
+            if snapshot is None:
+                snapshot = cls._instances[key] = cls(key)
+            return snapshot
+    
+    def __init__(self, path: str):
+        """
+        Initialize a parsed, in-memory view of a JSON file.
+        
+        The file is parsed again only when its version changes: its
+        modification time, size or inode. Writes go to a temp file that is
+        renamed over the old one, so readers in any process see either the
+        old or the new document, and every write changes the inode.
+        
+        The loaded document is shared between callers and must not be modified.
+        
+        Args:
+            path: JSON file
+        """
+        self.path = path
+        self.reloads = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple[int, int, int]] = None
+        self._data: Any = None
+    
+    @staticmethod
+    def _version_of(stat: os.stat_result) -> Tuple[int, int, int]:
+        """Identify a version of the file by what a stat call reports."""
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    
+    def load(self) -> Optional[Any]:
+        """
+        Get the current document, parsing the file only if it changed.
+        
+        Returns:
+            The parsed document, or None if the file does not exist
+        
+        Raises:
+            ValueError: If the file is not valid JSON
+        """
+        try:
+            version = self._version_of(os.stat(self.path))
+        except FileNotFoundError:
+            with self._lock:
+                self._version, self._data = None, None
+            return None
+        
+        with self._lock:
+            if version == self._version:
+                self.hits += 1
+                return self._data
+        
+        with open(self.path, 'r') as f:
+            version = self._version_of(os.fstat(f.fileno()))
+            data = json.load(f)
+        with self._lock:
+            self.reloads += 1
+            self._version, self._data = version, data
+        return data
+    
+    def save(self, data: Any, indent: Optional[int] = 2) -> None:
+        """
+        Write a document atomically and keep it as the current snapshot.
+        
+        The new file keeps the permissions of the one it replaces. A first
+        write creates the temp file with mode 0o666 and lets the kernel apply
+        the umask, as open() would, instead of reading the process-wide umask.
+        
+        Args:
+            data: JSON-serializable document
+            indent: Indentation of the written file
+        """
+        try:
+            mode = stat.S_IMODE(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            mode = None
+        temp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                if mode is not None:
+                    os.chmod(temp_path, mode)
+                json.dump(data, f, indent=indent)
+                f.flush()
+                # A rename keeps the inode and mtime, so this is the version readers will see
+                version = self._version_of(os.fstat(f.fileno()))
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        with self._lock:
+            self._version, self._data = version, data
+    
+    def delete(self) -> bool:
+        """
+        Delete the file and forget the snapshot.
+        
+        Returns:
+            True if a file was deleted
+        """
+        with self._lock:
+            self._version, self._data = None, None
+        try:
+            os.remove(self.path)
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get snapshot statistics.
+        
+        Returns:
+            Dictionary with loads served from memory and loads that parsed the file
+        """
+        return {"hits": self.hits, "reloads": self.reloads}
@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        """
+        Initialize a thread-safe least-recently-used cache with hit/miss counters.
+        
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Optional cap on the summed size of entries (sizes given to put())
+            on_evict: Optional callback invoked with (key, value) for each evicted entry
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key (marking it most recently used), or default."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """Insert or replace an entry, evicting least recently used entries over the caps."""
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._sizes.pop(key)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self.total_bytes += size
+            
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or
+                (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+            ):
+                old_key, old_value = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+                evicted.append((old_key, old_value))
+        
+        # Callbacks run outside the lock so they may do I/O
+        if self.on_evict:
+            for old_key, old_value in evicted:
+                self.on_evict(old_key, old_value)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry without counting it as an eviction."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self.total_bytes -= self._sizes.pop(key)
+            return self._entries.pop(key)
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for sizing.
+        
+        Returns:
+            Dictionary with hits, misses, hit rate, evictions, entry count and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes
+            }
\ No newline at end of file
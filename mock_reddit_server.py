@@ -0,0 +1,325 @@
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+# Latency distributions: callables drawing a delay in seconds from a seeded Random
+LatencyFn = Callable[[random.Random], float]
+
+TICKERS = ["TSLA", "GME", "AAPL", "NVDA", "AMD", "PLTR", "SPY", "AMC", "MSFT", "META"]
+POST_TEMPLATES = [
+    "{ticker} to the moon, loading up on calls",
+    "Is {ticker} about to crash? Worried about my position",
+    "DD: why {ticker} is massively undervalued",
+    "Lost everything on {ticker} puts, terrible week",
+    "{ticker} earnings thread",
+]
+COMMENT_TEMPLATES = [
+    "{ticker} is going to print money",
+    "Bagholding {ticker} since last year, this is awful",
+    "Just bought more {ticker}",
+    "Sold my {ticker} shares, not worth the risk",
+    "What do you think about {ticker}?",
+]
+
+
+def fixed_latency(seconds: float) -> LatencyFn:
+    """Every response takes the same time."""
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> LatencyFn:
+    """Response times spread evenly between low and high seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencyFn:
+    """Long-tailed response times, like real network traffic."""
+    return lambda rng: rng.lognormvariate(0.0, sigma) * median
+
+
+class MockRedditServer:
+    def __init__(self, posts_per_subreddit: int = 200, comments_per_post: int = 20,
+                 comments_page_size: int = 200,
+                 latency: Optional[LatencyFn] = None, error_rate: float = 0.0,
+                 truncate_rate: float = 0.0, ratelimit_budget: Optional[int] = None,
+                 ratelimit_window: float = 600.0, records: Optional[List[Dict[str, Any]]] = None,
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize a local stand-in for the Reddit JSON endpoints used by the scrapers.
+        
+        Serves /r/{subreddit}/hot.json, /r/{subreddit}/new.json (including "a+b"
+        multi-subreddit listings), /comments/{id}.json and /api/morechildren.json
+        with synthetic posts, or with recorded traffic when records are given.
+        
+        Args:
+            posts_per_subreddit: Number of synthetic posts in each subreddit listing
+            comments_per_post: Number of synthetic top-level comments per post
+            comments_page_size: Most comments loaded per comments request; the
+                rest sit behind a "more" stub, as on Reddit
+            latency: Optional latency distribution applied to every response
+            error_rate: Probability that a request fails with a 503
+            truncate_rate: Probability that a response body is cut off mid-JSON
+            ratelimit_budget: If set, send X-Ratelimit-* headers and answer 429
+                once this many requests were made within the window
+            ratelimit_window: Length of the rate-limit window in seconds
+            records: Optional records from traffic_recorder.load_archive, served
+                for matching paths before falling back to synthetic data
+            seed: Seed for latency draws and random faults
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.posts_per_subreddit = posts_per_subreddit
+        self.comments_per_post = comments_per_post
+        self.comments_page_size = comments_page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.ratelimit_budget = ratelimit_budget
+        self.ratelimit_window = ratelimit_window
+        
+        self.request_log: List[str] = []
+        self.status_counts: Dict[int, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._forced: Deque[Tuple[int, Dict[str, str]]] = deque()
+        self._truncate_next = 0
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        
+        self._recorded: Dict[str, Dict[str, Any]] = {}
+        for record in records or []:
+            parts = urlsplit(record["url"])
+            self._recorded[parts.path + ("?" + parts.query if parts.query else "")] = record
+        
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        """Root URL to pass to RedditScraper(base_url=...)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockRedditServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+    
+    def __enter__(self) -> "MockRedditServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+    
+    def throttle_burst(self, count: int, retry_after: Optional[float] = 1.0) -> None:
+        """Answer the next count requests with 429 Too Many Requests."""
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        with self._lock:
+            self._forced.extend([(429, headers)] * count)
+    
+    def fail_next(self, count: int, status: int = 503) -> None:
+        """Answer the next count requests with a server error."""
+        with self._lock:
+            self._forced.extend([(status, {})] * count)
+    
+    def truncate_next(self, count: int) -> None:
+        """Cut off the bodies of the next count successful responses."""
+        with self._lock:
+            self._truncate_next += count
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get request statistics for load tests.
+        
+        Returns:
+            Dictionary with the request count and responses per status code
+        """
+        with self._lock:
+            return {
+                "requests": len(self.request_log),
+                "status_counts": dict(self.status_counts)
+            }
+    
+    def _make_handler(self) -> type:
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, headers, body = server._respond(self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Keep test output quiet
+        
+        return Handler
+    
+    def _respond(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Decide the outcome of one request, applying injected faults first."""
+        with self._lock:
+            self.request_log.append(path)
+            delay = self.latency(self._rng) if self.latency else 0.0
+            forced = self._forced.popleft() if self._forced else None
+            random_error = self._rng.random() < self.error_rate
+            truncate = self._truncate_next > 0 or self._rng.random() < self.truncate_rate
+            headers, budget_exhausted = self._ratelimit_headers()
+        
+        if delay > 0:
+            time.sleep(delay)
+        
+        if forced is None and budget_exhausted:
+            forced = (429, {"Retry-After": headers["X-Ratelimit-Reset"]})
+        elif forced is None and random_error:
+            forced = (503, {})
+        
+        if forced:
+            status, extra_headers = forced
+            headers.update(extra_headers)
+            return self._count(status), headers, json.dumps({"message": "error", "error": status}).encode()
+        
+        status, body = self._route(path)
+        headers["Content-Type"] = "application/json; charset=UTF-8"
+        if status == 200 and truncate:
+            with self._lock:
+                self._truncate_next = max(0, self._truncate_next - 1)
+            body = body[:len(body) // 2]
+        return self._count(status), headers, body
+    
+    def _count(self, status: int) -> int:
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        return status
+    
+    def _ratelimit_headers(self) -> Tuple[Dict[str, str], bool]:
+        """Track the rate-limit window and build X-Ratelimit-* headers (caller holds the lock)."""
+        if self.ratelimit_budget is None:
+            return {}, False
+        
+        now = time.monotonic()
+        if now - self._window_start >= self.ratelimit_window:
+            self._window_start = now
+            self._window_used = 0
+        self._window_used += 1
+        
+        reset = self.ratelimit_window - (now - self._window_start)
+        headers = {
+            "X-Ratelimit-Used": str(self._window_used),
+            "X-Ratelimit-Remaining": str(max(0, self.ratelimit_budget - self._window_used)),
+            "X-Ratelimit-Reset": str(max(1, int(reset)))
+        }
+        return headers, self._window_used > self.ratelimit_budget
+    
+    def _route(self, path: str) -> Tuple[int, bytes]:
+        """Serve recorded or synthetic JSON for a request path."""
+        record = self._recorded.get(path)
+        if record:
+            return record["status"], record["body"].encode("utf-8")
+        
+        parts = urlsplit(path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        segments = [segment for segment in parts.path.split("/") if segment]
+        
+        if len(segments) == 3 and segments[0] == "r" and segments[2] in ("hot.json", "new.json"):
+            body = self._listing(segments[1], segments[2][:-len(".json")],
+                                 int(query.get("limit", 25)), query.get("after"))
+        elif len(segments) == 2 and segments[0] == "comments" and segments[1].endswith(".json"):
+            body = self._comments(segments[1][:-len(".json")], int(query.get("limit", 200)))
+        elif segments == ["api", "morechildren.json"]:
+            body = self._more_children(query.get("children", ""))
+        else:
+            return 404, json.dumps({"message": "Not Found", "error": 404}).encode()
+        
+        return 200, json.dumps(body).encode("utf-8")
+    
+    def _post(self, subreddit: str, index: int) -> Dict[str, Any]:
+        """Build a deterministic synthetic post."""
+        rng = random.Random(f"{subreddit}/{index}")
+        ticker = rng.choice(TICKERS)
+        return {
+            "id": f"{subreddit.lower()}{index}",
+            "title": rng.choice(POST_TEMPLATES).format(ticker=ticker),
+            "selftext": f"Thoughts on ${ticker} this week?" if index % 3 == 0 else "",
+            "score": rng.randint(1, 5000),
+            "num_comments": self.comments_per_post,
+            "created_utc": 1700000000 - index * 60,
+            "url": f"https://www.reddit.com/r/{subreddit}/comments/{subreddit.lower()}{index}/",
+            "author": f"user{rng.randint(1, 999)}",
+            "subreddit": subreddit,
+            "stickied": False
+        }
+    
+    def _listing(self, subreddit_path: str, feed: str, limit: int, after: Optional[str]) -> Dict[str, Any]:
+        """Build one page of a (possibly multi-subreddit) listing."""
+        subreddits = subreddit_path.split("+")
+        posts = [self._post(name, index) for index in range(self.posts_per_subreddit) for name in subreddits]
+        if feed == "hot":
+            posts.sort(key=lambda post: post["score"], reverse=True)
+        else:
+            posts.sort(key=lambda post: post["created_utc"], reverse=True)
+        
+        start = 0
+        if after:
+            fullnames = [f"t3_{post['id']}" for post in posts]
+            start = fullnames.index(after) + 1 if after in fullnames else len(posts)
+        page = posts[start:start + min(limit, 100)]
+        has_more = start + len(page) < len(posts)
+        
+        return {
+            "kind": "Listing",
+            "data": {
+                "after": f"t3_{page[-1]['id']}" if page and has_more else None,
+                "children": [{"kind": "t3", "data": post} for post in page]
+            }
+        }
+    
+    def _comment(self, comment_id: str) -> Dict[str, Any]:
+        """Build a deterministic synthetic comment."""
+        rng = random.Random(comment_id)
+        return {
+            "kind": "t1",
+            "data": {
+                "id": comment_id,
+                "body": rng.choice(COMMENT_TEMPLATES).format(ticker=rng.choice(TICKERS)),
+                "score": rng.randint(-10, 500),
+                "replies": ""
+            }
+        }
+    
+    def _comments(self, post_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Build a comments response; comments beyond the page sit behind a "more" stub."""
+        comment_ids = [f"{post_id}c{index}" for index in range(self.comments_per_post)]
+        limit = min(limit, self.comments_page_size)
+        children = [self._comment(comment_id) for comment_id in comment_ids[:limit]]
+        if len(comment_ids) > limit:
+            children.append({"kind": "more", "data": {"children": comment_ids[limit:]}})
+        
+        post = {"id": post_id, "title": f"Post {post_id}", "selftext": "",
+                "created_utc": 1700000000, "score": 1}
+        return [
+            {"kind": "Listing", "data": {"children": [{"kind": "t3", "data": post}]}},
+            {"kind": "Listing", "data": {"children": children}}
+        ]
+    
+    def _more_children(self, children: str) -> Dict[str, Any]:
+        """Resolve "more" stub ids into comments."""
+        things = [self._comment(comment_id) for comment_id in children.split(",") if comment_id]
+        return {"json": {"errors": [], "data": {"things": things}}}
\ No newline at end of file
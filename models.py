@@ -1,6 +1,8 @@
-from dataclasses import dataclass
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -20,6 +22,7 @@ class RedditPost:
     comments: List[str]
     created_utc: datetime
     score: int
+    subreddit: str = ""
 
 
 @dataclass
@@ -28,4 +31,29 @@ class SentimentResult:
     positive: float
     negative: float
     neutral: float
-    category: str
\ No newline at end of file
+    category: str
+
+
+@dataclass
+class SentimentBatch:
+    compound: array = field(default_factory=lambda: array('d'))
+    positive: array = field(default_factory=lambda: array('d'))
+    negative: array = field(default_factory=lambda: array('d'))
+    neutral: array = field(default_factory=lambda: array('d'))
+
+    def __len__(self) -> int:
+        return len(self.compound)
+
+
+@dataclass
+class TickerIndex:
+    snippets: List[str]
+    ticker_snippets: Dict[str, List[int]]
+    post_counts: Counter
+    subreddit_counts: Dict[str, Counter] = field(default_factory=dict)
+    snippet_scores: Dict[int, SentimentResult] = field(default_factory=dict)
+
+    def top_mentioned(self, limit: int = 10, subreddit: Optional[str] = None) -> Dict[str, int]:
+        """Return the most mentioned tickers (one count per post), sorted by count descending."""
+        counts = self.post_counts if subreddit is None else self.subreddit_counts.get(subreddit.lower(), Counter())
+        return dict(counts.most_common(limit))
\ No newline at end of file
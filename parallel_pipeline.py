@@ -0,0 +1,140 @@
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, FrozenSet, List, Optional, Tuple
+from models import RedditPost, SentimentResult, TickerIndex
+from sentiment_analyzer import SentimentAnalyzer
+from stock_extractor import StockExtractor
+
+
+# Per-worker state, loaded once by _init_worker when the pool starts
+_worker_extractor: Optional[StockExtractor] = None
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+
+
+def _init_worker(valid_tickers: List[str], false_positives: List[str], ambiguous_words: List[str],
+                 matcher: str) -> None:
+    """Load the ticker universe and the VADER lexicon once per worker process."""
+    global _worker_extractor, _worker_analyzer
+    _worker_extractor = StockExtractor(matcher=matcher, memo_size=0)
+    _worker_extractor.valid_tickers = set(valid_tickers)
+    _worker_extractor.false_positives = set(false_positives)
+    _worker_extractor.ambiguous_words = set(ambiguous_words)
+    _worker_extractor._invalidate_matcher()
+    _worker_analyzer = SentimentAnalyzer()
+
+
+def _extract_chunk(texts: List[str]) -> List[FrozenSet[str]]:
+    return [frozenset(_worker_extractor.extract_tickers(text)) for text in texts]
+
+
+def _score_chunk(texts: List[str]) -> List[SentimentResult]:
+    return [_worker_analyzer.get_sentiment_score(text) for text in texts]
+
+
+class ParallelPipeline:
+    def __init__(self, max_workers: int = 1, min_parallel_texts: int = 5000,
+                 chunk_size: int = 1000):
+        """
+        Initialize a process pool that shards extraction and scoring across cores.
+        
+        Workers only map texts to tickers or scores. Counting and averaging are
+        reduced in the calling process in corpus order, so results are identical
+        to the serial path. Corpora below min_parallel_texts run serially because
+        inter-process overhead would outweigh the gain.
+        
+        Workers are spawned rather than forked: forking a process that runs
+        other threads (Streamlit, background refreshes) can copy a held lock
+        into the child and deadlock it. The pool is shut down by close(), or
+        when the pipeline is garbage collected or the interpreter exits.
+        
+        Args:
+            max_workers: Worker processes (0 or 1 keeps everything in-process)
+            min_parallel_texts: Smallest batch of texts worth sending to the pool
+            chunk_size: Texts per task sent to a worker
+        """
+        self.max_workers = max_workers
+        self.min_parallel_texts = min_parallel_texts
+        self.chunk_size = chunk_size
+        self.parallel_runs = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_key: Optional[Tuple[int, int]] = None
+        self._pool_finalizer: Optional[weakref.finalize] = None
+    
+    def should_parallelize(self, text_count: int) -> bool:
+        """Check whether a batch of text_count texts is large enough for the pool."""
+        return self.max_workers > 1 and text_count >= self.min_parallel_texts
+    
+    def _get_pool(self, extractor: StockExtractor) -> ProcessPoolExecutor:
+        """Return a pool whose workers hold the extractor's current ticker universe."""
+        key = (id(extractor), extractor.universe_version)
+        if self._pool is None or self._pool_key != key:
+            self.close()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(sorted(extractor.valid_tickers), sorted(extractor.false_positives),
+                          sorted(extractor.ambiguous_words), extractor.matcher_engine)
+            )
+            self._pool_key = key
+            self._pool_finalizer = weakref.finalize(self, self._pool.shutdown, wait=True)
+        return self._pool
+    
+    def _map(self, pool: ProcessPoolExecutor, function: Callable, texts: List[str]) -> list:
+        """Run function over texts in chunks, returning results in input order."""
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        return [result for chunk_results in pool.map(function, chunks) for result in chunk_results]
+    
+    def build_index(self, extractor: StockExtractor, posts: List[RedditPost]) -> TickerIndex:
+        """
+        Build the ticker index, extracting in worker processes for large corpora.
+        
+        Args:
+            extractor: Extractor whose universe and memo are used
+            posts: Posts to index
+        
+        Returns:
+            TickerIndex identical to extractor.build_index(posts)
+        """
+        text_count = sum(2 + len(post.comments) for post in posts)
+        if not self.should_parallelize(text_count):
+            return extractor.build_index(posts)
+        
+        pool = self._get_pool(extractor)
+        
+        def extract_batch(texts: List[str]) -> List[FrozenSet[str]]:
+            # Memo hits are filtered out first, so the batch may now be small
+            if not self.should_parallelize(len(texts)):
+                return [frozenset(extractor._match(text)) for text in texts]
+            self.parallel_runs += 1
+            return self._map(self._get_pool(extractor), _extract_chunk, texts)
+        
+        return extractor.build_index(posts, extract_batch=extract_batch)
+    
+    def score_snippets(self, analyzer: SentimentAnalyzer, extractor: StockExtractor,
+                       index: TickerIndex, tickers: List[str]) -> None:
+        """
+        Score the snippets of the given tickers, in worker processes for large batches.
+        
+        Args:
+            analyzer: Analyzer used when the batch is too small for the pool
+            extractor: Extractor the pool's workers are initialised from
+            index: TickerIndex to store scores on
+            tickers: Tickers whose snippets will be analyzed
+        """
+        def score_batch(texts: List[str]) -> List[SentimentResult]:
+            if not self.should_parallelize(len(texts)):
+                return [analyzer.get_sentiment_score(text) for text in texts]
+            self.parallel_runs += 1
+            return self._map(self._get_pool(extractor), _score_chunk, texts)
+        
+        analyzer.score_snippets(index, tickers, score_batch=score_batch)
+    
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        if self._pool is not None:
+            self._pool_finalizer()
+            self._pool = None
+            self._pool_key = None
+            self._pool_finalizer = None
\ No newline at end of file
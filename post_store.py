@@ -0,0 +1,374 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from models import RedditPost
+from score_cache import Scores
+
+
+# Text positions within a post: 0 is the title, 1 the body, 2 + i comment i
+# (the order StockExtractor.build_index visits them in)
+FIRST_COMMENT_POSITION = 2
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS posts ("
+    "id TEXT PRIMARY KEY, subreddit TEXT NOT NULL, title TEXT, content TEXT, "
+    "created_utc REAL NOT NULL, score INTEGER, content_hash TEXT NOT NULL, "
+    "extraction_version TEXT, updated_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS posts_subreddit_created ON posts (subreddit, created_utc)",
+    "CREATE INDEX IF NOT EXISTS posts_created ON posts (created_utc)",
+    "CREATE INDEX IF NOT EXISTS posts_updated ON posts (updated_at)",
+    "CREATE TABLE IF NOT EXISTS comments ("
+    "post_id TEXT NOT NULL, position INTEGER NOT NULL, body TEXT, "
+    "PRIMARY KEY (post_id, position))",
+    "CREATE TABLE IF NOT EXISTS text_scores ("
+    "post_id TEXT NOT NULL, position INTEGER NOT NULL, version TEXT NOT NULL, "
+    "compound REAL, positive REAL, negative REAL, neutral REAL, "
+    "PRIMARY KEY (post_id, position))",
+    "CREATE TABLE IF NOT EXISTS mentions ("
+    "post_id TEXT NOT NULL, position INTEGER NOT NULL, ticker TEXT NOT NULL, "
+    "PRIMARY KEY (post_id, position, ticker))",
+    "CREATE INDEX IF NOT EXISTS mentions_ticker ON mentions (ticker, post_id)",
+]
+
+
+def post_texts(post: RedditPost) -> List[str]:
+    """List a post's texts in position order (title, body, comments)."""
+    return [post.title, post.content, *post.comments]
+
+
+def content_hash(post: RedditPost) -> str:
+    """Hash everything about a post that extraction and scoring depend on."""
+    digest = hashlib.blake2b(digest_size=16)
+    for text in [post.subreddit, *post_texts(post)]:
+        digest.update((text or "").encode('utf-8', errors='surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class PostStore:
+    def __init__(self, path: str = ".reddit_store.sqlite"):
+        """
+        Initialize an embedded store of posts, comments, per-text scores and ticker mentions.
+        
+        The database runs in WAL mode: the refresh writes through one
+        connection while every reading thread gets its own, so dashboard
+        reads never block the writer and never see a half-applied refresh.
+        Posts are upserted by id with a hash of their texts, so a refresh can
+        tell which posts are new or changed and reuse what is stored for the rest.
+        
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._readers = threading.local()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in WAL mode, creating the schema if needed."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+        return connection
+    
+    def _get_writer(self) -> sqlite3.Connection:
+        """Return the write connection (caller holds the lock)."""
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
+    
+    def _get_reader(self) -> sqlite3.Connection:
+        """Return this thread's read connection."""
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._readers.connection = connection
+        return connection
+    
+    def upsert_posts(self, posts: List[RedditPost]) -> Set[str]:
+        """
+        Insert new posts and replace posts whose texts changed.
+        
+        A changed post loses its stored mentions and scores. Unchanged posts
+        only get their score and timestamp refreshed.
+        
+        Args:
+            posts: Posts as currently fetched from Reddit
+        
+        Returns:
+            Ids of the posts that were new or changed
+        """
+        if not posts:
+            return set()
+        
+        now = time.time()
+        with self._lock:
+            connection = self._get_writer()
+            stored = self._stored_hashes(connection, [post.id for post in posts])
+            changed = set()
+            with connection:
+                for post in posts:
+                    post_hash = content_hash(post)
+                    if stored.get(post.id) == post_hash:
+                        connection.execute("UPDATE posts SET score = ?, updated_at = ? WHERE id = ?",
+                                           (post.score, now, post.id))
+                        continue
+                    
+                    changed.add(post.id)
+                    stored[post.id] = post_hash
+                    connection.execute(
+                        "INSERT OR REPLACE INTO posts (id, subreddit, title, content, created_utc, score, "
+                        "content_hash, extraction_version, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+                        (post.id, post.subreddit, post.title, post.content, post.created_utc.timestamp(),
+                         post.score, post_hash, now)
+                    )
+                    for table in ("comments", "text_scores", "mentions"):
+                        connection.execute(f"DELETE FROM {table} WHERE post_id = ?", (post.id,))
+                    connection.executemany(
+                        "INSERT INTO comments (post_id, position, body) VALUES (?, ?, ?)",
+                        [(post.id, FIRST_COMMENT_POSITION + i, comment) for i, comment in enumerate(post.comments)]
+                    )
+            return changed
+    
+    @staticmethod
+    def _stored_hashes(connection: sqlite3.Connection, post_ids: List[str]) -> Dict[str, str]:
+        """Look up the content hashes of stored posts."""
+        hashes = {}
+        for start in range(0, len(post_ids), 500):
+            batch = post_ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            hashes.update(connection.execute(
+                f"SELECT id, content_hash FROM posts WHERE id IN ({placeholders})", batch
+            ).fetchall())
+        return hashes
+    
+    def get_known_texts(self, posts: List[RedditPost], extraction_version: str,
+                        score_version: str) -> Tuple[Dict[str, FrozenSet[str]], Dict[str, Scores]]:
+        """
+        Look up what earlier refreshes already computed for these posts.
+        
+        Only posts stored with the same texts count. Tickers are returned for
+        every text of a post extracted with extraction_version (texts without
+        mentions map to an empty set), scores for the texts scored with
+        score_version.
+        
+        Args:
+            posts: Posts of the current refresh
+            extraction_version: Fingerprint of the current ticker universe
+            score_version: Fingerprint of the current sentiment analyzer
+        
+        Returns:
+            Tuple of ({text: tickers}, {text: (compound, positive, negative, neutral)})
+        """
+        tickers_by_text: Dict[str, FrozenSet[str]] = {}
+        scores_by_text: Dict[str, Scores] = {}
+        if not posts:
+            return tickers_by_text, scores_by_text
+        
+        connection = self._get_reader()
+        by_id = {post.id: post for post in posts}
+        post_ids = list(by_id)
+        for start in range(0, len(post_ids), 500):
+            batch = post_ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = connection.execute(
+                f"SELECT id, content_hash, extraction_version FROM posts WHERE id IN ({placeholders})", batch
+            ).fetchall()
+            current = {post_id: version for post_id, stored_hash, version in rows
+                       if stored_hash == content_hash(by_id[post_id])}
+            if not current:
+                continue
+            
+            current_ids = list(current)
+            placeholders = ",".join("?" * len(current_ids))
+            mentions: Dict[Tuple[str, int], Set[str]] = {}
+            for post_id, position, ticker in connection.execute(
+                f"SELECT post_id, position, ticker FROM mentions WHERE post_id IN ({placeholders})", current_ids
+            ):
+                mentions.setdefault((post_id, position), set()).add(ticker)
+            
+            for post_id, version in current.items():
+                if version != extraction_version:
+                    continue
+                for position, text in enumerate(post_texts(by_id[post_id])):
+                    if text:
+                        tickers_by_text[text] = frozenset(mentions.get((post_id, position), ()))
+            
+            for post_id, position, *scores in connection.execute(
+                f"SELECT post_id, position, compound, positive, negative, neutral FROM text_scores "
+                f"WHERE version = ? AND post_id IN ({placeholders})", [score_version, *current_ids]
+            ):
+                texts = post_texts(by_id[post_id])
+                if position < len(texts) and texts[position]:
+                    scores_by_text[texts[position]] = tuple(scores)
+        
+        return tickers_by_text, scores_by_text
+    
+    def save_analysis(self, posts: List[RedditPost], tickers_by_text: Dict[str, Iterable[str]],
+                      scores_by_text: Dict[str, Scores], extraction_version: str, score_version: str) -> None:
+        """
+        Store the mentions and scores computed by a refresh.
+        
+        Mentions are written for posts not yet extracted with
+        extraction_version; texts missing from tickers_by_text are taken to
+        mention nothing. Scores are written for every text of these posts
+        found in scores_by_text.
+        
+        Args:
+            posts: Posts of the refresh (already upserted)
+            tickers_by_text: Tickers of each text that mentions any
+            scores_by_text: Scores of the texts that were scored
+            extraction_version: Fingerprint of the ticker universe used
+            score_version: Fingerprint of the sentiment analyzer used
+        """
+        if not posts:
+            return
+        
+        with self._lock:
+            connection = self._get_writer()
+            post_ids = [post.id for post in posts]
+            versions = {}
+            for start in range(0, len(post_ids), 500):
+                batch = post_ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                versions.update(connection.execute(
+                    f"SELECT id, extraction_version FROM posts WHERE id IN ({placeholders})", batch
+                ).fetchall())
+            
+            with connection:
+                for post in posts:
+                    if post.id not in versions:
+                        continue
+                    texts = post_texts(post)
+                    
+                    if versions[post.id] != extraction_version:
+                        connection.execute("DELETE FROM mentions WHERE post_id = ?", (post.id,))
+                        connection.executemany(
+                            "INSERT OR IGNORE INTO mentions (post_id, position, ticker) VALUES (?, ?, ?)",
+                            [(post.id, position, ticker) for position, text in enumerate(texts) if text
+                             for ticker in tickers_by_text.get(text, ())]
+                        )
+                        connection.execute("UPDATE posts SET extraction_version = ? WHERE id = ?",
+                                           (extraction_version, post.id))
+                    
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO text_scores "
+                        "(post_id, position, version, compound, positive, negative, neutral) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(post.id, position, score_version, *scores_by_text[text])
+                         for position, text in enumerate(texts) if text and text in scores_by_text]
+                    )
+    
+    def get_posts(self, post_ids: List[str]) -> List[RedditPost]:
+        """
+        Rebuild stored posts with their comments.
+        
+        Args:
+            post_ids: Ids of the posts to load
+        
+        Returns:
+            The stored posts in the order of post_ids (ids not in the store are skipped)
+        """
+        connection = self._get_reader()
+        rows = {}
+        comments: Dict[str, List[str]] = {}
+        for start in range(0, len(post_ids), 500):
+            batch = post_ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for row in connection.execute(
+                f"SELECT id, subreddit, title, content, created_utc, score FROM posts "
+                f"WHERE id IN ({placeholders})", batch
+            ):
+                rows[row[0]] = row
+            for post_id, body in connection.execute(
+                f"SELECT post_id, body FROM comments WHERE post_id IN ({placeholders}) "
+                f"ORDER BY post_id, position", batch
+            ):
+                comments.setdefault(post_id, []).append(body)
+        
+        return [
+            RedditPost(post_id, rows[post_id][2], rows[post_id][3], comments.get(post_id, []),
+                       datetime.fromtimestamp(rows[post_id][4]), rows[post_id][5], rows[post_id][1])
+            for post_id in post_ids if post_id in rows
+        ]
+    
+    def get_mention_counts(self, since: Optional[datetime] = None, subreddit: Optional[str] = None,
+                           limit: int = 20) -> Dict[str, int]:
+        """
+        Count the posts mentioning each ticker, from the stored history.
+        
+        Args:
+            since: Only count posts created at or after this time
+            subreddit: Only count posts from this subreddit
+            limit: Maximum number of tickers returned
+        
+        Returns:
+            Dictionary of ticker to post count, sorted by count descending
+        """
+        query = ("SELECT m.ticker, COUNT(DISTINCT m.post_id) AS mentions FROM mentions m "
+                 "JOIN posts p ON p.id = m.post_id WHERE 1 = 1")
+        params: list = []
+        if since is not None:
+            query += " AND p.created_utc >= ?"
+            params.append(since.timestamp())
+        if subreddit is not None:
+            query += " AND p.subreddit = ? COLLATE NOCASE"
+            params.append(subreddit)
+        query += " GROUP BY m.ticker ORDER BY mentions DESC, m.ticker LIMIT ?"
+        params.append(limit)
+        return dict(self._get_reader().execute(query, params).fetchall())
+    
+    def prune(self, before: datetime) -> int:
+        """
+        Delete posts not fetched since a cutoff, with their comments, scores and mentions.
+        
+        Args:
+            before: Posts last upserted before this time are deleted
+        
+        Returns:
+            Number of posts deleted
+        """
+        with self._lock:
+            connection = self._get_writer()
+            with connection:
+                post_ids = [row[0] for row in connection.execute(
+                    "SELECT id FROM posts WHERE updated_at < ?", (before.timestamp(),)
+                )]
+                for table, column in (("comments", "post_id"), ("text_scores", "post_id"),
+                                      ("mentions", "post_id"), ("posts", "id")):
+                    connection.executemany(f"DELETE FROM {table} WHERE {column} = ?",
+                                           [(post_id,) for post_id in post_ids])
+            return len(post_ids)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get store statistics.
+        
+        Returns:
+            Dictionary with the number of stored posts, comments, scores and mentions
+        """
+        connection = self._get_reader()
+        return {
+            table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("posts", "comments", "text_scores", "mentions")
+        }
+    
+    def close(self) -> None:
+        """Close the write connection and this thread's read connection."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        connection = getattr(self._readers, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._readers.connection = None
@@ -0,0 +1,130 @@
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+
+def _parse_header_float(value: Any) -> Optional[float]:
+    """Parse a numeric rate-limit header value, returning None if missing or malformed."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, default_delay: float = 1.0, min_delay: float = 0.1,
+                 max_delay: float = 60.0):
+        """
+        Initialize a thread-safe rate limiter driven by Reddit's rate-limit headers.
+        
+        Until the server reports its budget, requests are spaced by default_delay.
+        Afterwards the spacing spreads X-Ratelimit-Remaining evenly over the
+        X-Ratelimit-Reset window, and 429 responses pause all callers until
+        Retry-After (or the reset window) has passed.
+        
+        Args:
+            default_delay: Seconds between requests when no budget is known
+            min_delay: Shortest spacing allowed even with plenty of budget left
+            max_delay: Longest spacing or back-off applied
+        """
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        
+        self.current_delay = default_delay
+        self.remaining: Optional[float] = None
+        self.reset_seconds: Optional[float] = None
+        self.next_request_time = 0.0
+        self.blocked_until = 0.0
+        self.request_count = 0
+        self.throttled_count = 0
+        self._consecutive_throttles = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Block until the caller may send its next request.
+        
+        A slot is reserved under the lock so concurrent callers share one
+        budget; the sleep itself happens outside the lock.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            start_time = max(now, self.next_request_time, self.blocked_until)
+            self.next_request_time = start_time + self.current_delay
+            self.request_count += 1
+        
+        wait_time = start_time - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+    
+    def update(self, headers: Mapping[str, Any], status_code: Optional[int] = None) -> None:
+        """
+        Adjust pacing from a response's rate-limit headers and status code.
+        
+        Args:
+            headers: Response headers (case-insensitive mapping from requests)
+            status_code: HTTP status code of the response
+        """
+        remaining = _parse_header_float(headers.get('X-Ratelimit-Remaining'))
+        reset_seconds = _parse_header_float(headers.get('X-Ratelimit-Reset'))
+        retry_after = _parse_header_float(headers.get('Retry-After'))
+        
+        with self._lock:
+            now = time.monotonic()
+            
+            if remaining is not None:
+                self.remaining = remaining
+            if reset_seconds is not None:
+                self.reset_seconds = reset_seconds
+            
+            if status_code == 429:
+                self.throttled_count += 1
+                self._consecutive_throttles += 1
+                if retry_after is not None:
+                    backoff = retry_after
+                elif reset_seconds is not None:
+                    backoff = reset_seconds
+                else:
+                    # No hint from the server: back off exponentially
+                    backoff = self.default_delay * (2 ** self._consecutive_throttles)
+                self.blocked_until = max(self.blocked_until, now + min(backoff, self.max_delay))
+                return
+            
+            self._consecutive_throttles = 0
+            
+            if remaining is None or reset_seconds is None:
+                return
+            
+            if remaining < 1:
+                # Budget exhausted: wait for the window to reset
+                self.blocked_until = max(self.blocked_until, now + min(reset_seconds, self.max_delay))
+                self.current_delay = self.default_delay
+            else:
+                # Spread the remaining budget evenly over the rest of the window
+                self.current_delay = min(self.max_delay, max(self.min_delay, reset_seconds / remaining))
+                # Only ever push the next slot back: slots up to it are already
+                # reserved by callers sleeping in acquire
+                self.next_request_time = max(self.next_request_time, now + self.current_delay)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the limiter's current state for monitoring.
+        
+        Returns:
+            Dictionary with pacing, last reported budget and throttle counters
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "current_delay": self.current_delay,
+                "remaining": self.remaining,
+                "reset_seconds": self.reset_seconds,
+                "blocked_for_seconds": max(0.0, self.blocked_until - now),
+                "request_count": self.request_count,
+                "throttled_count": self.throttled_count
+            }
\ No newline at end of file
@@ -1,25 +1,217 @@
 import requests
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from models import RedditPost
+from rate_limiter import AdaptiveRateLimiter
+from response_cache import ResponseCache
+from watermark_store import WatermarkStore
+
+
+def parse_listing(data: dict) -> Tuple[List[RedditPost], Optional[str]]:
+    """
+    Parse a Reddit listing JSON response (hot.json, new.json) into posts.
+    
+    Args:
+        data: Parsed JSON listing response
+        
+    Returns:
+        Tuple of (non-stickied posts in listing order, pagination token for the next page)
+    """
+    if not isinstance(data, dict) or 'data' not in data or 'children' not in data['data']:
+        return [], None
+    
+    posts = []
+    for item in data['data']['children']:
+        if item['kind'] != 't3':  # t3 = link/post
+            continue
+            
+        post_data = item['data']
+        
+        # Skip stickied posts
+        if post_data.get('stickied', False):
+            continue
+        
+        posts.append(RedditPost(
+            id=post_data['id'],
+            title=post_data['title'],
+            content=post_data.get('selftext', '') or '',
+            comments=[],  # Comments fetched separately if needed
+            created_utc=datetime.fromtimestamp(post_data['created_utc']),
+            score=post_data['score'],
+            subreddit=post_data.get('subreddit', '')
+        ))
+    
+    return posts, data['data'].get('after')
+
+
+def parse_comments(data: list, limit: int) -> List[str]:
+    """
+    Parse top-level comment bodies from a Reddit comments JSON response.
+    
+    Args:
+        data: Parsed JSON response of comments/{post_id}.json
+        limit: Maximum number of comments to return
+        
+    Returns:
+        List of comment text strings
+    """
+    comments = []
+    
+    # Reddit comments JSON has a specific structure
+    if not isinstance(data, list) or len(data) < 2:
+        return comments
+    
+    # Comments are in the second element of the response
+    comments_data = data[1]['data']['children']
+    
+    for item in comments_data:
+        if item['kind'] != 't1':  # t1 = comment
+            continue
+            
+        comment_data = item['data']
+        comment_body = comment_data.get('body', '')
+        
+        # Skip deleted/removed comments
+        if comment_body in ['[deleted]', '[removed]', '']:
+            continue
+        
+        comments.append(comment_body)
+        
+        if len(comments) >= limit:
+            break
+    
+    return comments
+
+
+def _walk_comment_tree(children: list, comments: List[str], more_ids: List[str], limit: int) -> None:
+    """Collect comment bodies depth-first and the ids hidden behind "more" stubs."""
+    for item in children:
+        if len(comments) >= limit:
+            return
+        
+        item_data = item.get('data', {})
+        
+        if item.get('kind') == 't1':  # t1 = comment
+            comment_body = item_data.get('body', '')
+            
+            # Skip deleted/removed comments but keep walking their replies
+            if comment_body not in ['[deleted]', '[removed]', '']:
+                comments.append(comment_body)
+            
+            replies = item_data.get('replies')
+            if isinstance(replies, dict):  # Reddit sends '' when there are no replies
+                _walk_comment_tree(replies.get('data', {}).get('children', []), comments, more_ids, limit)
+        
+        elif item.get('kind') == 'more':
+            # '_' marks a "continue this thread" link rather than loadable children
+            more_ids.extend(child for child in item_data.get('children', []) if child != '_')
+
+
+def parse_comment_tree(data: list, limit: int) -> Tuple[List[str], List[str]]:
+    """
+    Parse the full comment tree from a Reddit comments JSON response.
+    
+    Args:
+        data: Parsed JSON response of comments/{post_id}.json
+        limit: Maximum number of comments to return
+        
+    Returns:
+        Tuple of (comment bodies in depth-first order, ids of unloaded "more" children)
+    """
+    comments = []
+    more_ids = []
+    
+    if isinstance(data, list) and len(data) >= 2:
+        _walk_comment_tree(data[1]['data']['children'], comments, more_ids, limit)
+    
+    return comments, more_ids
+
+
+def parse_more_children(data: dict, limit: int) -> Tuple[List[str], List[str]]:
+    """
+    Parse an /api/morechildren response.
+    
+    Args:
+        data: Parsed JSON response of api/morechildren.json
+        limit: Maximum number of comments to return
+        
+    Returns:
+        Tuple of (comment bodies, ids of further unloaded "more" children)
+    """
+    comments = []
+    more_ids = []
+    
+    things = data.get('json', {}).get('data', {}).get('things', []) if isinstance(data, dict) else []
+    _walk_comment_tree(things, comments, more_ids, limit)
+    
+    return comments, more_ids
+
+
+class RequestBudget:
+    def __init__(self, max_requests: int):
+        """
+        Initialize a thread-safe budget of requests shared across posts.
+        
+        Args:
+            max_requests: Total number of requests that may be spent
+        """
+        self.max_requests = max_requests
+        self.used = 0
+        self._lock = threading.Lock()
+    
+    def try_spend(self) -> bool:
+        """Spend one request if any budget is left."""
+        with self._lock:
+            if self.used >= self.max_requests:
+                return False
+            self.used += 1
+            return True
+    
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return self.max_requests - self.used
 
 
 class RedditScraper:
-    def __init__(self, user_agent: str = "RedditSentimentTracker/1.0"):
+    # Upper bound on concurrent comment fetches (and pooled connections)
+    MAX_WORKERS = 16
+    # Reddit resolves at most 100 "more" children per request
+    MORE_CHILDREN_BATCH = 100
+    
+    def __init__(self, user_agent: str = "RedditSentimentTracker/1.0",
+                 response_cache: Optional[ResponseCache] = None,
+                 watermark_store: Optional[WatermarkStore] = None,
+                 base_url: str = "https://www.reddit.com"):
         """
         Initialize Reddit scraper using JSON feeds (no authentication required).
         
         Args:
             user_agent: User agent string for requests
+            response_cache: Optional disk cache that serves fresh responses and
+                revalidates stale ones with conditional requests
+            watermark_store: Optional persistent record of ingested posts, used by
+                get_new_posts(since_last_seen=True)
+            base_url: Root URL of the Reddit JSON endpoints (e.g. a local mock server)
         """
         self.user_agent = user_agent
+        self.base_url = base_url.rstrip('/')
+        self.response_cache = response_cache
+        self.watermark_store = watermark_store
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': self.user_agent})
         
-        # Rate limiting - be respectful to Reddit
-        self.request_delay = 1.0  # seconds between requests
-        self.last_request_time = 0
+        # Allow enough pooled connections for concurrent comment fetching
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.MAX_WORKERS)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Rate limiting - be respectful to Reddit. Starts at one request per
+        # second and adapts to the X-Ratelimit-* headers Reddit sends back.
+        self.rate_limiter = AdaptiveRateLimiter(default_delay=1.0)
+        self.max_retries = 2  # retries after a 429 response
     
     def is_authenticated(self) -> bool:
         """Check if Reddit scraper is ready (always True for JSON feeds)."""
@@ -29,6 +221,14 @@ class RedditScraper:
         """Get authentication error message (none for JSON feeds)."""
         return "No authentication required for JSON feeds"
     
+    def get_rate_limit_state(self) -> Dict[str, Any]:
+        """Get the current rate limiter state for monitoring."""
+        return self.rate_limiter.get_state()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics (empty if caching is disabled)."""
+        return self.response_cache.get_stats() if self.response_cache else {}
+    
     def _make_request(self, url: str) -> dict:
         """
         Make a rate-limited request to Reddit JSON endpoint.
@@ -42,162 +242,218 @@ class RedditScraper:
         Raises:
             Exception: If request fails
         """
-        # Rate limiting
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.request_delay:
-            time.sleep(self.request_delay - time_since_last)
+        cached = self.response_cache.lookup(url) if self.response_cache else None
+        if cached and cached.is_fresh():
+            return cached.body
+        
+        # Stale entries are revalidated instead of re-downloaded
+        request_headers = cached.conditional_headers() if cached else {}
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            self.last_request_time = time.time()
-            return response.json()
+            for attempt in range(self.max_retries + 1):
+                # Shared by all worker threads, so they stay within one budget
+                self.rate_limiter.acquire()
+                response = self.session.get(url, timeout=10, headers=request_headers)
+                self.rate_limiter.update(response.headers, response.status_code)
+                
+                # On 429 the limiter holds back every caller until Retry-After
+                if response.status_code == 429 and attempt < self.max_retries:
+                    continue
+                
+                if response.status_code == 304 and cached:
+                    self.response_cache.revalidate(cached, response.headers)
+                    return cached.body
+                
+                response.raise_for_status()
+                data = response.json()
+                if self.response_cache:
+                    self.response_cache.store(url, data, response.headers)
+                return data
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to fetch data from Reddit: {str(e)}")
         except ValueError as e:
             raise Exception(f"Failed to parse Reddit JSON response: {str(e)}")
     
-    def get_hot_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100) -> List[RedditPost]:
+    def _iter_listing(self, subreddit_name: str, feed: str, limit: int,
+                      prefetch: bool = True, seen: Optional[Set[str]] = None) -> Iterator[List[RedditPost]]:
         """
-        Fetch hot posts from a subreddit using JSON feed with pagination support.
+        Page through a subreddit listing, yielding one batch of posts per page.
         
         Args:
             subreddit_name: Name of the subreddit to fetch from
-            limit: Maximum number of posts to fetch (can exceed 100 with pagination)
+            feed: Listing name ("hot" or "new")
+            limit: Maximum number of posts to yield in total
+            prefetch: If True, download the next page in the background while
+                the consumer processes the current one
+            seen: Fullnames at which to stop (already ingested posts)
             
-        Returns:
-            List of RedditPost objects
-            
-        Raises:
-            Exception: If fetch fails
+        Yields:
+            Non-empty lists of RedditPost objects in listing order
         """
+        seen = seen or set()
+        posts_per_request = min(100, limit)  # Reddit max is ~100 per request
+        fetched = 0
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        
+        def fetch_page(after: Optional[str], count: int) -> Tuple[List[RedditPost], Optional[str]]:
+            # Build URL with pagination
+            url = f"{self.base_url}/r/{subreddit_name}/{feed}.json?limit={count}"
+            if after:
+                url += f"&after={after}"
+            return parse_listing(self._make_request(url))
+        
         try:
-            all_posts = []
-            after = None
-            posts_per_request = min(100, limit)  # Reddit max is ~100 per request
-            
-            while len(all_posts) < limit:
-                # Calculate how many posts to request this time
-                remaining = limit - len(all_posts)
-                current_limit = min(posts_per_request, remaining)
+            if limit <= 0:
+                return
+            
+            page = fetch_page(None, posts_per_request)
+            
+            while True:
+                posts_batch, after = page
                 
-                # Build URL with pagination
-                url = f"https://www.reddit.com/r/{subreddit_name}/hot.json?limit={current_limit}"
-                if after:
-                    url += f"&after={after}"
+                if not posts_batch:
+                    return  # No more posts available
                 
-                data = self._make_request(url)
+                # Ensure we don't exceed requested limit
+                posts_batch = posts_batch[:limit - fetched]
                 
-                if 'data' not in data or 'children' not in data['data']:
-                    break
+                # Everything after the first already-ingested post is old
+                reached_watermark = False
+                for i, post in enumerate(posts_batch):
+                    if f"t3_{post.id}" in seen:
+                        posts_batch = posts_batch[:i]
+                        reached_watermark = True
+                        break
                 
-                posts_batch = []
-                for item in data['data']['children']:
-                    if item['kind'] != 't3':  # t3 = link/post
-                        continue
-                        
-                    post_data = item['data']
-                    
-                    # Skip stickied posts
-                    if post_data.get('stickied', False):
-                        continue
-                    
-                    post = RedditPost(
-                        id=post_data['id'],
-                        title=post_data['title'],
-                        content=post_data.get('selftext', '') or '',
-                        comments=[],  # Comments fetched separately if needed
-                        created_utc=datetime.fromtimestamp(post_data['created_utc']),
-                        score=post_data['score']
-                    )
-                    posts_batch.append(post)
+                fetched += len(posts_batch)
+                has_next_page = bool(after) and not reached_watermark and fetched < limit
                 
-                if not posts_batch:
-                    break  # No more posts available
+                # Start downloading the next page before handing this one over
+                if has_next_page:
+                    next_count = min(posts_per_request, limit - fetched)
+                    if executor:
+                        next_page = executor.submit(fetch_page, after, next_count)
                 
-                all_posts.extend(posts_batch)
+                if posts_batch:
+                    yield posts_batch
                 
-                # Get pagination token for next request
-                after = data['data'].get('after')
-                if not after:
-                    break  # No more pages
+                if not has_next_page:
+                    return
+                
+                page = next_page.result() if executor else fetch_page(after, next_count)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def iter_hot_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100,
+                       prefetch: bool = True) -> Iterator[List[RedditPost]]:
+        """
+        Stream hot posts from a subreddit, one batch per listing page.
+        
+        The next page is prefetched while the caller works on the current batch,
+        so extraction and scoring can overlap with network wait.
+        
+        Args:
+            subreddit_name: Name of the subreddit to fetch from
+            limit: Maximum number of posts to fetch (can exceed 100 with pagination)
+            prefetch: If True, download the next page in the background
             
-            return all_posts[:limit]  # Ensure we don't exceed requested limit
+        Yields:
+            Lists of RedditPost objects in listing order
             
+        Raises:
+            Exception: If fetch fails
+        """
+        try:
+            yield from self._iter_listing(subreddit_name, "hot", limit, prefetch)
         except Exception as e:
             raise Exception(f"Failed to fetch posts from r/{subreddit_name}: {str(e)}")
     
-    def get_new_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100) -> List[RedditPost]:
+    def iter_new_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100,
+                       prefetch: bool = True, since_last_seen: bool = False) -> Iterator[List[RedditPost]]:
         """
-        Fetch newest posts from a subreddit using JSON feed with pagination support.
+        Stream newest posts from a subreddit, one batch per listing page.
         
         Args:
             subreddit_name: Name of the subreddit to fetch from
             limit: Maximum number of posts to fetch (can exceed 100 with pagination)
+            prefetch: If True, download the next page in the background
+            since_last_seen: If True, stop at the first post already ingested by a
+                previous call. The watermark is advanced once the stream is
+                fully consumed. Requires a watermark_store.
             
-        Returns:
-            List of RedditPost objects
+        Yields:
+            Lists of RedditPost objects in listing order
+            
+        Raises:
+            Exception: If fetch fails
         """
         try:
-            all_posts = []
-            after = None
-            posts_per_request = min(100, limit)
+            if since_last_seen and self.watermark_store is None:
+                raise ValueError("since_last_seen requires a watermark_store")
             
-            while len(all_posts) < limit:
-                remaining = limit - len(all_posts)
-                current_limit = min(posts_per_request, remaining)
-                
-                url = f"https://www.reddit.com/r/{subreddit_name}/new.json?limit={current_limit}"
-                if after:
-                    url += f"&after={after}"
-                
-                data = self._make_request(url)
-                
-                if 'data' not in data or 'children' not in data['data']:
-                    break
-                
-                posts_batch = []
-                for item in data['data']['children']:
-                    if item['kind'] != 't3':
-                        continue
-                        
-                    post_data = item['data']
-                    
-                    if post_data.get('stickied', False):
-                        continue
-                    
-                    post = RedditPost(
-                        id=post_data['id'],
-                        title=post_data['title'],
-                        content=post_data.get('selftext', '') or '',
-                        comments=[],
-                        created_utc=datetime.fromtimestamp(post_data['created_utc']),
-                        score=post_data['score']
-                    )
-                    posts_batch.append(post)
-                
-                if not posts_batch:
-                    break
-                
-                all_posts.extend(posts_batch)
-                
-                after = data['data'].get('after')
-                if not after:
-                    break
+            watermark_key = f"{subreddit_name.lower()}/new"
+            seen = self.watermark_store.get_seen(watermark_key) if since_last_seen else set()
+            ingested = []
+            
+            for posts_batch in self._iter_listing(subreddit_name, "new", limit, prefetch, seen):
+                ingested.extend(f"t3_{post.id}" for post in posts_batch)
+                yield posts_batch
             
-            return all_posts[:limit]
+            if since_last_seen:
+                self.watermark_store.add_seen(watermark_key, ingested)
             
         except Exception as e:
             raise Exception(f"Failed to fetch new posts from r/{subreddit_name}: {str(e)}")
     
-    def get_post_comments(self, post_id: str, limit: int = 50) -> List[str]:
+    def get_hot_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100) -> List[RedditPost]:
+        """
+        Fetch hot posts from a subreddit using JSON feed with pagination support.
+        
+        Args:
+            subreddit_name: Name of the subreddit to fetch from
+            limit: Maximum number of posts to fetch (can exceed 100 with pagination)
+            
+        Returns:
+            List of RedditPost objects
+            
+        Raises:
+            Exception: If fetch fails
+        """
+        return [post for posts_batch in self.iter_hot_posts(subreddit_name, limit, prefetch=False)
+                for post in posts_batch]
+    
+    def get_new_posts(self, subreddit_name: str = "wallstreetbets", limit: int = 100,
+                      since_last_seen: bool = False) -> List[RedditPost]:
+        """
+        Fetch newest posts from a subreddit using JSON feed with pagination support.
+        
+        Args:
+            subreddit_name: Name of the subreddit to fetch from
+            limit: Maximum number of posts to fetch (can exceed 100 with pagination)
+            since_last_seen: If True, stop paginating at the first post already
+                ingested by a previous call and return only the new posts.
+                Requires a watermark_store.
+            
+        Returns:
+            List of RedditPost objects
+        """
+        return [post for posts_batch in self.iter_new_posts(subreddit_name, limit, prefetch=False,
+                                                             since_last_seen=since_last_seen)
+                for post in posts_batch]
+    
+    def get_post_comments(self, post_id: str, limit: int = 50, expand_tree: bool = False,
+                          request_budget: Optional[RequestBudget] = None) -> List[str]:
         """
         Fetch comments for a specific post using JSON feed.
         
         Args:
             post_id: Reddit post ID
             limit: Maximum number of comments to fetch
+            expand_tree: If True, walk nested replies and resolve "more" stubs
+                with batched /api/morechildren requests until limit is reached
+            request_budget: Optional budget of "more" requests shared across posts;
+                expansion stops when it runs out
             
         Returns:
             List of comment text strings
@@ -206,33 +462,31 @@ class RedditScraper:
             Exception: If fetch fails
         """
         try:
-            url = f"https://www.reddit.com/comments/{post_id}.json?limit={limit}"
+            url = f"{self.base_url}/comments/{post_id}.json?limit={limit}"
             data = self._make_request(url)
             
-            comments = []
-            
-            # Reddit comments JSON has a specific structure
-            if not isinstance(data, list) or len(data) < 2:
-                return comments
+            if not expand_tree:
+                return parse_comments(data, limit)
             
-            # Comments are in the second element of the response
-            comments_data = data[1]['data']['children']
+            comments, more_ids = parse_comment_tree(data, limit)
             
-            for item in comments_data:
-                if item['kind'] != 't1':  # t1 = comment
-                    continue
-                    
-                comment_data = item['data']
-                comment_body = comment_data.get('body', '')
+            while more_ids and len(comments) < limit:
+                if request_budget is not None and not request_budget.try_spend():
+                    break
                 
-                # Skip deleted/removed comments
-                if comment_body in ['[deleted]', '[removed]', '']:
-                    continue
+                batch = more_ids[:self.MORE_CHILDREN_BATCH]
+                more_ids = more_ids[self.MORE_CHILDREN_BATCH:]
                 
-                comments.append(comment_body)
+                url = (f"{self.base_url}/api/morechildren.json?api_type=json"
+                       f"&link_id=t3_{post_id}&children={','.join(batch)}")
+                try:
+                    more_data = self._make_request(url)
+                except Exception:
+                    break  # Keep the comments gathered so far
                 
-                if len(comments) >= limit:
-                    break
+                batch_comments, batch_more_ids = parse_more_children(more_data, limit - len(comments))
+                comments.extend(batch_comments)
+                more_ids.extend(batch_more_ids)
             
             return comments
             
@@ -241,7 +495,9 @@ class RedditScraper:
     
     def get_posts_with_comments(self, subreddit_name: str = "wallstreetbets", 
                                post_limit: int = 50, comment_limit: int = 20, 
-                               use_new_feed: bool = False) -> List[RedditPost]:
+                               use_new_feed: bool = False, max_workers: int = 1,
+                               expand_tree: bool = False,
+                               max_more_requests: Optional[int] = None) -> List[RedditPost]:
         """
         Fetch posts with their comments included.
         
@@ -250,6 +506,11 @@ class RedditScraper:
             post_limit: Maximum number of posts to fetch
             comment_limit: Maximum number of comments per post
             use_new_feed: If True, use /new feed instead of /hot
+            max_workers: Number of concurrent comment fetches (1 = sequential).
+                All workers share this scraper's rate limit.
+            expand_tree: If True, include nested replies and resolve "more" stubs
+            max_more_requests: Global cap on "more" requests across all posts
+                (None = only limited by comment_limit)
             
         Returns:
             List of RedditPost objects with comments populated
@@ -259,15 +520,93 @@ class RedditScraper:
         else:
             posts = self.get_hot_posts(subreddit_name, post_limit)
         
-        # Fetch comments for each post (with rate limiting)
-        for post in posts:
+        max_workers = max(1, min(max_workers, self.MAX_WORKERS, len(posts)))
+        request_budget = RequestBudget(max_more_requests) if max_more_requests is not None else None
+        
+        def fetch_comments(post: RedditPost) -> List[str]:
+            return self._get_post_comments_or_empty(post.id, comment_limit,
+                                                    expand_tree=expand_tree,
+                                                    request_budget=request_budget)
+        
+        if max_workers == 1:
+            # Fetch comments for each post (with rate limiting)
+            for post in posts:
+                post.comments = fetch_comments(post)
+            return posts
+        
+        # Results come back in post order; a failed post only loses its own comments
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            all_comments = executor.map(fetch_comments, posts)
+            for post, comments in zip(posts, all_comments):
+                post.comments = comments
+        
+        return posts
+    
+    def _get_post_comments_or_empty(self, post_id: str, limit: int, **kwargs) -> List[str]:
+        """Fetch comments for a post, returning an empty list if fetching fails."""
+        try:
+            return self.get_post_comments(post_id, limit, **kwargs)
+        except Exception:
+            # If comment fetching fails, continue with empty comments
+            return []
+    
+    def get_multi_subreddit_posts(self, subreddit_names: List[str], limit: int = 100,
+                                  use_new_feed: bool = False, combine_listings: bool = True,
+                                  max_workers: int = 4) -> List[RedditPost]:
+        """
+        Fetch posts from several subreddits in one ingestion pass.
+        
+        By default a single combined listing (r/a+b+c) is paged through. If that
+        is disabled or fails, each subreddit is fetched concurrently under this
+        scraper's shared rate limit, with the limit split evenly between them.
+        
+        Args:
+            subreddit_names: Subreddits to fetch from
+            limit: Maximum total number of posts to fetch
+            use_new_feed: If True, use /new feed instead of /hot
+            combine_listings: If True, try a combined r/a+b+c listing first
+            max_workers: Concurrent fetches when subreddits are fetched separately
+            
+        Returns:
+            List of RedditPost objects, deduplicated by id and tagged with their subreddit
+        """
+        fetch = self.get_new_posts if use_new_feed else self.get_hot_posts
+        # Names are case-insensitive, so "WallStreetBets" and "wallstreetbets" are fetched once
+        subreddit_names = list(dict.fromkeys(name.lower() for name in subreddit_names))
+        batches = []
+        
+        if combine_listings and len(subreddit_names) > 1:
             try:
-                post.comments = self.get_post_comments(post.id, comment_limit)
+                batches = [fetch("+".join(subreddit_names), limit)]
             except Exception:
-                # If comment fetching fails, continue with empty comments
-                post.comments = []
+                batches = []  # Fall back to fetching subreddits separately
         
-        return posts
+        if not batches:
+            per_subreddit_limit = -(-limit // max(1, len(subreddit_names)))  # Ceiling division
+            
+            def fetch_subreddit(name: str) -> List[RedditPost]:
+                try:
+                    posts = fetch(name, per_subreddit_limit)
+                except Exception:
+                    return []  # One failing subreddit does not sink the others
+                for post in posts:
+                    post.subreddit = post.subreddit or name
+                return posts
+            
+            workers = max(1, min(max_workers, self.MAX_WORKERS, len(subreddit_names)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                batches = list(executor.map(fetch_subreddit, subreddit_names))
+        
+        # Deduplicate by post id, keeping the first occurrence
+        seen_ids = set()
+        posts = []
+        for batch in batches:
+            for post in batch:
+                if post.id not in seen_ids:
+                    seen_ids.add(post.id)
+                    posts.append(post)
+        
+        return posts[:limit]
     
     def get_mixed_feed(self, subreddit_name: str = "wallstreetbets", 
                       total_limit: int = 50) -> List[RedditPost]:
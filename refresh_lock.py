@@ -0,0 +1,95 @@
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class RefreshLock:
+    def __init__(self, path: str):
+        """
+        Initialize an exclusive lock on a file, shared by every thread and process.
+        
+        The lock is an OS file lock (flock, or msvcrt.locking on Windows) on
+        its own open file, so two threads of one process exclude each other
+        just like two processes do, and a crashed holder releases it with its
+        file descriptors. The lock file itself is left in place; deleting it
+        could let a waiter lock a file that a newcomer no longer sees.
+        
+        Args:
+            path: Lock file, created if missing
+        """
+        self.path = path
+        self._fd: Optional[int] = None
+    
+    def acquire(self, timeout: Optional[float] = None, poll_interval: float = 0.1) -> bool:
+        """
+        Take the lock, waiting for the current holder if there is one.
+        
+        Args:
+            timeout: Seconds to wait (None waits forever, 0 does not wait)
+            poll_interval: Seconds between attempts while waiting
+        
+        Returns:
+            True if the lock is now held
+        """
+        if self._fd is not None:
+            return True
+        
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._try_lock(fd):
+                self._fd = fd
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                os.close(fd)
+                return False
+            time.sleep(poll_interval if deadline is None else
+                       max(0.0, min(poll_interval, deadline - time.monotonic())))
+    
+    @staticmethod
+    def _try_lock(fd: int) -> bool:
+        """Lock an open file without blocking."""
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    
+    def release(self) -> None:
+        """Release the lock if it is held."""
+        fd = self._fd
+        if fd is None:
+            return
+        
+        self._fd = None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+    
+    @property
+    def held(self) -> bool:
+        """Whether this instance holds the lock."""
+        return self._fd is not None
+    
+    def __enter__(self) -> "RefreshLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+from lru_cache import LRUCache
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    ttl: float
+    
+    def is_fresh(self) -> bool:
+        """Check whether the entry can be served without contacting Reddit."""
+        return time.time() - self.stored_at < self.ttl
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def _header_str(headers: Mapping[str, Any], name: str) -> Optional[str]:
+    """Read a header as a string, ignoring missing or non-string values."""
+    value = headers.get(name)
+    return value if isinstance(value, str) else None
+
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = ".reddit_cache", listing_ttl: float = 60.0,
+                 comments_ttl: float = 300.0, old_comments_ttl: float = 3600.0,
+                 old_post_age: float = 86400.0, max_bytes: int = 50 * 1024 * 1024,
+                 max_entries: int = 5000):
+        """
+        Initialize a disk-backed cache of Reddit JSON responses keyed by URL.
+        
+        Entries store the response's ETag/Last-Modified so stale entries can be
+        revalidated with a conditional GET instead of re-downloaded.
+        
+        Args:
+            cache_dir: Directory holding one JSON file per cached URL
+            listing_ttl: Seconds a hot/new listing is served without revalidation
+            comments_ttl: Seconds a comment thread of a recent post is served
+            old_comments_ttl: Seconds a comment thread of an old post is served
+            old_post_age: Post age in seconds after which its thread counts as old
+            max_bytes: Cap on the total size of cached files (LRU eviction)
+            max_entries: Cap on the number of cached files (LRU eviction)
+        """
+        self.cache_dir = cache_dir
+        self.listing_ttl = listing_ttl
+        self.comments_ttl = comments_ttl
+        self.old_comments_ttl = old_comments_ttl
+        self.old_post_age = old_post_age
+        
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        
+        # Maps URL key -> file path in recency order; evicted files are deleted
+        self._index = LRUCache(max_entries=max_entries, max_bytes=max_bytes,
+                               on_evict=lambda key, path: self._remove_file(path))
+        self._load_index()
+    
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from files left by previous processes (oldest first)."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        
+        paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                 if name.endswith('.json')]
+        entries = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        
+        for _, path, size in sorted(entries):
+            key = os.path.basename(path)[:-len('.json')]
+            self._index.put(key, path, size)
+    
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+    
+    def _remove_file(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def ttl_for(self, url: str, body: Any) -> float:
+        """
+        Pick the TTL for a response based on its endpoint class.
+        
+        Listings change constantly and get a short TTL; comment threads of old
+        posts rarely change and are kept longer.
+        """
+        if '/api/morechildren' in url:
+            return self.comments_ttl
+        if '/comments/' not in url:
+            return self.listing_ttl
+        
+        try:
+            created_utc = body[0]['data']['children'][0]['data']['created_utc']
+        except (KeyError, IndexError, TypeError):
+            return self.comments_ttl
+        
+        if time.time() - created_utc > self.old_post_age:
+            return self.old_comments_ttl
+        return self.comments_ttl
+    
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached response for a URL.
+        
+        Returns:
+            The cached entry (fresh or stale), or None if the URL is not cached
+        """
+        key = self._key(url)
+        path = self._index.get(key)
+        if path is None:
+            return None
+        
+        try:
+            with open(path, 'r') as f:
+                entry = CachedResponse(**json.load(f))
+        except Exception:
+            self._index.pop(key)
+            self._remove_file(path)
+            return None
+        
+        if entry.is_fresh():
+            self.hits += 1
+        return entry
+    
+    def store(self, url: str, body: Any, headers: Mapping[str, Any]) -> None:
+        """Cache a freshly downloaded response."""
+        self.misses += 1
+        self._write(CachedResponse(
+            url=url,
+            body=body,
+            etag=_header_str(headers, 'ETag'),
+            last_modified=_header_str(headers, 'Last-Modified'),
+            stored_at=time.time(),
+            ttl=self.ttl_for(url, body)
+        ))
+    
+    def revalidate(self, entry: CachedResponse, headers: Mapping[str, Any]) -> None:
+        """Mark a stale entry fresh again after a 304 Not Modified response."""
+        self.revalidated += 1
+        entry.etag = _header_str(headers, 'ETag') or entry.etag
+        entry.last_modified = _header_str(headers, 'Last-Modified') or entry.last_modified
+        entry.stored_at = time.time()
+        self._write(entry)
+    
+    def _write(self, entry: CachedResponse) -> None:
+        """Write an entry atomically and register it in the LRU index."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            key = self._key(entry.url)
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entry.__dict__, f)
+                os.replace(temp_path, path)
+            except Exception:
+                self._remove_file(temp_path)
+                raise
+            self._index.put(key, path, os.path.getsize(path))
+        except (OSError, TypeError, ValueError):
+            # Caching is best effort; a failed write just means a future miss
+            pass
+    
+    def clear(self) -> None:
+        """Delete all cached responses."""
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                self._remove_file(os.path.join(self.cache_dir, name))
+        self._index.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with fresh hits, 304 revalidations, misses, hit rate and size
+        """
+        index_stats = self._index.get_stats()
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+            "entries": index_stats["entries"],
+            "bytes": index_stats["bytes"],
+            "evictions": index_stats["evictions"]
+        }
\ No newline at end of file
@@ -0,0 +1,236 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from lru_cache import LRUCache
+
+
+# (compound, positive, negative, neutral)
+Scores = Tuple[float, float, float, float]
+
+
+def text_key(text: str) -> bytes:
+    """Hash a text into a compact cache key."""
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+
+
+class ScoreCache:
+    def __init__(self, path: str = ".sentiment_cache.sqlite", version: str = "",
+                 memory_entries: int = 20000, max_entries: int = 1000000, touch_interval: float = 3600):
+        """
+        Initialize a persistent cache of sentiment scores keyed by text hash.
+        
+        Lookups go to an in-memory LRU first and then to a SQLite table on disk.
+        Entries scored by a different analyzer/lexicon version are never
+        returned, and the least recently used rows are evicted once the table
+        holds more than max_entries. A disk hit only writes the row's recency
+        back when it is older than touch_interval, so repeated reads stay
+        read-only and eviction order is kept to that granularity.
+        
+        Args:
+            path: SQLite database file
+            version: Analyzer/lexicon version the scores belong to
+            memory_entries: Entries kept in the in-memory LRU
+            max_entries: Cap on the number of rows on disk
+            touch_interval: Seconds before a read refreshes a row's recency on disk
+        """
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self._memory = LRUCache(max_entries=memory_entries)
+        self._lock = threading.Lock()
+        # Upper bound on the rows on disk (replaced rows are counted twice)
+        self._row_count = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connect_failed = False
+    
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use; None means the cache runs memory-only."""
+        with self._lock:
+            if self._connection is None and not self._connect_failed:
+                self._connection = self._connect()
+                self._connect_failed = self._connection is None
+            return self._connection
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database, or return None if it cannot be opened."""
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            # Readers never block the writer (or each other) and commits skip the fsync per transaction
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "key BLOB NOT NULL, version TEXT NOT NULL, "
+                "compound REAL, positive REAL, negative REAL, neutral REAL, "
+                "last_used REAL NOT NULL, PRIMARY KEY (key, version))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+            connection.commit()
+            self._row_count = connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            return connection
+        except sqlite3.Error:
+            return None
+    
+    def get_many(self, texts: List[str]) -> Dict[str, Scores]:
+        """
+        Look up scores for several texts.
+        
+        Args:
+            texts: Texts to look up
+        
+        Returns:
+            Dictionary mapping the cached texts to their scores
+        """
+        found = {}
+        disk_lookups = {}
+        for text in texts:
+            key = text_key(text)
+            # The version is part of the memory key too: it is stamped on the
+            # cache after construction and may change while entries are held
+            scores = self._memory.get((self.version, key))
+            if scores is not None:
+                self.memory_hits += 1
+                found[text] = scores
+            else:
+                disk_lookups[key] = text
+        
+        if disk_lookups and self._get_connection() is not None:
+            keys = list(disk_lookups)
+            now = time.time()
+            touched = []
+            with self._lock:
+                try:
+                    for start in range(0, len(keys), 500):
+                        batch = keys[start:start + 500]
+                        placeholders = ",".join("?" * len(batch))
+                        rows = self._connection.execute(
+                            f"SELECT key, compound, positive, negative, neutral, last_used FROM scores "
+                            f"WHERE version = ? AND key IN ({placeholders})",
+                            [self.version, *batch]
+                        ).fetchall()
+                        for key, *scores, last_used in rows:
+                            scores = tuple(scores)
+                            found[disk_lookups[key]] = scores
+                            self._memory.put((self.version, key), scores)
+                            self.disk_hits += 1
+                            if now - last_used >= self.touch_interval:
+                                touched.append((now, key, self.version))
+                    
+                    # One write transaction for every row whose recency went stale
+                    if touched:
+                        self._connection.executemany(
+                            "UPDATE scores SET last_used = ? WHERE key = ? AND version = ?", touched
+                        )
+                        self._connection.commit()
+                except sqlite3.Error:
+                    pass
+        
+        self.misses += len(texts) - len(found)
+        return found
+    
+    def get(self, text: str) -> Optional[Scores]:
+        """Look up the scores of one text."""
+        return self.get_many([text]).get(text)
+    
+    def put_many(self, items: List[Tuple[str, Scores]]) -> None:
+        """Store freshly computed scores, evicting old rows if the table is over its cap."""
+        if not items:
+            return
+        
+        rows = []
+        for text, scores in items:
+            key = text_key(text)
+            self._memory.put((self.version, key), scores)
+            rows.append((key, self.version, *scores, time.time()))
+        
+        if self._get_connection() is None:
+            return
+        
+        with self._lock:
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO scores "
+                    "(key, version, compound, positive, negative, neutral, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._row_count += len(rows)
+                self._evict()
+                self._connection.commit()
+            except sqlite3.Error:
+                # Caching is best effort; a failed write just means a future miss
+                pass
+    
+    def put(self, text: str, scores: Scores) -> None:
+        """Store the scores of one text."""
+        self.put_many([(text, scores)])
+    
+    def _evict(self) -> None:
+        """Drop the least recently used rows beyond max_entries (caller holds the lock)."""
+        if self._row_count <= self.max_entries:
+            return
+        
+        self._row_count = self._connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        excess = self._row_count - self.max_entries
+        if excess <= 0:
+            return
+        
+        # Evict a little extra so eviction does not run on every write
+        excess += self.max_entries // 10
+        deleted = self._connection.execute(
+            "DELETE FROM scores WHERE rowid IN "
+            "(SELECT rowid FROM scores ORDER BY last_used LIMIT ?)", (excess,)
+        ).rowcount
+        self._row_count -= deleted
+        self.evictions += deleted
+    
+    def clear(self) -> None:
+        """Delete all cached scores."""
+        self._memory.clear()
+        if self._get_connection() is not None:
+            with self._lock:
+                self._connection.execute("DELETE FROM scores")
+                self._connection.commit()
+                self._row_count = 0
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with memory hits, disk hits, misses, hit rate, rows on disk and evictions
+        """
+        entries = 0
+        if self._get_connection() is not None:
+            with self._lock:
+                try:
+                    entries = self._connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": entries,
+            "evictions": self.evictions
+        }
\ No newline at end of file
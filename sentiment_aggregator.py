@@ -0,0 +1,268 @@
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from models import RedditPost, SentimentResult
+from score_cache import Scores, text_key
+from sentiment_analyzer import SentimentAnalyzer
+from stock_extractor import StockExtractor
+
+
+class SentimentAggregator:
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize running per-ticker sentiment sums that texts can join and leave.
+        
+        Every text is kept with its tickers and scores, so adding, replacing or
+        retracting one only touches the totals of its own tickers. Averages
+        match SentimentAnalyzer.analyze_indexed_sentiment over the same texts
+        (up to float rounding of the running sums).
+        
+        Args:
+            path: JSON checkpoint file; loaded now if it exists
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # text id -> (tickers, scores, text hash)
+        self._texts: Dict[str, Tuple[Tuple[str, ...], Scores, str]] = {}
+        # post id -> ids of its texts that mention a ticker
+        self._post_texts: Dict[str, List[str]] = {}
+        # ticker -> [count, compound, positive, negative, neutral]
+        self._totals: Dict[str, List[float]] = {}
+        if path is not None:
+            self.load(path)
+    
+    def add(self, text_id: str, tickers: Iterable[str], scores: Scores, text_hash: str = "") -> None:
+        """
+        Add a text's scores to the totals of the tickers it mentions.
+        
+        Adding an id that is already present replaces the old text (an edit).
+        
+        Args:
+            text_id: Stable identifier of the text, e.g. "abc123/comment/9f86d081884c7d65"
+            tickers: Tickers the text mentions
+            scores: (compound, positive, negative, neutral) of the text
+            text_hash: Hash of the text, used to skip unchanged texts on sync
+        """
+        with self._lock:
+            self._retract(text_id)
+            tickers = tuple(sorted(set(tickers)))
+            self._texts[text_id] = (tickers, scores, text_hash)
+            for ticker in tickers:
+                totals = self._totals.get(ticker)
+                if totals is None:
+                    totals = self._totals[ticker] = [0, 0.0, 0.0, 0.0, 0.0]
+                totals[0] += 1
+                totals[1] += scores[0]
+                totals[2] += scores[1]
+                totals[3] += scores[2]
+                totals[4] += scores[3]
+    
+    def retract(self, text_id: str) -> bool:
+        """
+        Remove an edited or deleted text from the totals.
+        
+        Args:
+            text_id: Identifier the text was added under
+        
+        Returns:
+            True if the text was present
+        """
+        with self._lock:
+            return self._retract(text_id)
+    
+    def _retract(self, text_id: str) -> bool:
+        """Remove a text (caller holds the lock)."""
+        entry = self._texts.pop(text_id, None)
+        if entry is None:
+            return False
+        
+        tickers, scores, _ = entry
+        for ticker in tickers:
+            totals = self._totals[ticker]
+            totals[0] -= 1
+            if totals[0] == 0:
+                # Drop the ticker rather than keep float residue of the sums
+                del self._totals[ticker]
+                continue
+            totals[1] -= scores[0]
+            totals[2] -= scores[1]
+            totals[3] -= scores[2]
+            totals[4] -= scores[3]
+        return True
+    
+    def sync_posts(self, posts: List[RedditPost], extractor: StockExtractor,
+                   analyzer: SentimentAnalyzer) -> int:
+        """
+        Bring the totals up to date with the current state of some posts.
+        
+        New and edited texts are scored in one batch, texts that disappeared
+        from a post are retracted and unchanged texts are left alone. Comments
+        are identified by a hash of their text (RedditPost carries no comment
+        ids), so reordered or deleted comments do not change the ids of the
+        others; repeats of the same text in a post get a numbered suffix.
+        
+        Args:
+            posts: Posts as currently fetched from Reddit
+            extractor: Extractor used to find the tickers of each text
+            analyzer: Analyzer used to score new and edited texts
+        
+        Returns:
+            Number of texts that were scored
+        """
+        pending = []
+        with self._lock:
+            for post in posts:
+                text_ids = []
+                fields = [("title", post.title), ("content", post.content)]
+                occurrences = Counter()
+                for comment in post.comments:
+                    digest = text_key(comment).hex()[:16]
+                    occurrences[digest] += 1
+                    suffix = f"/{occurrences[digest]}" if occurrences[digest] > 1 else ""
+                    fields.append((f"comment/{digest}{suffix}", comment))
+                
+                for field, text in fields:
+                    if not text:
+                        continue
+                    tickers = extractor.extract_tickers(text)
+                    if not tickers:
+                        continue
+                    
+                    text_id = f"{post.id}/{field}"
+                    text_ids.append(text_id)
+                    text_hash = text_key(text).hex()
+                    entry = self._texts.get(text_id)
+                    if entry is None or entry[2] != text_hash or set(entry[0]) != tickers:
+                        pending.append((text_id, text, tickers, text_hash))
+                
+                kept = set(text_ids)
+                for text_id in self._post_texts.get(post.id, []):
+                    if text_id not in kept:
+                        self._retract(text_id)
+                self._post_texts[post.id] = text_ids
+        
+        if not pending:
+            return 0
+        
+        batch = analyzer.score_batch([text for _, text, _, _ in pending])
+        for i, (text_id, _, tickers, text_hash) in enumerate(pending):
+            scores = (batch.compound[i], batch.positive[i], batch.negative[i], batch.neutral[i])
+            self.add(text_id, tickers, scores, text_hash)
+        return len(pending)
+    
+    def retract_post(self, post_id: str) -> int:
+        """
+        Remove every text of a deleted or removed post.
+        
+        Args:
+            post_id: Reddit post id
+        
+        Returns:
+            Number of texts retracted
+        """
+        with self._lock:
+            text_ids = self._post_texts.pop(post_id, [])
+            return sum(self._retract(text_id) for text_id in text_ids)
+    
+    def retain_posts(self, post_ids: Iterable[str]) -> int:
+        """
+        Remove every text of the posts that are not in post_ids.
+        
+        Args:
+            post_ids: Ids of the posts to keep, e.g. the current listing
+        
+        Returns:
+            Number of texts retracted
+        """
+        kept = set(post_ids)
+        with self._lock:
+            gone = [post_id for post_id in self._post_texts if post_id not in kept]
+            return sum(self._retract(text_id)
+                       for post_id in gone for text_id in self._post_texts.pop(post_id))
+    
+    def get_sentiment(self, ticker: str) -> SentimentResult:
+        """
+        Get the average sentiment of the texts mentioning a ticker.
+        
+        Args:
+            ticker: Stock ticker symbol
+        
+        Returns:
+            SentimentResult averaged over the ticker's texts (neutral if none)
+        """
+        with self._lock:
+            totals = self._totals.get(ticker.upper())
+            if totals is None:
+                return SentimentResult(0.0, 0.0, 0.0, 1.0, "Neutral")
+            count, compound, positive, negative, neutral = totals
+        return SentimentAnalyzer._result_from_scores(compound / count, positive / count,
+                                                     negative / count, neutral / count)
+    
+    def get_mention_counts(self) -> Dict[str, int]:
+        """Get the number of texts mentioning each ticker, sorted by count descending."""
+        with self._lock:
+            counts = [(ticker, totals[0]) for ticker, totals in self._totals.items()]
+        return dict(sorted(counts, key=lambda item: (-item[1], item[0])))
+    
+    def checkpoint(self, path: Optional[str] = None) -> None:
+        """
+        Persist the texts atomically so a restart can keep adding and retracting.
+        
+        Args:
+            path: Checkpoint file (defaults to the path given at construction)
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No checkpoint path given")
+        
+        with self._lock:
+            data = {
+                "texts": {text_id: [list(tickers), list(scores), text_hash]
+                          for text_id, (tickers, scores, text_hash) in self._texts.items()},
+                "posts": self._post_texts
+            }
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                os.replace(temp_path, path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+    
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Replace the state with a checkpoint, rebuilding the totals from its texts.
+        
+        Args:
+            path: Checkpoint file (defaults to the path given at construction)
+        
+        Returns:
+            True if a checkpoint was loaded; a missing or corrupt file leaves
+            the aggregator empty
+        """
+        path = path or self.path
+        texts = {}
+        post_texts = {}
+        try:
+            if path is not None and os.path.exists(path):
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                texts = {text_id: (tuple(tickers), tuple(scores), text_hash)
+                         for text_id, (tickers, scores, text_hash) in data["texts"].items()}
+                post_texts = {post_id: list(text_ids) for post_id, text_ids in data["posts"].items()}
+        except Exception:
+            texts, post_texts = {}, {}
+        
+        with self._lock:
+            self._texts = {}
+            self._totals = {}
+            self._post_texts = post_texts
+        for text_id, (tickers, scores, text_hash) in texts.items():
+            self.add(text_id, tickers, scores, text_hash)
+        return bool(texts)
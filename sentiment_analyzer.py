@@ -1,12 +1,78 @@
-from typing import List, Dict
+import hashlib
+import re
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Dict, List, Optional, Set
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from models import RedditPost, SentimentResult
+from lru_cache import LRUCache
+from models import RedditPost, SentimentBatch, SentimentResult, TickerIndex
+from score_cache import ScoreCache
+from ticker_matcher import BOUNDARY_AFTER, BOUNDARY_BEFORE
+from vader_kernel import VaderKernel
+
+
+# Sentence ends: ., ! or ? followed by whitespace, or a line break
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# Ticker-shaped tokens with the extractor's boundaries
+_TICKER_TOKEN = re.compile(rf'[{BOUNDARY_BEFORE}]([A-Z]{{2,6}})(?![^{BOUNDARY_AFTER}])')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into non-empty sentences."""
+    return [sentence for sentence in (part.strip() for part in _SENTENCE_BOUNDARY.split(text)) if sentence]
+
+
+def ticker_tokens(text: str) -> Set[str]:
+    """Find every ticker-shaped token of text, matched case-insensitively like the extractor does."""
+    return set(_TICKER_TOKEN.findall(' ' + text.upper()))
+
+
+def analyzer_version(analyzer: SentimentIntensityAnalyzer) -> str:
+    """Fingerprint the VADER release and its loaded lexicons, so cached scores never outlive them."""
+    try:
+        digest = hashlib.sha1(version("vaderSentiment").encode())
+    except PackageNotFoundError:
+        digest = hashlib.sha1()
+    digest.update(repr(sorted(analyzer.lexicon.items())).encode('utf-8'))
+    digest.update(repr(sorted(analyzer.emojis.items())).encode('utf-8'))
+    return digest.hexdigest()
 
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize the sentiment analyzer with VADER."""
+    def __init__(self, score_cache: Optional[ScoreCache] = None, sentence_window: Optional[int] = None,
+                 sentence_memo_size: int = 5000, find_tickers: Optional[Callable[[str], Set[str]]] = None):
+        """
+        Initialize the sentiment analyzer with VADER.
+        
+        Args:
+            score_cache: Optional persistent cache of scores keyed by text hash;
+                its version is set to this analyzer's lexicon fingerprint
+            sentence_window: When set, a text is scored only on the sentences
+                within this many sentences of each ticker mention (None scores
+                whole texts)
+            sentence_memo_size: Number of texts whose sentences and sentence
+                scores are remembered for windowed scoring
+            find_tickers: Function returning the tickers mentioned in a sentence
+                (e.g. StockExtractor.extract_tickers); defaults to ticker_tokens
+        """
         self.analyzer = SentimentIntensityAnalyzer()
+        self.kernel = VaderKernel(self.analyzer)
+        self.version = analyzer_version(self.analyzer)
+        self.score_cache = score_cache
+        self.sentence_window = sentence_window
+        self.find_tickers = find_tickers or ticker_tokens
+        # text -> (sentences, per-sentence results filled lazily)
+        self._sentence_memo = LRUCache(max_entries=sentence_memo_size)
+        if score_cache is not None:
+            score_cache.version = self.version
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get score cache statistics (empty if caching is disabled)."""
+        return self.score_cache.get_stats() if self.score_cache is not None else {}
+    
+    def get_kernel_stats(self) -> Dict[str, Any]:
+        """Get statistics on texts that skipped VADER's rule pipeline (no lexicon words)."""
+        return self.kernel.get_stats()
     
     def get_sentiment_score(self, text: str) -> SentimentResult:
         """
@@ -21,11 +87,97 @@ class SentimentAnalyzer:
         if not text or not text.strip():
             return SentimentResult(0.0, 0.0, 0.0, 1.0, "Neutral")
         
-        # Get VADER sentiment scores
-        scores = self.analyzer.polarity_scores(text)
+        # Texts without lexicon words are neutral; not worth a cache lookup or entry
+        scores = self.kernel.lexicon_free_scores(text)
+        if scores is not None:
+            return self._result_from_scores(*scores)
+        
+        if self.score_cache is not None:
+            cached = self.score_cache.get(text)
+            if cached is not None:
+                return self._result_from_scores(*cached)
         
+        result = self._result_from_scores(*self.kernel.polarity_scores(text))
+        
+        if self.score_cache is not None:
+            self.score_cache.put(text, self._scores_of(result))
+        return result
+    
+    def _score(self, text: str) -> SentimentResult:
+        """Run VADER on a text without consulting the score cache."""
+        if not text or not text.strip():
+            return SentimentResult(0.0, 0.0, 0.0, 1.0, "Neutral")
+        scores = self.kernel.lexicon_free_scores(text)
+        if scores is None:
+            scores = self.kernel.polarity_scores(text)
+        return self._result_from_scores(*scores)
+    
+    def score_batch(self, texts: List[str]) -> SentimentBatch:
+        """
+        Score many texts into packed arrays instead of one SentimentResult per text.
+        
+        Scores are identical to VADER's polarity_scores (empty or whitespace-only
+        texts score as fully neutral, like get_sentiment_score). Repeated texts
+        are scored once, and the persistent score cache is consulted in one
+        query and updated with the new scores.
+        
+        Args:
+            texts: Texts to analyze
+        
+        Returns:
+            SentimentBatch whose arrays hold compound/positive/negative/neutral
+            scores in input order
+        """
+        batch = SentimentBatch()
+        compound = batch.compound
+        positive = batch.positive
+        negative = batch.negative
+        neutral = batch.neutral
+        
+        # Empty and lexicon-free texts are settled before the cache lookup
+        lexicon_free_scores = self.kernel.lexicon_free_scores
+        settled = {}
+        for text in texts:
+            if not text or not text.strip():
+                continue
+            if text not in settled:
+                settled[text] = lexicon_free_scores(text)
+        
+        if self.score_cache is not None:
+            cached = self.score_cache.get_many([text for text, scores in settled.items() if scores is None])
+        else:
+            cached = {}
+        fresh = []
+        polarity_scores = self.kernel.polarity_scores
+        
+        for text in texts:
+            if not text or not text.strip():
+                scores = (0.0, 0.0, 0.0, 1.0)
+            else:
+                scores = settled[text] or cached.get(text)
+                if scores is None:
+                    scores = polarity_scores(text)
+                    cached[text] = scores
+                    fresh.append((text, scores))
+            compound.append(scores[0])
+            positive.append(scores[1])
+            negative.append(scores[2])
+            neutral.append(scores[3])
+        
+        if self.score_cache is not None:
+            self.score_cache.put_many(fresh)
+        return batch
+    
+    @staticmethod
+    def _scores_of(result: SentimentResult) -> tuple:
+        """Flatten a result into the (compound, pos, neg, neu) tuple stored in the score cache."""
+        return (result.compound_score, result.positive, result.negative, result.neutral)
+    
+    @staticmethod
+    def _result_from_scores(compound: float, positive: float, negative: float,
+                            neutral: float) -> SentimentResult:
+        """Build a SentimentResult, deriving the category from the compound score."""
         # Determine sentiment category based on compound score
-        compound = scores['compound']
         if compound > 0.1:
             category = "Positive"
         elif compound < -0.1:
@@ -35,12 +187,68 @@ class SentimentAnalyzer:
         
         return SentimentResult(
             compound_score=compound,
-            positive=scores['pos'],
-            negative=scores['neg'],
-            neutral=scores['neu'],
+            positive=positive,
+            negative=negative,
+            neutral=neutral,
             category=category
         )
     
+    def get_window_sentiment(self, text: str, ticker: str, window: Optional[int] = None) -> SentimentResult:
+        """
+        Score only the sentences around the mentions of a ticker in a text.
+        
+        The selected sentences are scored one by one and averaged. Each text
+        is split once and its sentence scores are memoized, so a long post that
+        mentions several tickers scores every sentence at most once. Mentions
+        are found per sentence with find_tickers, so a ticker is never matched
+        inside another word. When the windows cover the whole text (or no
+        sentence mentions the ticker), the text is scored in full, exactly
+        like get_sentiment_score.
+        
+        Args:
+            text: Text mentioning the ticker
+            ticker: Stock ticker symbol
+            window: Sentences kept on each side of a mention (defaults to
+                sentence_window, or 0 if that is unset)
+        
+        Returns:
+            SentimentResult for the text around the ticker's mentions
+        """
+        if not text or not text.strip():
+            return SentimentResult(0.0, 0.0, 0.0, 1.0, "Neutral")
+        
+        if window is None:
+            window = self.sentence_window or 0
+        
+        entry = self._sentence_memo.get(text)
+        if entry is None:
+            sentences = split_sentences(text)
+            entry = (sentences, [None] * len(sentences))
+            self._sentence_memo.put(text, entry)
+        sentences, sentence_scores = entry
+        
+        ticker_upper = ticker.upper()
+        selected = set()
+        for i, sentence in enumerate(sentences):
+            if ticker_upper in self.find_tickers(sentence):
+                selected.update(range(max(0, i - window), min(len(sentences), i + window + 1)))
+        
+        if not selected or len(selected) == len(sentences):
+            return self.get_sentiment_score(text)
+        
+        results = []
+        for i in sorted(selected):
+            if sentence_scores[i] is None:
+                sentence_scores[i] = self.get_sentiment_score(sentences[i])
+            results.append(sentence_scores[i])
+        return self._aggregate_sentiments(results)
+    
+    def _score_mention(self, text: str, ticker: str) -> SentimentResult:
+        """Score a text that mentions ticker, honouring the sentence window mode."""
+        if self.sentence_window is None:
+            return self.get_sentiment_score(text)
+        return self.get_window_sentiment(text, ticker)
+    
     def analyze_stock_sentiment(self, posts: List[RedditPost], ticker: str) -> SentimentResult:
         """
         Calculate overall sentiment for a specific stock across multiple posts.
@@ -70,17 +278,106 @@ class SentimentAnalyzer:
                 if comment and ticker_upper in comment.upper():
                     relevant_texts.append(comment)
         
-        if not relevant_texts:
+        return self._aggregate_sentiments([self._score_mention(text, ticker) for text in relevant_texts])
+    
+    def analyze_indexed_sentiment(self, index: TickerIndex, ticker: str) -> SentimentResult:
+        """
+        Calculate overall sentiment for a stock from a prebuilt ticker index.
+        
+        Snippet scores are memoized on the index, so a text that mentions several
+        tickers is only scored once no matter how many tickers are analyzed. In
+        sentence window mode the scores depend on the ticker, so they are
+        memoized per sentence instead (see get_window_sentiment).
+        
+        Args:
+            index: TickerIndex built by StockExtractor.build_index
+            ticker: Stock ticker symbol to analyze sentiment for
+            
+        Returns:
+            SentimentResult with aggregated sentiment for the stock
+        """
+        sentiments = []
+        
+        if self.sentence_window is not None:
+            for snippet_id in index.ticker_snippets.get(ticker.upper(), []):
+                sentiments.append(self.get_window_sentiment(index.snippets[snippet_id], ticker))
+            return self._aggregate_sentiments(sentiments)
+        
+        for snippet_id in index.ticker_snippets.get(ticker.upper(), []):
+            sentiment = index.snippet_scores.get(snippet_id)
+            if sentiment is None:
+                sentiment = self.get_sentiment_score(index.snippets[snippet_id])
+                index.snippet_scores[snippet_id] = sentiment
+            sentiments.append(sentiment)
+        
+        return self._aggregate_sentiments(sentiments)
+    
+    def score_snippets(self, index: TickerIndex, tickers: List[str],
+                       score_batch: Optional[Callable[[List[str]], List[SentimentResult]]] = None) -> None:
+        """
+        Score every not yet scored snippet of the given tickers in one batch.
+        
+        Results are stored on the index, so analyze_indexed_sentiment afterwards
+        only aggregates. Aggregation stays in the caller's process and order,
+        which keeps the averages bit-for-bit identical to the serial path.
+        Whole snippets are not needed in sentence window mode, so nothing is
+        scored up front then.
+        
+        Args:
+            index: TickerIndex built by StockExtractor.build_index
+            tickers: Tickers whose snippets will be analyzed
+            score_batch: Function mapping a list of texts to their sentiment
+                results (e.g. a process pool); defaults to scoring in this process
+        """
+        if self.sentence_window is not None:
+            return
+        
+        snippet_ids = []
+        pending = set()
+        for ticker in tickers:
+            for snippet_id in index.ticker_snippets.get(ticker.upper(), []):
+                if snippet_id not in index.snippet_scores and snippet_id not in pending:
+                    pending.add(snippet_id)
+                    snippet_ids.append(snippet_id)
+        
+        if not snippet_ids:
+            return
+        
+        texts = [index.snippets[snippet_id] for snippet_id in snippet_ids]
+        
+        # Only texts missing from the persistent cache are sent off for scoring
+        cached = self.score_cache.get_many(texts) if self.score_cache is not None else {}
+        for snippet_id, text in zip(snippet_ids, texts):
+            if text in cached:
+                index.snippet_scores[snippet_id] = self._result_from_scores(*cached[text])
+        
+        missing = [(snippet_id, text) for snippet_id, text in zip(snippet_ids, texts) if text not in cached]
+        if not missing:
+            return
+        
+        missing_texts = [text for _, text in missing]
+        if score_batch:
+            results = score_batch(missing_texts)
+        else:
+            results = [self._score(text) for text in missing_texts]
+        index.snippet_scores.update(zip((snippet_id for snippet_id, _ in missing), results))
+        
+        if self.score_cache is not None:
+            self.score_cache.put_many([(text, self._scores_of(result))
+                                       for text, result in zip(missing_texts, results)])
+    
+    def _aggregate_sentiments(self, sentiments: List[SentimentResult]) -> SentimentResult:
+        """Average a list of per-text sentiment results into one overall result."""
+        if not sentiments:
             return SentimentResult(0.0, 0.0, 0.0, 1.0, "Neutral")
         
-        # Calculate sentiment for each relevant text
+        # Accumulate component scores across texts
         sentiment_scores = []
         positive_sum = 0.0
         negative_sum = 0.0
         neutral_sum = 0.0
         
-        for text in relevant_texts:
-            sentiment = self.get_sentiment_score(text)
+        for sentiment in sentiments:
             sentiment_scores.append(sentiment.compound_score)
             positive_sum += sentiment.positive
             negative_sum += sentiment.negative
@@ -90,7 +387,7 @@ class SentimentAnalyzer:
         avg_compound = sum(sentiment_scores) / len(sentiment_scores)
         
         # Calculate average component scores
-        count = len(relevant_texts)
+        count = len(sentiments)
         avg_positive = positive_sum / count
         avg_negative = negative_sum / count
         avg_neutral = neutral_sum / count
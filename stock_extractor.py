@@ -1,34 +1,40 @@
+import hashlib
 import re
-from typing import List, Dict, Set
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
 from collections import Counter
-from models import RedditPost
+from lru_cache import LRUCache
+from models import RedditPost, TickerIndex
+from ticker_list import DEFAULT_TICKER_FILE, DEFAULT_WORD_FILE, load_ticker_list
+from ticker_matcher import build_matcher, confirm_ambiguous, ticker_universe
 
 
 class StockExtractor:
-    def __init__(self):
-        # Common stock tickers - this is a subset of popular tickers to filter false positives
-        # In a production system, this would be loaded from a comprehensive stock database
-        self.valid_tickers = {
-            # Major tech stocks
-            'AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX', 'ADBE',
-            # Financial stocks
-            'JPM', 'BAC', 'WFC', 'GS', 'MS', 'C', 'USB', 'PNC', 'TFC', 'COF',
-            # Popular meme stocks and WSB favorites
-            'GME', 'AMC', 'BB', 'NOK', 'PLTR', 'WISH', 'CLOV', 'SPCE', 'NIO', 'XPEV',
-            # Major indices and ETFs
-            'SPY', 'QQQ', 'IWM', 'VTI', 'VOO', 'ARKK', 'SQQQ', 'TQQQ', 'UVXY', 'VIX',
-            # Other popular stocks
-            'DIS', 'KO', 'PEP', 'WMT', 'JNJ', 'PG', 'V', 'MA', 'PYPL', 'SQ',
-            'F', 'GM', 'UBER', 'LYFT', 'SNAP', 'TWTR', 'PINS', 'ROKU', 'ZM', 'PTON',
-            # Crypto-related stocks
-            'COIN', 'MSTR', 'RIOT', 'MARA', 'SQ', 'PYPL',
-            # Energy and commodities
-            'XOM', 'CVX', 'COP', 'SLB', 'HAL', 'OXY', 'MRO', 'DVN', 'FANG', 'EOG',
-            # Healthcare and biotech
-            'PFE', 'JNJ', 'UNH', 'ABBV', 'TMO', 'DHR', 'ABT', 'BMY', 'LLY', 'MRK',
-            # Additional popular tickers
-            'BABA', 'JD', 'PDD', 'DIDI', 'LUCID', 'LCID', 'RIVN', 'SOFI', 'HOOD', 'RBLX'
-        }
+    # Largest universe the "auto" engine compiles into a trie
+    AUTO_TRIE_MAX_TICKERS = 2000
+    
+    def __init__(self, matcher: str = "auto", ticker_file: Optional[str] = None,
+                 memo_size: int = 50000, word_file: Optional[str] = None):
+        """
+        Initialize the extractor.
+        
+        Args:
+            matcher: Ticker matching engine: "trie" (universe compiled into one
+                automaton), "token" (boundary-aware token hash), "regex" (the
+                original upper-case + findall scan) or "auto" (trie for small
+                universes, token hash for large ones). All return identical results.
+            ticker_file: Sorted ticker symbol file (defaults to the bundled tickers.txt)
+            memo_size: Number of texts whose extraction results are remembered
+                (0 disables the memo)
+            word_file: English word file (defaults to the bundled english_words.txt);
+                tickers spelled like one of its words only count as cashtags
+                ("$so") or when written in upper case ("SO")
+        """
+        # Ticker universe from the bundled sorted symbol file (see ticker_list.py);
+        # loaded once per process, each extractor gets its own mutable copy
+        self.valid_tickers = set(load_ticker_list(ticker_file or DEFAULT_TICKER_FILE))
+        
+        # Words like IT, ON or PLAY are real tickers, but in lower case they are just words
+        self.ambiguous_words = set(load_ticker_list(word_file or DEFAULT_WORD_FILE))
         
         # Regex pattern to match potential stock tickers
         # Matches 1-6 uppercase letters with proper word boundaries
@@ -43,7 +49,7 @@ class StockExtractor:
             'USE', 'WAY', 'WIN', 'YES', 'YET', 'BUY', 'WHEN', 'WHAT', 'WHERE', 'WHICH', 'WHILE',
             'WITH', 'WORK', 'WOULD', 'WRITE', 'YEAR', 'YOUR', 'HAVE', 'BEEN', 'THERE', 'THEIR',
             'WILL', 'FROM', 'THEY', 'KNOW', 'WANT', 'BEEN', 'GOOD', 'MUCH', 'SOME', 'TIME',
-            'VERY', 'THEN', 'THEM', 'WELL', 'WERE',
+            'VERY', 'THEN', 'THEM', 'WELL', 'WERE', 'UP',
             
             # Reddit/WallStreetBets/Finance specific acronyms and slang
             'DD', 'YOLO', 'HODL', 'WSB', 'TA', 'PT', 'EOD', 'AH', 'PM', 'MOON', 'LAMBO', 'TENDIES',
@@ -61,22 +67,103 @@ class StockExtractor:
             'LMAO', 'ROFL', 'SMH', 'IDK', 'IKR', 'IIRC', 'AFAIK', 'ELI5', 'AMA', 'TIL', 'PSA',
             
             # Common abbreviations
-            'USA', 'NASA', 'FBI', 'CIA', 'IRS', 'DMV', 'GPS', 'COVID', 'WHO', 'CDC', 'NFL', 'NBA'
+            'USA', 'NASA', 'FBI', 'CIA', 'IRS', 'DMV', 'GPS', 'COVID', 'WHO', 'CDC', 'NFL', 'NBA',
+            'VS', 'TV', 'UK', 'EU'
         }
+        
+        # Compiled lazily from valid_tickers/false_positives; change the ticker
+        # lists through add_custom_tickers/remove_tickers so it gets rebuilt
+        self.matcher_engine = matcher
+        self.universe_version = 0
+        self._matcher = None
+        self._fingerprint = None
+        
+        # Texts recur on every refresh (hot posts stay hot for hours), so results
+        # are memoized per (universe version, text)
+        self._memo = LRUCache(max_entries=memo_size) if memo_size > 0 else None
+    
+    def _invalidate_matcher(self) -> None:
+        """Drop the compiled matcher and memoized results after the ticker universe changed."""
+        self._matcher = None
+        self._fingerprint = None
+        self.universe_version += 1
+        if self._memo is not None:
+            self._memo.clear()
+    
+    def _get_matcher(self):
+        """Compile the matcher for the current ticker universe on first use."""
+        if self._matcher is None:
+            universe = ticker_universe(self.valid_tickers, self.false_positives)
+            engine = self.matcher_engine
+            if engine == "auto":
+                # The trie compiles slowly and scans slower once it holds thousands of symbols
+                engine = "trie" if len(universe) <= self.AUTO_TRIE_MAX_TICKERS else "token"
+            self._matcher = build_matcher(engine, universe, self.ambiguous_words)
+        return self._matcher
+    
+    def universe_fingerprint(self) -> str:
+        """Hash the ticker universe, so results stored across restarts never outlive it."""
+        if self._fingerprint is None:
+            universe = ticker_universe(self.valid_tickers, self.false_positives)
+            ambiguous = universe & self.ambiguous_words
+            self._fingerprint = hashlib.sha1(
+                (",".join(sorted(universe)) + "|" + ",".join(sorted(ambiguous))).encode()
+            ).hexdigest()
+        return self._fingerprint
+    
+    def remember(self, results: Dict[str, FrozenSet[str]]) -> None:
+        """
+        Seed the memo with extraction results computed earlier for the current universe.
+        
+        Args:
+            results: Dictionary mapping texts to their tickers
+        """
+        if self._memo is None:
+            return
+        for text, tickers in results.items():
+            self._memo.put((self.universe_version, text), frozenset(tickers))
     
     def extract_tickers(self, text: str) -> Set[str]:
         """
-        Extract potential stock tickers from text using regex patterns.
+        Extract potential stock tickers from text.
         
         Args:
             text: Input text to search for stock tickers
-            
+        
         Returns:
             Set of valid stock ticker symbols found in the text
         """
         if not text:
             return set()
         
+        if self._memo is None:
+            return self._match(text)
+        
+        key = (self.universe_version, text)
+        tickers = self._memo.get(key)
+        if tickers is None:
+            tickers = frozenset(self._match(text))
+            self._memo.put(key, tickers)
+        return set(tickers)
+    
+    def _match(self, text: str) -> Set[str]:
+        """Run the configured matching engine on text."""
+        if self.matcher_engine == "regex":
+            return self._extract_tickers_regex(text)
+        return self._get_matcher().find(text)
+    
+    def get_memo_stats(self) -> Dict[str, Any]:
+        """
+        Get extraction memo statistics for sizing.
+        
+        Returns:
+            Dictionary with hits, misses, hit rate, evictions and entries
+            (empty if the memo is disabled)
+        """
+        return self._memo.get_stats() if self._memo is not None else {}
+    
+    def _extract_tickers_regex(self, text: str) -> Set[str]:
+        """Extract tickers by upper-casing the text and filtering every regex match."""
         # Find all potential ticker matches
         matches = self.ticker_pattern.findall(text.upper())
         
@@ -88,44 +175,125 @@ class StockExtractor:
                 len(match) >= 2):  # Minimum 2 characters for valid ticker
                 valid_matches.add(match)
         
-        return valid_matches
+        return confirm_ambiguous(valid_matches, text, self.ambiguous_words)
     
-    def get_top_mentioned(self, posts: List[RedditPost], limit: int = 10) -> Dict[str, int]:
+    def extract_many(self, texts: Iterable[str],
+                     extract_batch: Optional[Callable[[List[str]], List[FrozenSet[str]]]] = None
+                     ) -> Dict[str, FrozenSet[str]]:
         """
-        Count and rank stock mentions across posts, ensuring single count per post per ticker.
+        Extract tickers from many texts, each distinct text only once.
+        
+        Memoized texts are served from the memo; the rest are handed to
+        extract_batch (e.g. a process pool) in one call.
         
         Args:
-            posts: List of RedditPost objects to analyze
-            limit: Maximum number of top mentioned stocks to return
-            
+            texts: Texts to extract tickers from
+            extract_batch: Function mapping a list of texts to their ticker sets
+                (defaults to extracting in this process)
+        
         Returns:
-            Dictionary mapping stock tickers to mention counts, sorted by count descending
+            Dictionary mapping each non-empty text to its tickers
+        """
+        results = {}
+        pending = []
+        for text in texts:
+            if not text or text in results:
+                continue
+            tickers = self._memo.get((self.universe_version, text)) if self._memo is not None else None
+            results[text] = tickers
+            if tickers is None:
+                pending.append(text)
+        
+        if pending:
+            batch = extract_batch or (lambda batch_texts: [frozenset(self._match(text)) for text in batch_texts])
+            for text, tickers in zip(pending, batch(pending)):
+                results[text] = tickers
+                if self._memo is not None:
+                    self._memo.put((self.universe_version, text), tickers)
+        
+        return results
+    
+    def build_index(self, posts: List[RedditPost],
+                    extract_batch: Optional[Callable[[List[str]], List[FrozenSet[str]]]] = None) -> TickerIndex:
+        """
+        Build a ticker -> text snippet index over posts in a single pass.
+        
+        Every title, body and comment is scanned once. Identical texts share one
+        snippet id so downstream sentiment scoring only has to score them once.
+        
+        Args:
+            posts: List of RedditPost objects to index
+            extract_batch: Optional batch extraction function (see extract_many);
+                when given, all texts are extracted up front through it
+        
+        Returns:
+            TickerIndex with per-ticker snippet occurrences and per-post mention
+            counts, overall and per subreddit
         """
         ticker_counts = Counter()
+        subreddit_counts = {}
+        snippets = []
+        snippet_ids = {}
+        ticker_snippets = {}
+        
+        if extract_batch is not None:
+            extracted = self.extract_many(
+                (text for post in posts for text in (post.title, post.content, *post.comments)),
+                extract_batch
+            )
+            extract = extracted.__getitem__
+        else:
+            extract = self.extract_tickers
         
         for post in posts:
-            # Extract tickers from post title and content
             post_tickers = set()
             
-            # Check title
-            if post.title:
-                post_tickers.update(self.extract_tickers(post.title))
+            for text in (post.title, post.content, *post.comments):
+                if not text:
+                    continue
+                
+                tickers = extract(text)
+                if not tickers:
+                    continue
+                
+                post_tickers.update(tickers)
+                
+                snippet_id = snippet_ids.get(text)
+                if snippet_id is None:
+                    snippet_id = len(snippets)
+                    snippet_ids[text] = snippet_id
+                    snippets.append(text)
+                
+                # One entry per occurrence so repeated texts keep their weight
+                for ticker in tickers:
+                    ticker_snippets.setdefault(ticker, []).append(snippet_id)
             
-            # Check content
-            if post.content:
-                post_tickers.update(self.extract_tickers(post.content))
-            
-            # Check comments
-            for comment in post.comments:
-                if comment:
-                    post_tickers.update(self.extract_tickers(comment))
-            
-            # Count each ticker only once per post
+            # Count each ticker only once per post; sorted so ties rank the same
+            # in every process regardless of string hash seeds
+            post_tickers = sorted(post_tickers)
             for ticker in post_tickers:
                 ticker_counts[ticker] += 1
+            
+            # Per-subreddit rankings come out of the same pass, keyed by lower-case
+            # name since Reddit reports the canonical capitalization ("StockMarket")
+            if post.subreddit and post_tickers:
+                subreddit_counts.setdefault(post.subreddit.lower(), Counter()).update(post_tickers)
+        
+        return TickerIndex(snippets=snippets, ticker_snippets=ticker_snippets,
+                           post_counts=ticker_counts, subreddit_counts=subreddit_counts)
+    
+    def get_top_mentioned(self, posts: List[RedditPost], limit: int = 10) -> Dict[str, int]:
+        """
+        Count and rank stock mentions across posts, ensuring single count per post per ticker.
         
-        # Return top mentioned tickers up to the limit
-        return dict(ticker_counts.most_common(limit))
+        Args:
+            posts: List of RedditPost objects to analyze
+            limit: Maximum number of top mentioned stocks to return
+        
+        Returns:
+            Dictionary mapping stock tickers to mention counts, sorted by count descending
+        """
+        return self.build_index(posts).top_mentioned(limit)
     
     def add_custom_tickers(self, tickers: List[str]) -> None:
         """
@@ -137,6 +305,7 @@ class StockExtractor:
         for ticker in tickers:
             if ticker and isinstance(ticker, str):
                 self.valid_tickers.add(ticker.upper())
+        self._invalidate_matcher()
     
     def remove_tickers(self, tickers: List[str]) -> None:
         """
@@ -148,6 +317,7 @@ class StockExtractor:
         for ticker in tickers:
             if ticker and isinstance(ticker, str):
                 self.valid_tickers.discard(ticker.upper())
+        self._invalidate_matcher()
     
     def get_valid_tickers(self) -> Set[str]:
         """
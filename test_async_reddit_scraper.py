@@ -0,0 +1,110 @@
+import asyncio
+import time
+import unittest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from async_reddit_scraper import AsyncRedditScraper, AsyncTokenBucket
+
+
+def make_post(post_id, created_utc=1640995200.0, stickied=False):
+    return {
+        'kind': 't3',
+        'data': {
+            'id': post_id,
+            'title': f'{post_id} title',
+            'selftext': f'{post_id} body',
+            'score': 10,
+            'created_utc': created_utc,
+            'stickied': stickied
+        }
+    }
+
+
+class TestAsyncRedditScraper(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """Start a local server standing in for Reddit's JSON endpoints."""
+        self.requests = []
+        
+        async def hot(request):
+            self.requests.append(request.path_qs)
+            if request.query.get('after') == 't3_p2':
+                return web.json_response({'data': {'children': [make_post('p3')], 'after': None}})
+            return web.json_response({'data': {
+                'children': [make_post('sticky', stickied=True), make_post('p1'), make_post('p2')],
+                'after': 't3_p2'
+            }})
+        
+        async def new(request):
+            self.requests.append(request.path_qs)
+            return web.json_response({'data': {'children': [make_post('n1', 1640995300.0)], 'after': None}})
+        
+        async def comments(request):
+            self.requests.append(request.path_qs)
+            if request.match_info['post_id'] == 'broken':
+                return web.Response(status=500)
+            return web.json_response([{}, {'data': {'children': [
+                {'kind': 't1', 'data': {'body': 'AAPL calls'}},
+                {'kind': 't1', 'data': {'body': '[deleted]'}},
+                {'kind': 'more', 'data': {'children': ['x']}}
+            ]}}])
+        
+        app = web.Application()
+        app.router.add_get('/r/{subreddit}/hot.json', hot)
+        app.router.add_get('/r/{subreddit}/new.json', new)
+        app.router.add_get('/comments/{post_id}.json', comments)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        
+        base_url = str(self.server.make_url('')).rstrip('/')
+        self.scraper = AsyncRedditScraper(base_url=base_url, requests_per_second=1000, burst=10)
+    
+    async def asyncTearDown(self):
+        await self.scraper.close()
+        await self.server.close()
+    
+    async def test_get_hot_posts_paginates_and_filters_stickied(self):
+        """Test that hot posts follow pagination and parse into RedditPost objects."""
+        posts = await self.scraper.get_hot_posts("wallstreetbets", 10)
+        
+        self.assertEqual([p.id for p in posts], ['p1', 'p2', 'p3'])
+        self.assertEqual(posts[0].content, 'p1 body')
+        self.assertEqual(len(self.requests), 2)
+        self.assertIn('after=t3_p2', self.requests[1])
+    
+    async def test_get_posts_with_comments_isolates_failures(self):
+        """Test concurrent comment fan-out keeps order and tolerates failing posts."""
+        comments = await self.scraper.get_post_comments('p1', 10)
+        self.assertEqual(comments, ['AAPL calls'])
+        
+        with self.assertRaises(Exception) as context:
+            await self.scraper.get_post_comments('broken', 10)
+        self.assertIn("Failed to fetch comments", str(context.exception))
+        
+        posts = await self.scraper.get_posts_with_comments(post_limit=3, comment_limit=5)
+        self.assertEqual([p.comments for p in posts], [['AAPL calls']] * 3)
+    
+    async def test_get_mixed_feed_and_subreddit_fan_out(self):
+        """Test mixed feed ordering and fan-out across subreddits."""
+        posts = await self.scraper.get_mixed_feed("wallstreetbets", 10)
+        self.assertEqual(posts[0].id, 'n1')  # Newest first
+        self.assertEqual(len(posts), 4)
+        
+        results = await self.scraper.get_subreddits_posts(['wallstreetbets', 'stocks'], 2)
+        self.assertEqual(set(results), {'wallstreetbets', 'stocks'})
+        self.assertEqual([p.id for p in results['stocks']], ['p1', 'p2'])
+
+
+class TestAsyncTokenBucket(unittest.IsolatedAsyncioTestCase):
+    async def test_acquire_enforces_rate_after_burst(self):
+        """Test that the bucket allows a burst and then spaces requests by the rate."""
+        bucket = AsyncTokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+        
+        # Two tokens are free, the next two take 1/20s each
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+if __name__ == '__main__':
+    # Run the tests
+    unittest.main(verbosity=2)
\ No newline at end of file
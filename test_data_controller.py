@@ -1,10 +1,17 @@
 import unittest
 import os
 import json
+import shutil
+import tempfile
+import threading
+import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 from data_controller import DataController
 from models import StockMention, RedditPost, SentimentResult
+from refresh_lock import RefreshLock
+from sentiment_analyzer import SentimentAnalyzer
+from stock_extractor import StockExtractor
 
 
 class TestDataController(unittest.TestCase):
@@ -27,18 +34,17 @@ class TestDataController(unittest.TestCase):
         mock_sentiment_instance = Mock()
         mock_sentiment.return_value = mock_sentiment_instance
         
-        self.controller = DataController(cache_duration_minutes=30)
-        self.test_cache_file = "test_cache.json"
-        self.controller.cache_file = self.test_cache_file
+        # Keep the cache file, its refresh locks and the post store out of the working directory
+        self.temp_dir = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.temp_dir, "store.sqlite")
+        self.test_cache_file = os.path.join(self.temp_dir, "test_cache.json")
         
-        # Clean up any existing test cache
-        if os.path.exists(self.test_cache_file):
-            os.remove(self.test_cache_file)
+        self.controller = DataController(cache_duration_minutes=30, store_path=self.store_path)
+        self.controller.cache_file = self.test_cache_file
     
     def tearDown(self):
         """Clean up after each test method."""
-        if os.path.exists(self.test_cache_file):
-            os.remove(self.test_cache_file)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_initialization(self):
         """Test that DataController initializes correctly."""
@@ -65,19 +71,20 @@ class TestDataController(unittest.TestCase):
         
         # Mock stock extractor
         mock_extractor_instance = Mock()
-        mock_extractor_instance.get_top_mentioned.return_value = {"AAPL": 2, "TSLA": 1}
+        mock_index = mock_extractor_instance.build_index.return_value
+        mock_index.top_mentioned.return_value = {"AAPL": 2, "TSLA": 1}
         mock_extractor.return_value = mock_extractor_instance
         
         # Mock sentiment analyzer
         mock_sentiment_instance = Mock()
-        mock_sentiment_instance.analyze_stock_sentiment.side_effect = [
+        mock_sentiment_instance.analyze_indexed_sentiment.side_effect = [
             SentimentResult(0.5, 0.7, 0.1, 0.2, "Positive"),
             SentimentResult(0.3, 0.6, 0.2, 0.2, "Positive")
         ]
         mock_sentiment.return_value = mock_sentiment_instance
         
         # Create new controller with mocked components
-        controller = DataController()
+        controller = DataController(store_path=self.store_path)
         controller.cache_file = self.test_cache_file
         controller.reddit_scraper = mock_scraper_instance
         controller.stock_extractor = mock_extractor_instance
@@ -95,9 +102,12 @@ class TestDataController(unittest.TestCase):
         self.assertEqual(result[1].mention_count, 1)
         
         # Verify method calls
-        mock_scraper_instance.get_hot_posts.assert_called_once_with(limit=10)
-        mock_extractor_instance.get_top_mentioned.assert_called_once_with(mock_posts, limit=5)
-        self.assertEqual(mock_sentiment_instance.analyze_stock_sentiment.call_count, 2)
+        mock_scraper_instance.get_hot_posts.assert_called_once_with("wallstreetbets", limit=10)
+        mock_extractor_instance.build_index.assert_called_once_with(mock_posts)
+        mock_index.top_mentioned.assert_any_call(5)
+        mock_index.top_mentioned.assert_any_call(5, subreddit="wallstreetbets")
+        mock_sentiment_instance.analyze_indexed_sentiment.assert_any_call(mock_index, "AAPL")
+        self.assertEqual(mock_sentiment_instance.analyze_indexed_sentiment.call_count, 2)
     
     @patch('data_controller.RedditScraper')
     def test_process_reddit_data_no_posts(self, mock_scraper):
@@ -107,7 +117,8 @@ class TestDataController(unittest.TestCase):
         mock_scraper_instance.get_hot_posts.return_value = []
         mock_scraper.return_value = mock_scraper_instance
         
-        controller = DataController()
+        controller = DataController(store_path=self.store_path)
+        controller.cache_file = self.test_cache_file
         controller.reddit_scraper = mock_scraper_instance
         
         result = controller.process_reddit_data()
@@ -131,10 +142,11 @@ class TestDataController(unittest.TestCase):
         
         # Mock stock extractor to return no stocks
         mock_extractor_instance = Mock()
-        mock_extractor_instance.get_top_mentioned.return_value = {}
+        mock_extractor_instance.build_index.return_value.top_mentioned.return_value = {}
         mock_extractor.return_value = mock_extractor_instance
         
-        controller = DataController()
+        controller = DataController(store_path=self.store_path)
+        controller.cache_file = self.test_cache_file
         controller.reddit_scraper = mock_scraper_instance
         controller.stock_extractor = mock_extractor_instance
         
@@ -143,6 +155,342 @@ class TestDataController(unittest.TestCase):
         # Should return empty list when no stocks found
         self.assertEqual(result, [])
     
+    def test_process_reddit_data_multiple_subreddits(self):
+        """Test one ingestion pass across subreddits with merged and per-subreddit rankings."""
+        mock_posts = [
+            RedditPost("1", "AAPL calls", "", [], datetime.now(), 100, subreddit="wallstreetbets"),
+            RedditPost("2", "AAPL long term", "", [], datetime.now(), 50, subreddit="investing"),
+            RedditPost("3", "TSLA puts", "", [], datetime.now(), 10, subreddit="wallstreetbets")
+        ]
+        
+        controller = DataController(subreddits=["wallstreetbets", "investing"], store_path=self.store_path)
+        controller.cache_file = self.test_cache_file
+        controller.reddit_scraper = Mock()
+        controller.reddit_scraper.get_multi_subreddit_posts.return_value = mock_posts
+        controller.stock_extractor = StockExtractor()
+        controller.sentiment_analyzer = SentimentAnalyzer()
+        
+        result = controller.process_reddit_data(post_limit=10, top_stocks_limit=5)
+        
+        controller.reddit_scraper.get_multi_subreddit_posts.assert_called_once_with(
+            ["wallstreetbets", "investing"], limit=10
+        )
+        self.assertEqual([(s.ticker, s.mention_count) for s in result], [("AAPL", 2), ("TSLA", 1)])
+        self.assertEqual(controller.get_subreddit_rankings(), {
+            "wallstreetbets": {"AAPL": 1, "TSLA": 1},
+            "investing": {"AAPL": 1}
+        })
+    
+    def test_subreddit_names_are_case_insensitive(self):
+        """Test that differently typed subreddit names share rankings and cached results."""
+        mock_posts = [
+            RedditPost("1", "AAPL calls", "", [], datetime.now(), 100, subreddit="WallStreetBets"),
+            RedditPost("2", "TSLA long term", "", [], datetime.now(), 50, subreddit="investing")
+        ]
+        
+        def make_controller(subreddits):
+            controller = DataController(subreddits=subreddits, store_path=self.store_path)
+            controller.cache_file = self.test_cache_file
+            controller.reddit_scraper = Mock()
+            controller.reddit_scraper.get_multi_subreddit_posts.return_value = mock_posts
+            controller.stock_extractor = StockExtractor()
+            controller.sentiment_analyzer = SentimentAnalyzer()
+            return controller
+        
+        first = make_controller(["WallStreetBets", "Investing"])
+        first.process_reddit_data(post_limit=10, top_stocks_limit=5)
+        self.assertEqual(first.get_subreddit_rankings(), {
+            "wallstreetbets": {"AAPL": 1},
+            "investing": {"TSLA": 1}
+        })
+        
+        second = make_controller(["wallstreetbets", "investing", "INVESTING"])
+        self.assertEqual(second.subreddits, ["wallstreetbets", "investing"])
+        second.process_reddit_data(post_limit=10, top_stocks_limit=5)
+        second.reddit_scraper.get_multi_subreddit_posts.assert_not_called()
+    
+    def test_refresh_reuses_stored_analysis(self):
+        """Test that a restarted controller does not extract or score unchanged posts again."""
+        mock_posts = [
+            RedditPost("1", "AAPL calls are great", "", ["AAPL to the moon"], datetime.now(), 100),
+            RedditPost("2", "TSLA puts", "", [], datetime.now(), 10)
+        ]
+        
+        def make_controller():
+            controller = DataController(store_path=self.store_path)
+            controller.cache_file = self.test_cache_file
+            controller.reddit_scraper = Mock()
+            controller.reddit_scraper.get_hot_posts.return_value = mock_posts
+            controller.stock_extractor = StockExtractor()
+            controller.sentiment_analyzer = SentimentAnalyzer()
+            return controller
+        
+        first = make_controller().process_reddit_data(post_limit=10, top_stocks_limit=5)
+        os.remove(self.test_cache_file)
+        
+        restarted = make_controller()
+        with patch.object(restarted.stock_extractor, '_match') as match, \
+                patch.object(restarted.sentiment_analyzer.kernel, 'polarity_scores') as polarity_scores:
+            second = restarted.process_reddit_data(post_limit=10, top_stocks_limit=5)
+        
+        match.assert_not_called()
+        polarity_scores.assert_not_called()
+        self.assertEqual([(s.ticker, s.mention_count, s.sentiment_score) for s in second],
+                         [(s.ticker, s.mention_count, s.sentiment_score) for s in first])
+    
+    def test_refresh_feeds_live_sentiment(self):
+        """Test that each fetch updates the live totals and posts that left the window are retracted."""
+        mock_posts = [
+            RedditPost("1", "AAPL calls are great", "", ["AAPL to the moon"], datetime.now(), 100),
+            RedditPost("2", "TSLA puts", "", ["TSLA is terrible"], datetime.now(), 10)
+        ]
+        controller = DataController(store_path=self.store_path, cache_duration_minutes=0,
+                                    background_refresh=False)
+        controller.cache_file = self.test_cache_file
+        controller.reddit_scraper = Mock()
+        controller.reddit_scraper.get_hot_posts.return_value = mock_posts
+        controller.stock_extractor = StockExtractor()
+        controller.sentiment_analyzer = SentimentAnalyzer()
+        
+        self.assertEqual(controller.get_live_sentiment(), [])
+        controller.process_reddit_data(post_limit=10, top_stocks_limit=5)
+        live = {s.ticker: s for s in controller.get_live_sentiment()}
+        self.assertEqual({ticker: s.mention_count for ticker, s in live.items()}, {"AAPL": 2, "TSLA": 2})
+        self.assertEqual(live["TSLA"].sentiment_category, "Negative")
+        
+        # The next fetch only scores the new text and drops the post that left the listing
+        controller.reddit_scraper.get_hot_posts.return_value = [
+            mock_posts[0], RedditPost("3", "MSFT is fine", "", [], datetime.now(), 5)
+        ]
+        with patch.object(controller.sentiment_aggregator, 'add',
+                          wraps=controller.sentiment_aggregator.add) as add:
+            controller.process_reddit_data(post_limit=10, top_stocks_limit=5)
+        self.assertEqual([call.args[0] for call in add.call_args_list], ["3/title"])
+        self.assertEqual({s.ticker: s.mention_count for s in controller.get_live_sentiment()},
+                         {"AAPL": 2, "MSFT": 1})
+        
+        # A restarted controller picks the totals up from the checkpoint
+        restarted = DataController(store_path=self.store_path)
+        self.assertEqual({s.ticker: s.mention_count for s in restarted.get_live_sentiment()},
+                         {"AAPL": 2, "MSFT": 1})
+    
+    def test_result_cache_is_keyed_by_request_shape(self):
+        """Test that cached results are only served to the request shapes they answer."""
+        mock_posts = [
+            RedditPost("1", "AAPL calls", "", [], datetime.now(), 100, "wallstreetbets"),
+            RedditPost("2", "TSLA puts", "", ["TSLA is done"], datetime.now(), 50, "wallstreetbets"),
+            RedditPost("3", "NVDA and AAPL", "", [], datetime.now(), 10, "wallstreetbets")
+        ]
+        
+        controller = DataController(store_path=self.store_path)
+        controller.cache_file = self.test_cache_file
+        controller.reddit_scraper = Mock()
+        controller.reddit_scraper.get_hot_posts.side_effect = lambda sub, limit: mock_posts[:limit]
+        controller.stock_extractor = StockExtractor()
+        controller.sentiment_analyzer = SentimentAnalyzer()
+        
+        full = controller.process_reddit_data(post_limit=3, top_stocks_limit=3)
+        self.assertEqual([(s.ticker, s.mention_count) for s in full], [("AAPL", 2), ("TSLA", 1), ("NVDA", 1)])
+        
+        # Fewer stocks of the same posts: the ranking is truncated
+        top = controller.process_reddit_data(post_limit=3, top_stocks_limit=1)
+        self.assertEqual([(s.ticker, s.mention_count) for s in top], [("AAPL", 2)])
+        
+        # Fewer posts: re-ranked from the stored posts without fetching
+        fewer = controller.process_reddit_data(post_limit=1, top_stocks_limit=3)
+        self.assertEqual([(s.ticker, s.mention_count) for s in fewer], [("AAPL", 1)])
+        controller.reddit_scraper.get_hot_posts.assert_called_once_with("wallstreetbets", limit=3)
+        
+        # More posts than any cached result has to be fetched
+        controller.process_reddit_data(post_limit=5, top_stocks_limit=3)
+        controller.reddit_scraper.get_hot_posts.assert_called_with("wallstreetbets", limit=5)
+        self.assertEqual(controller.reddit_scraper.get_hot_posts.call_count, 2)
+        
+        # The last request served is the one plain cache readers see
+        controller.process_reddit_data(post_limit=3, top_stocks_limit=1)
+        self.assertEqual([s.ticker for s in controller.get_cached_data()], ["AAPL"])
+        self.assertEqual(controller.get_subreddit_rankings()["wallstreetbets"], {"AAPL": 2})
+    
+    def test_result_cache_evicts_by_ttl_and_lru(self):
+        """Test that expired results are dropped and the least recently used beyond the cap."""
+        self.controller.max_cached_results = 2
+        stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        
+        stale = datetime.now() - timedelta(days=2)
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(10, 5),
+                                    timestamp=stale)
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(20, 5))
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(30, 5))
+        self.assertEqual(set(self.controller._load_cache()["results"]),
+                         {"wallstreetbets|hot|20|5", "wallstreetbets|hot|30|5"})
+        
+        # A hit refreshes recency, so the other result is the one evicted next
+        self.assertIsNotNone(self.controller._get_cached_result(self.controller._request_shape(20, 5)))
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(40, 5))
+        self.assertEqual(set(self.controller._load_cache()["results"]),
+                         {"wallstreetbets|hot|20|5", "wallstreetbets|hot|40|5"})
+    
+    def test_exact_hits_do_not_rewrite_cache_file(self):
+        """Test that serving a cached result leaves the file alone until the next write."""
+        stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        older, newer = self.controller._request_shape(20, 5), self.controller._request_shape(30, 5)
+        self.controller._save_cache(stock_mentions, mock_posts, request=older)
+        self.controller._save_cache(stock_mentions, mock_posts, request=newer)
+        
+        version = os.stat(self.test_cache_file).st_ino
+        self.assertIsNotNone(self.controller._get_cached_result(older))
+        self.assertEqual(os.stat(self.test_cache_file).st_ino, version)
+        
+        # The hit's recency is written along with the next result
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(40, 5))
+        results = self.controller._load_cache()["results"]
+        self.assertGreater(results["wallstreetbets|hot|20|5"]["last_used"],
+                           results["wallstreetbets|hot|30|5"]["last_used"])
+    
+    def test_cache_writes_wait_for_file_lock(self):
+        """Test that a cache write waits while another process holds the cache file lock."""
+        stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        holder = RefreshLock(self.controller._cache_lock_path())
+        holder.acquire()
+        writer = threading.Thread(target=self.controller._save_cache, args=(stock_mentions, mock_posts),
+                                  kwargs={"request": self.controller._request_shape(20, 5)})
+        writer.start()
+        
+        writer.join(0.3)
+        self.assertTrue(writer.is_alive())
+        self.assertFalse(os.path.exists(self.test_cache_file))
+        
+        holder.release()
+        writer.join(5)
+        self.assertIn("wallstreetbets|hot|20|5", self.controller._load_cache()["results"])
+    
+    def test_expired_result_is_served_while_refreshing_in_background(self):
+        """Test that an expired result is returned at once and replaced by a background refresh."""
+        release = threading.Event()
+        
+        def slow_fetch(subreddit, limit):
+            release.wait(5)
+            return [RedditPost("1", "TSLA calls", "", [], datetime.now(), 100, "wallstreetbets")]
+        
+        controller = DataController(store_path=self.store_path)
+        controller.cache_file = self.test_cache_file
+        controller.reddit_scraper = Mock()
+        controller.reddit_scraper.get_hot_posts.side_effect = slow_fetch
+        controller.stock_extractor = StockExtractor()
+        controller.sentiment_analyzer = SentimentAnalyzer()
+        
+        expired = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        controller._save_cache(expired, mock_posts, request=controller._request_shape(10, 5),
+                               timestamp=datetime.now() - timedelta(hours=2))
+        
+        result = controller.process_reddit_data(post_limit=10, top_stocks_limit=5)
+        self.assertEqual([s.ticker for s in result], ["AAPL"])
+        
+        status = controller.get_processing_status()
+        self.assertTrue(status["serving_stale"])
+        self.assertTrue(status["refreshing"])
+        self.assertGreaterEqual(status["data_age_seconds"], 7200)
+        self.assertIn(status["refresh"]["wallstreetbets|hot|10|5"]["stage"], ("queued", "waiting", "fetching"))
+        
+        # Renders during the refresh keep getting the old result without starting another one
+        self.assertEqual([s.ticker for s in controller.process_reddit_data(10, 5)], ["AAPL"])
+        
+        release.set()
+        deadline = time.time() + 5
+        while controller.get_processing_status()["refreshing"] and time.time() < deadline:
+            time.sleep(0.01)
+        
+        status = controller.get_processing_status()
+        self.assertEqual(status["refresh"]["wallstreetbets|hot|10|5"]["stage"], "done")
+        self.assertTrue(status["cache_valid"])
+        self.assertEqual(controller.reddit_scraper.get_hot_posts.call_count, 1)
+        self.assertEqual([s.ticker for s in controller.process_reddit_data(10, 5)], ["TSLA"])
+    
+    def test_failed_background_refresh_is_not_retried_at_once(self):
+        """Test that a failed background refresh is only retried after the retry interval."""
+        controller = DataController(store_path=self.store_path, refresh_retry_seconds=60)
+        controller.cache_file = self.test_cache_file
+        controller.reddit_scraper = Mock()
+        controller.reddit_scraper.get_hot_posts.side_effect = Exception("Reddit is down")
+        
+        expired = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        controller._save_cache(expired, mock_posts, request=controller._request_shape(10, 5),
+                               timestamp=datetime.now() - timedelta(hours=2))
+        
+        controller.process_reddit_data(10, 5)
+        deadline = time.time() + 5
+        while controller.get_processing_status()["refreshing"] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(controller.get_refresh_states()["wallstreetbets|hot|10|5"]["stage"], "failed")
+        
+        # Reruns keep serving the expired result without crawling again
+        for _ in range(3):
+            self.assertEqual([s.ticker for s in controller.process_reddit_data(10, 5)], ["AAPL"])
+        self.assertEqual(controller.reddit_scraper.get_hot_posts.call_count, 1)
+        
+        controller.refresh_retry = timedelta(0)
+        self.assertTrue(controller._start_background_refresh(controller._request_shape(10, 5)))
+    
+    def test_processing_status_reports_the_served_request_shape(self):
+        """Test that cache freshness is that of the request being served, not the last one stored."""
+        stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(10, 5),
+                                    timestamp=datetime.now() - timedelta(hours=2))
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(20, 5))
+        
+        self.controller._last_request = self.controller._request_shape(10, 5)
+        status = self.controller.get_processing_status()
+        self.assertFalse(status["cache_valid"])
+        self.assertTrue(status["serving_stale"])
+        self.assertGreaterEqual(status["data_age_seconds"], 7200)
+    
+    def test_concurrent_refreshes_of_one_request_crawl_once(self):
+        """Test that controllers refreshing the same request at once share a single crawl."""
+        fetch_started = threading.Event()
+        release = threading.Event()
+        scraper = Mock()
+        
+        def slow_fetch(subreddit, limit):
+            fetch_started.set()
+            release.wait(5)
+            return [RedditPost("1", "AAPL calls", "", [], datetime.now(), 100, "wallstreetbets")]
+        
+        scraper.get_hot_posts.side_effect = slow_fetch
+        
+        def make_controller():
+            controller = DataController(store_path=self.store_path)
+            controller.cache_file = self.test_cache_file
+            controller.reddit_scraper = scraper
+            controller.stock_extractor = StockExtractor()
+            controller.sentiment_analyzer = SentimentAnalyzer()
+            return controller
+        
+        results = {}
+        first, second = make_controller(), make_controller()
+        leader = threading.Thread(target=lambda: results.update(first=first.process_reddit_data(10, 5)))
+        leader.start()
+        self.assertTrue(fetch_started.wait(5))
+        
+        follower = threading.Thread(target=lambda: results.update(second=second.process_reddit_data(10, 5)))
+        follower.start()
+        follower.join(0.2)
+        self.assertTrue(follower.is_alive())
+        self.assertEqual(second.get_refresh_states()["wallstreetbets|hot|10|5"]["stage"], "fetching")
+        
+        release.set()
+        leader.join(5)
+        follower.join(5)
+        
+        self.assertEqual(scraper.get_hot_posts.call_count, 1)
+        self.assertEqual([s.ticker for s in results["first"]], ["AAPL"])
+        self.assertEqual([s.ticker for s in results["second"]], ["AAPL"])
+    
     def test_cache_functionality(self):
         """Test caching and cache validation."""
         # Create test stock mentions
@@ -213,7 +561,7 @@ class TestDataController(unittest.TestCase):
         # Create initial cache
         stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
         mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
-        self.controller._save_cache(stock_mentions, mock_posts)
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(200, 20))
         
         # Verify cache exists
         self.assertTrue(os.path.exists(self.test_cache_file))
@@ -229,6 +577,38 @@ class TestDataController(unittest.TestCase):
             self.assertFalse(os.path.exists(self.test_cache_file))
             mock_process.assert_called_once_with(50, 10)
     
+    def test_force_refresh_keeps_other_request_shapes(self):
+        """Test that force refresh drops only the result of the refreshed request."""
+        stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        for post_limit in (20, 30):
+            self.controller._save_cache(stock_mentions, mock_posts,
+                                        request=self.controller._request_shape(post_limit, 5))
+        
+        with patch.object(self.controller, 'process_reddit_data', return_value=[]):
+            self.controller.force_refresh(30, 5)
+        
+        cached_data = self.controller._load_cache()
+        self.assertEqual(set(cached_data["results"]), {"wallstreetbets|hot|20|5"})
+        self.assertEqual(cached_data["request"], self.controller._request_shape(20, 5))
+    
+    def test_fallback_data_is_never_another_request_shape(self):
+        """Test that a failed request falls back to its own cached result only."""
+        stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        stale = datetime.now() - timedelta(hours=2)
+        self.controller._save_cache(stock_mentions, mock_posts, request=self.controller._request_shape(20, 5),
+                                    timestamp=stale)
+        
+        self.assertEqual([s.ticker for s in self.controller._get_fallback_data(
+            self.controller._request_shape(20, 5))], ["AAPL"])
+        self.assertEqual(self.controller._get_fallback_data(self.controller._request_shape(30, 5)), [])
+        
+        self.controller.subreddits = ["stocks"]
+        self.controller.reddit_scraper.get_hot_posts.return_value = []
+        self.assertEqual(self.controller.process_reddit_data(20, 5), [])
+        self.assertIsNone(self.controller.get_cached_data())
+    
     def test_get_processing_status(self):
         """Test getting processing status information."""
         # Test status with no cache
@@ -255,6 +635,25 @@ class TestDataController(unittest.TestCase):
         self.assertIsNotNone(status["last_update"])
         self.assertIsNotNone(status["cache_expires"])
     
+    def test_status_checks_do_not_reparse_cache(self):
+        """Test that repeated cache reads are served from the in-memory snapshot."""
+        stock_mentions = [StockMention("AAPL", 5, 0.5, "Positive", datetime.now())]
+        mock_posts = [RedditPost("1", "test", "test", [], datetime.now(), 100)]
+        self.controller._save_cache(stock_mentions, mock_posts)
+        reloads = self.controller._cache_snapshot().reloads
+        
+        for _ in range(3):
+            self.assertTrue(self.controller.get_processing_status()["cache_valid"])
+            self.assertEqual(self.controller.get_cached_data()[0].ticker, "AAPL")
+        self.assertEqual(self.controller._cache_snapshot().reloads, reloads)
+        
+        # A file replaced by another process is picked up
+        cache_data = dict(self.controller._load_cache(), stock_mentions=[])
+        with open(self.test_cache_file + ".new", 'w') as f:
+            json.dump(cache_data, f)
+        os.replace(self.test_cache_file + ".new", self.test_cache_file)
+        self.assertEqual(self.controller.get_cached_data(), [])
+    
     def test_serialization_deserialization(self):
         """Test serialization and deserialization of stock mentions."""
         original_mentions = [
@@ -346,16 +745,16 @@ class TestDataController(unittest.TestCase):
         
         # Mock stock extractor
         mock_extractor_instance = Mock()
-        mock_extractor_instance.get_top_mentioned.return_value = {"AAPL": 1}
+        mock_extractor_instance.build_index.return_value.top_mentioned.return_value = {"AAPL": 1}
         mock_extractor.return_value = mock_extractor_instance
         
         # Mock sentiment analyzer to raise exception
         mock_sentiment_instance = Mock()
-        mock_sentiment_instance.analyze_stock_sentiment.side_effect = Exception("Sentiment analysis failed")
+        mock_sentiment_instance.analyze_indexed_sentiment.side_effect = Exception("Sentiment analysis failed")
         mock_sentiment.return_value = mock_sentiment_instance
         
         # Create controller with mocked components
-        controller = DataController()
+        controller = DataController(store_path=self.store_path)
         controller.cache_file = self.test_cache_file
         controller.reddit_scraper = mock_scraper_instance
         controller.stock_extractor = mock_extractor_instance
@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from json_snapshot import JsonSnapshot
+
+
+class TestJsonSnapshot(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "data_cache.json")
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_parses_only_when_file_changes(self):
+        """Test that repeated loads of an unchanged file are served from memory."""
+        with open(self.path, 'w') as f:
+            json.dump({"timestamp": "a"}, f)
+        
+        snapshot = JsonSnapshot(self.path)
+        first = snapshot.load()
+        self.assertIs(snapshot.load(), first)
+        self.assertEqual(snapshot.get_stats(), {"hits": 1, "reloads": 1})
+        
+        # Another process replacing the file is picked up on the next load
+        other = JsonSnapshot(self.path)
+        other.save({"timestamp": "b"})
+        self.assertEqual(snapshot.load(), {"timestamp": "b"})
+        self.assertEqual(snapshot.reloads, 2)
+    
+    def test_save_keeps_written_document_without_reparsing(self):
+        """Test that a writer's own document is served without reading the file back."""
+        snapshot = JsonSnapshot(self.path)
+        document = {"results": {"k": 1}}
+        snapshot.save(document)
+        
+        self.assertIs(snapshot.load(), document)
+        self.assertEqual(snapshot.reloads, 0)
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), document)
+        self.assertEqual(os.listdir(self.temp_dir), ["data_cache.json"])
+    
+    @unittest.skipIf(os.name == 'nt', "POSIX permissions")
+    def test_save_keeps_file_mode(self):
+        """Test that a rewrite keeps the replaced file's permissions, and new files follow the umask."""
+        snapshot = JsonSnapshot(self.path)
+        snapshot.save({"timestamp": "a"})
+        reference = os.path.join(self.temp_dir, "reference.json")
+        with open(reference, 'w'):
+            pass
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, os.stat(reference).st_mode & 0o777)
+        
+        os.chmod(self.path, 0o640)
+        snapshot.save({"timestamp": "b"})
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+    
+    def test_missing_and_deleted_files(self):
+        """Test that a missing file loads as None and delete forgets the snapshot."""
+        snapshot = JsonSnapshot(self.path)
+        self.assertIsNone(snapshot.load())
+        self.assertFalse(snapshot.delete())
+        
+        snapshot.save({"timestamp": "a"})
+        self.assertTrue(snapshot.delete())
+        self.assertIsNone(snapshot.load())
+    
+    def test_corrupt_file_raises(self):
+        """Test that an unparseable file is reported rather than served."""
+        with open(self.path, 'w') as f:
+            f.write("{not json")
+        with self.assertRaises(ValueError):
+            JsonSnapshot(self.path).load()
+    
+    def test_for_path_shares_one_holder_per_file(self):
+        """Test that every caller in the process gets the same holder for a file."""
+        holder = JsonSnapshot.for_path(self.path)
+        self.assertIs(JsonSnapshot.for_path(os.path.join(self.temp_dir, ".", "data_cache.json")), holder)
+        self.assertIsNot(JsonSnapshot.for_path(os.path.join(self.temp_dir, "other.json")), holder)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from lru_cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted first."""
+        evicted = []
+        cache = LRUCache(max_entries=2, on_evict=lambda key, value: evicted.append(key))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')  # 'b' is now least recently used
+        cache.put('c', 3)
+        
+        self.assertEqual(evicted, ['b'])
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+    
+    def test_byte_cap_and_stats(self):
+        """Test the byte cap and the hit/miss counters."""
+        cache = LRUCache(max_entries=10, max_bytes=10)
+        cache.put('a', 'x', size=6)
+        cache.put('b', 'y', size=6)
+        
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 'y')
+        
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["bytes"], 6)
+        self.assertEqual(stats["evictions"], 1)
+
+
+if __name__ == '__main__':
+    # Run the tests
+    unittest.main(verbosity=2)
\ No newline at end of file
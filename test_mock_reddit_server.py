@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from data_controller import DataController
+from mock_reddit_server import MockRedditServer, fixed_latency
+from reddit_scraper import RedditScraper
+
+
+def make_scraper(server):
+    """Create a scraper pointed at the mock server without pacing delays."""
+    scraper = RedditScraper(base_url=server.base_url)
+    scraper.rate_limiter.default_delay = 0.0
+    scraper.rate_limiter.min_delay = 0.0
+    scraper.rate_limiter.current_delay = 0.0
+    return scraper
+
+
+class TestMockRedditServer(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.server = MockRedditServer(posts_per_subreddit=150, comments_per_post=30).start()
+        self.scraper = make_scraper(self.server)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.server.stop()
+    
+    def test_paginated_listings(self):
+        """Test that hot and multi-subreddit listings page through synthetic posts."""
+        posts = self.scraper.get_hot_posts("wallstreetbets", limit=120)
+        
+        self.assertEqual(len(posts), 120)
+        self.assertEqual(len({post.id for post in posts}), 120)
+        self.assertEqual(self.server.get_stats()["requests"], 2)
+        
+        combined = self.scraper.get_multi_subreddit_posts(["stocks", "investing"], limit=40)
+        self.assertEqual({post.subreddit for post in combined}, {"stocks", "investing"})
+    
+    def test_comment_tree_expansion(self):
+        """Test that "more" stubs are resolved through api/morechildren."""
+        comments = self.scraper.get_post_comments("abc", limit=30, expand_tree=False)
+        self.assertEqual(len(comments), 30)
+        
+        self.server.comments_per_post = 250
+        comments = self.scraper.get_post_comments("abc", limit=250, expand_tree=True)
+        self.assertEqual(len(comments), 250)
+        self.assertTrue(any("morechildren" in path for path in self.server.request_log))
+    
+    def test_429_burst_is_retried(self):
+        """Test that the scraper backs off and recovers from a throttling burst."""
+        self.server.throttle_burst(2, retry_after=0.05)
+        
+        posts = self.scraper.get_hot_posts("wallstreetbets", limit=10)
+        
+        self.assertEqual(len(posts), 10)
+        self.assertEqual(self.server.get_stats()["status_counts"], {429: 2, 200: 1})
+        self.assertEqual(self.scraper.get_rate_limit_state()["throttled_count"], 2)
+    
+    def test_server_errors_and_truncated_pages_raise(self):
+        """Test that 5xx responses and cut-off bodies surface as fetch failures."""
+        self.server.fail_next(1, status=502)
+        with self.assertRaises(Exception) as context:
+            self.scraper.get_hot_posts("wallstreetbets", limit=10)
+        self.assertIn("502", str(context.exception))
+        
+        self.server.truncate_next(1)
+        with self.assertRaises(Exception) as context:
+            self.scraper.get_hot_posts("wallstreetbets", limit=10)
+        self.assertIn("Failed to fetch posts from r/wallstreetbets", str(context.exception))
+    
+    def test_rate_limit_headers_and_latency(self):
+        """Test that the limiter learns the advertised budget and latency is applied."""
+        server = MockRedditServer(latency=fixed_latency(0.05), ratelimit_budget=100).start()
+        try:
+            scraper = make_scraper(server)
+            start = time.perf_counter()
+            scraper.get_hot_posts("wallstreetbets", limit=10)
+            
+            self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+            self.assertEqual(scraper.get_rate_limit_state()["remaining"], 99)
+        finally:
+            server.stop()
+
+
+class TestPipelineUnderFailures(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = MockRedditServer(posts_per_subreddit=50).start()
+        self.controller = DataController(cache_duration_minutes=0,
+                                         response_cache_dir=os.path.join(self.temp_dir, "responses"),
+                                         score_cache_path=os.path.join(self.temp_dir, "scores.sqlite"),
+                                         store_path=os.path.join(self.temp_dir, "store.sqlite"))
+        self.controller.cache_file = os.path.join(self.temp_dir, "data_cache.json")
+        self.controller.reddit_scraper = make_scraper(self.server)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.server.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_falls_back_to_expired_cache_when_reddit_is_down(self):
+        """Test that an outage serves the last good results."""
+        first = self.controller.process_reddit_data(post_limit=50, top_stocks_limit=5)
+        self.assertTrue(first)
+        
+        self.server.fail_next(10, status=503)
+        fallback = self.controller.process_reddit_data(post_limit=50, top_stocks_limit=5)
+        
+        self.assertEqual([stock.ticker for stock in fallback], [stock.ticker for stock in first])
+        self.assertEqual([stock.mention_count for stock in fallback],
+                         [stock.mention_count for stock in first])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import gc
+import unittest
+from datetime import datetime
+from models import RedditPost
+from parallel_pipeline import ParallelPipeline
+from sentiment_analyzer import SentimentAnalyzer
+from stock_extractor import StockExtractor
+
+
+class TestParallelPipeline(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        comments = [
+            "AAPL is going to crash, terrible earnings",
+            "Love my TSLA calls, best trade ever!",
+            "GME and AMC both look fine",
+            "ZZZZ might squeeze",
+            "nothing to see here",
+        ]
+        self.posts = [
+            RedditPost(str(i), f"Post {i} about {'AAPL' if i % 2 else 'TSLA'}", "",
+                       comments[i % 5:] + comments[:i % 5], datetime.now(), i, "wallstreetbets")
+            for i in range(40)
+        ]
+        self.pipeline = ParallelPipeline(max_workers=2, min_parallel_texts=10, chunk_size=16)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.pipeline.close()
+    
+    def run_pipeline(self, pipeline, extractor):
+        """Build the index, score the top tickers and aggregate their sentiment."""
+        analyzer = SentimentAnalyzer()
+        index = pipeline.build_index(extractor, self.posts) if pipeline else extractor.build_index(self.posts)
+        top = index.top_mentioned(10)
+        if pipeline:
+            pipeline.score_snippets(analyzer, extractor, index, list(top))
+        return index, top, {ticker: analyzer.analyze_indexed_sentiment(index, ticker) for ticker in top}
+    
+    def test_parallel_results_identical_to_serial(self):
+        """Test that sharded extraction and scoring reproduce the serial results exactly."""
+        serial_index, serial_top, serial_sentiment = self.run_pipeline(None, StockExtractor())
+        index, top, sentiment = self.run_pipeline(self.pipeline, StockExtractor())
+        
+        self.assertEqual(self.pipeline.parallel_runs, 2)
+        self.assertEqual(list(top.items()), list(serial_top.items()))
+        self.assertEqual(index.snippets, serial_index.snippets)
+        self.assertEqual(index.ticker_snippets, serial_index.ticker_snippets)
+        self.assertEqual(sentiment, serial_sentiment)
+    
+    def test_small_corpus_stays_serial(self):
+        """Test that small corpora never start the process pool."""
+        pipeline = ParallelPipeline(max_workers=2, min_parallel_texts=10000)
+        self.run_pipeline(pipeline, StockExtractor())
+        
+        self.assertEqual(pipeline.parallel_runs, 0)
+        self.assertIsNone(pipeline._pool)
+        self.assertFalse(ParallelPipeline(max_workers=1, min_parallel_texts=0).should_parallelize(10 ** 6))
+    
+    def test_workers_pick_up_universe_changes(self):
+        """Test that custom tickers reach the workers."""
+        extractor = StockExtractor(memo_size=0)
+        _, top, _ = self.run_pipeline(self.pipeline, extractor)
+        self.assertNotIn('ZZZZ', top)
+        
+        extractor.add_custom_tickers(['ZZZZ'])
+        _, top, _ = self.run_pipeline(self.pipeline, extractor)
+        self.assertIn('ZZZZ', top)
+    
+    def test_defaults_in_process_and_shuts_pool_down(self):
+        """Test that no pool is used by default and an abandoned pool is shut down."""
+        self.assertFalse(ParallelPipeline(min_parallel_texts=0).should_parallelize(10 ** 6))
+        
+        pipeline = ParallelPipeline(max_workers=2, min_parallel_texts=10)
+        self.run_pipeline(pipeline, StockExtractor())
+        pool, finalizer = pipeline._pool, pipeline._pool_finalizer
+        self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+        self.assertTrue(finalizer.alive)
+        
+        del pipeline
+        gc.collect()
+        self.assertFalse(finalizer.alive)
+        self.assertTrue(pool._shutdown_thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from models import RedditPost
+from post_store import PostStore
+
+
+class TestPostStore(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "store.sqlite")
+        self.store = PostStore(self.path)
+        self.posts = [
+            RedditPost("1", "AAPL calls", "", ["AAPL to 300", "lol"], datetime.now(), 10, "wallstreetbets"),
+            RedditPost("2", "TSLA puts", "Bad quarter for TSLA", [], datetime.now() - timedelta(days=2), 5, "stocks")
+        ]
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def save(self, posts, version="u1"):
+        tickers = {"AAPL calls": {"AAPL"}, "AAPL to 300": {"AAPL"}, "TSLA puts": {"TSLA"},
+                   "Bad quarter for TSLA": {"TSLA"}}
+        scores = {"AAPL calls": (0.1, 0.2, 0.0, 0.8), "TSLA puts": (-0.3, 0.0, 0.4, 0.6)}
+        self.store.save_analysis(posts, tickers, scores, version, "s1")
+    
+    def test_upsert_reports_only_new_or_changed_posts(self):
+        """Test that re-fetching unchanged posts is detected by content hash."""
+        self.assertEqual(self.store.upsert_posts(self.posts), {"1", "2"})
+        self.assertEqual(self.store.upsert_posts(self.posts), set())
+        
+        self.posts[0].comments.append("new comment")
+        self.posts[1].score = 500
+        self.assertEqual(self.store.upsert_posts(self.posts), {"1"})
+        self.assertEqual(self.store.get_stats()["comments"], 3)
+    
+    def test_known_texts_round_trip(self):
+        """Test that stored mentions and scores are served for unchanged posts only."""
+        self.store.upsert_posts(self.posts)
+        self.save(self.posts)
+        
+        tickers, scores = self.store.get_known_texts(self.posts, "u1", "s1")
+        self.assertEqual(tickers, {"AAPL calls": {"AAPL"}, "AAPL to 300": {"AAPL"}, "lol": frozenset(),
+                                   "TSLA puts": {"TSLA"}, "Bad quarter for TSLA": {"TSLA"}})
+        self.assertEqual(scores, {"AAPL calls": (0.1, 0.2, 0.0, 0.8), "TSLA puts": (-0.3, 0.0, 0.4, 0.6)})
+        
+        # Other versions never see the stored results
+        self.assertEqual(self.store.get_known_texts(self.posts, "u2", "s2"), ({}, {}))
+        
+        # An edited post is forgotten until it is analyzed again
+        self.posts[1].content = "Great quarter for TSLA"
+        self.store.upsert_posts(self.posts)
+        tickers, scores = self.store.get_known_texts(self.posts, "u1", "s1")
+        self.assertNotIn("TSLA puts", tickers)
+        self.assertNotIn("TSLA puts", scores)
+        self.assertIn("AAPL calls", scores)
+    
+    def test_get_posts_rebuilds_posts_in_order(self):
+        """Test that stored posts come back with their comments, in the requested order."""
+        self.store.upsert_posts(self.posts)
+        
+        posts = self.store.get_posts(["2", "missing", "1"])
+        self.assertEqual([post.id for post in posts], ["2", "1"])
+        self.assertEqual(posts[1].comments, ["AAPL to 300", "lol"])
+        self.assertEqual(posts[0].content, "Bad quarter for TSLA")
+        self.assertEqual(posts[0].subreddit, "stocks")
+        self.assertEqual(posts[0].score, 5)
+    
+    def test_mention_counts_by_post(self):
+        """Test per-ticker post counts with time and subreddit filters."""
+        self.store.upsert_posts(self.posts)
+        self.save(self.posts)
+        
+        self.assertEqual(self.store.get_mention_counts(), {"AAPL": 1, "TSLA": 1})
+        self.assertEqual(self.store.get_mention_counts(since=datetime.now() - timedelta(days=1)), {"AAPL": 1})
+        self.assertEqual(self.store.get_mention_counts(subreddit="stocks"), {"TSLA": 1})
+        self.assertEqual(self.store.get_mention_counts(subreddit="Stocks"), {"TSLA": 1})
+    
+    def test_readers_do_not_block_the_writer(self):
+        """Test that an open read transaction neither blocks a write nor sees it half done."""
+        self.store.upsert_posts(self.posts[:1])
+        
+        reader = sqlite3.connect(self.path)
+        reader.execute("BEGIN")
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM posts").fetchone()[0], 1)
+        
+        self.store.upsert_posts(self.posts)
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM posts").fetchone()[0], 1)
+        reader.rollback()
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM posts").fetchone()[0], 2)
+        reader.close()
+    
+    def test_prune_removes_posts_not_seen_recently(self):
+        """Test that posts missing from recent refreshes are deleted with their rows."""
+        self.store.upsert_posts(self.posts)
+        self.save(self.posts)
+        
+        self.assertEqual(self.store.prune(datetime.now() + timedelta(seconds=1)), 2)
+        self.assertEqual(self.store.get_stats(), {"posts": 0, "comments": 0, "text_scores": 0, "mentions": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import time
+import unittest
+from rate_limiter import AdaptiveRateLimiter
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.limiter = AdaptiveRateLimiter(default_delay=1.0, min_delay=0.05, max_delay=5.0)
+    
+    def test_initial_state_uses_default_delay(self):
+        """Test that the limiter starts with the default spacing and no budget info."""
+        state = self.limiter.get_state()
+        self.assertEqual(state["current_delay"], 1.0)
+        self.assertIsNone(state["remaining"])
+        self.assertEqual(state["throttled_count"], 0)
+    
+    def test_speeds_up_when_budget_available(self):
+        """Test that spacing spreads the remaining budget over the reset window."""
+        self.limiter.update({'X-Ratelimit-Remaining': '50.0', 'X-Ratelimit-Reset': '25'}, 200)
+        self.assertAlmostEqual(self.limiter.get_state()["current_delay"], 0.5)
+        
+        # Plenty of budget is clamped to the minimum spacing
+        self.limiter.update({'X-Ratelimit-Remaining': '1000', 'X-Ratelimit-Reset': '10'}, 200)
+        self.assertEqual(self.limiter.get_state()["current_delay"], 0.05)
+    
+    def test_faster_pacing_keeps_reserved_slots(self):
+        """Test that a response granting more budget does not pull the next slot before reserved ones."""
+        self.limiter.acquire()
+        reserved = self.limiter.next_request_time
+        
+        self.limiter.update({'X-Ratelimit-Remaining': '1000', 'X-Ratelimit-Reset': '10'}, 200)
+        self.assertEqual(self.limiter.next_request_time, reserved)
+        
+        # A tighter budget still pushes the next slot back
+        self.limiter.update({'X-Ratelimit-Remaining': '1', 'X-Ratelimit-Reset': '4'}, 200)
+        self.assertGreater(self.limiter.next_request_time, reserved)
+    
+    def test_backs_off_on_429_with_retry_after(self):
+        """Test that a 429 blocks callers for exactly the Retry-After period."""
+        self.limiter.update({'Retry-After': '0.2'}, 429)
+        
+        state = self.limiter.get_state()
+        self.assertEqual(state["throttled_count"], 1)
+        self.assertGreater(state["blocked_for_seconds"], 0.1)
+        
+        waited = self.limiter.acquire()
+        self.assertGreaterEqual(waited, 0.15)
+    
+    def test_exhausted_budget_waits_for_reset(self):
+        """Test that zero remaining budget blocks until the reset window passes."""
+        self.limiter.update({'X-Ratelimit-Remaining': '0', 'X-Ratelimit-Reset': '3'}, 200)
+        self.assertGreater(self.limiter.get_state()["blocked_for_seconds"], 2.5)
+    
+    def test_malformed_headers_are_ignored(self):
+        """Test that missing or malformed headers leave pacing unchanged."""
+        self.limiter.update({'X-Ratelimit-Remaining': 'abc', 'X-Ratelimit-Reset': None}, 200)
+        self.assertEqual(self.limiter.get_state()["current_delay"], 1.0)
+    
+    def test_acquire_spaces_requests(self):
+        """Test that consecutive acquisitions are spaced by the current delay."""
+        self.limiter.current_delay = 0.05
+        start = time.monotonic()
+        for _ in range(3):
+            self.limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+
+if __name__ == '__main__':
+    # Run the tests
+    unittest.main(verbosity=2)
\ No newline at end of file
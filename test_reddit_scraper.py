@@ -280,6 +280,200 @@ class TestRedditScraper(unittest.TestCase):
         self.assertEqual(posts[0].id, 'new1')  # More recent
         self.assertEqual(posts[1].id, 'hot1')  # Older
     
+    def test_get_posts_with_comments_concurrent(self):
+        """Test that concurrent comment fetching keeps post order and isolates failures."""
+        import time
+        posts = [RedditPost(f"p{i}", f"Post {i}", "", [], datetime.now(), 1) for i in range(6)]
+        
+        def fake_comments(post_id, limit, **kwargs):
+            # Earlier posts finish last to make sure ordering does not depend on timing
+            time.sleep(0.01 * (6 - int(post_id[1:])))
+            if post_id == "p3":
+                raise Exception("boom")
+            return [f"comment on {post_id}"]
+        
+        with patch.object(self.scraper, 'get_hot_posts', return_value=posts), \
+             patch.object(self.scraper, 'get_post_comments', side_effect=fake_comments):
+            result = self.scraper.get_posts_with_comments(post_limit=6, max_workers=4)
+        
+        self.assertEqual([p.id for p in result], [f"p{i}" for i in range(6)])
+        self.assertEqual(result[0].comments, ["comment on p0"])
+        self.assertEqual(result[3].comments, [])
+        self.assertEqual(result[5].comments, ["comment on p5"])
+    
+    @patch('reddit_scraper.requests.Session.get')
+    def test_rate_limit_shared_across_threads(self, mock_get):
+        """Test that concurrent requests are spaced by the shared request delay."""
+        import threading
+        import time
+        mock_response = Mock()
+        mock_response.json.return_value = {}
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+        
+        self.scraper.rate_limiter.current_delay = 0.05
+        threads = [threading.Thread(target=self.scraper._make_request, args=("https://example",))
+                   for _ in range(4)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Four requests need at least three full delays between them
+        self.assertGreaterEqual(time.time() - start, 0.15)
+        self.assertEqual(mock_get.call_count, 4)
+    
+    @patch('reddit_scraper.requests.Session.get')
+    def test_make_request_retries_after_429(self, mock_get):
+        """Test that a 429 response is retried after the server's Retry-After delay."""
+        import time
+        throttled = Mock(status_code=429, headers={'Retry-After': '0.1'})
+        ok = Mock(status_code=200, headers={'X-Ratelimit-Remaining': '500', 'X-Ratelimit-Reset': '100'})
+        ok.json.return_value = {'ok': True}
+        ok.raise_for_status.return_value = None
+        mock_get.side_effect = [throttled, ok]
+        
+        start = time.time()
+        self.assertEqual(self.scraper._make_request("https://example"), {'ok': True})
+        
+        self.assertGreaterEqual(time.time() - start, 0.1)
+        state = self.scraper.get_rate_limit_state()
+        self.assertEqual(state["throttled_count"], 1)
+        self.assertEqual(state["remaining"], 500)
+    
+    @patch('reddit_scraper.requests.Session.get')
+    def test_get_new_posts_since_last_seen(self, mock_get):
+        """Test that watermark mode stops at already ingested posts and returns the delta."""
+        import os
+        import tempfile
+        from watermark_store import WatermarkStore
+        
+        def listing(ids, after):
+            response = Mock()
+            response.raise_for_status.return_value = None
+            response.json.return_value = {'data': {'after': after, 'children': [
+                {'kind': 't3', 'data': {'id': post_id, 'title': post_id, 'selftext': '',
+                                        'score': 1, 'created_utc': 1640995200.0}}
+                for post_id in ids
+            ]}}
+            return response
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            scraper = RedditScraper(watermark_store=WatermarkStore(os.path.join(temp_dir, "wm.json")))
+            scraper.rate_limiter.current_delay = 0
+            
+            # First poll crawls both pages
+            mock_get.side_effect = [listing(['c', 'b'], 't3_b'), listing(['a'], None)]
+            posts = scraper.get_new_posts("wallstreetbets", 10, since_last_seen=True)
+            self.assertEqual([p.id for p in posts], ['c', 'b', 'a'])
+            
+            # Second poll stops on the first page at the watermark
+            mock_get.side_effect = [listing(['e', 'd', 'c', 'b'], 't3_b')]
+            posts = scraper.get_new_posts("wallstreetbets", 10, since_last_seen=True)
+            self.assertEqual([p.id for p in posts], ['e', 'd'])
+            self.assertEqual(mock_get.call_count, 3)
+        
+        with self.assertRaises(Exception):
+            self.scraper.get_new_posts("wallstreetbets", 10, since_last_seen=True)
+    
+    @patch('reddit_scraper.requests.Session.get')
+    def test_iter_hot_posts_yields_pages_and_prefetches(self, mock_get):
+        """Test that the streaming API yields per page and fetches the next page early."""
+        import time
+        
+        def listing(ids, after):
+            response = Mock()
+            response.raise_for_status.return_value = None
+            response.json.return_value = {'data': {'after': after, 'children': [
+                {'kind': 't3', 'data': {'id': post_id, 'title': post_id, 'selftext': '',
+                                        'score': 1, 'created_utc': 1640995200.0}}
+                for post_id in ids
+            ]}}
+            return response
+        
+        mock_get.side_effect = [listing(['a', 'b'], 't3_b'), listing(['c', 'd'], 't3_d'), listing(['e'], None)]
+        self.scraper.rate_limiter.current_delay = 0
+        
+        stream = self.scraper.iter_hot_posts("wallstreetbets", 5)
+        first = next(stream)
+        self.assertEqual([p.id for p in first], ['a', 'b'])
+        
+        # The second page is requested while the consumer still holds the first
+        deadline = time.time() + 2
+        while mock_get.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(mock_get.call_count, 2)
+        
+        remaining = [[p.id for p in batch] for batch in stream]
+        self.assertEqual(remaining, [['c', 'd'], ['e']])
+    
+    @patch('reddit_scraper.requests.Session.get')
+    def test_get_post_comments_expands_tree_and_more(self, mock_get):
+        """Test full tree expansion with batched "more" requests and a shared budget."""
+        from reddit_scraper import RequestBudget
+        
+        def comment(body, replies=''):
+            return {'kind': 't1', 'data': {'body': body, 'replies': replies}}
+        
+        thread = Mock()
+        thread.raise_for_status.return_value = None
+        thread.json.return_value = [{}, {'data': {'children': [
+            comment('top', {'data': {'children': [
+                comment('[deleted]', {'data': {'children': [comment('nested reply')]}})
+            ]}}),
+            {'kind': 'more', 'data': {'children': ['m1', 'm2', '_']}}
+        ]}}]
+        
+        more = Mock()
+        more.raise_for_status.return_value = None
+        more.json.return_value = {'json': {'data': {'things': [
+            comment('from more 1'), comment('from more 2'),
+            {'kind': 'more', 'data': {'children': ['m3']}}
+        ]}}}
+        
+        mock_get.side_effect = [thread, more]
+        self.scraper.rate_limiter.current_delay = 0
+        budget = RequestBudget(1)
+        
+        comments = self.scraper.get_post_comments("abc", 50, expand_tree=True, request_budget=budget)
+        
+        self.assertEqual(comments, ['top', 'nested reply', 'from more 1', 'from more 2'])
+        more_url = mock_get.call_args_list[1].args[0]
+        self.assertIn('api/morechildren.json', more_url)
+        self.assertIn('link_id=t3_abc', more_url)
+        self.assertIn('children=m1,m2', more_url)
+        # The budget of one "more" request stopped expansion of m3
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(budget.remaining, 0)
+    
+    def test_get_multi_subreddit_posts(self):
+        """Test combined listings, per-subreddit fallback, tagging and deduplication."""
+        def post(post_id, subreddit=""):
+            return RedditPost(post_id, post_id, "", [], datetime.now(), 1, subreddit=subreddit)
+        
+        with patch.object(self.scraper, 'get_hot_posts',
+                          return_value=[post('a', 'stocks'), post('b', 'options')]) as mock_hot:
+            posts = self.scraper.get_multi_subreddit_posts(['stocks', 'options'], 10)
+        mock_hot.assert_called_once_with('stocks+options', 10)
+        self.assertEqual([(p.id, p.subreddit) for p in posts], [('a', 'stocks'), ('b', 'options')])
+        
+        def per_subreddit(name, limit):
+            if name == 'stocks+options':
+                raise Exception("combined listing failed")
+            return {'stocks': [post('a'), post('shared')], 'options': [post('shared'), post('c')]}[name]
+        
+        with patch.object(self.scraper, 'get_hot_posts', side_effect=per_subreddit) as mock_hot:
+            posts = self.scraper.get_multi_subreddit_posts(['stocks', 'options'], 10)
+        mock_hot.assert_any_call('stocks', 5)
+        self.assertEqual([(p.id, p.subreddit) for p in posts],
+                         [('a', 'stocks'), ('shared', 'stocks'), ('c', 'options')])
+        
+        # Names differing only in case are one subreddit
+        with patch.object(self.scraper, 'get_hot_posts', return_value=[post('a', 'Stocks')]) as mock_hot:
+            self.scraper.get_multi_subreddit_posts(['Stocks', 'stocks', 'Options'], 10)
+        mock_hot.assert_called_once_with('stocks+options', 10)
+    
     def test_authentication_status(self):
         """Test authentication status methods."""
         self.assertTrue(self.scraper.is_authenticated())
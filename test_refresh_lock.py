@@ -0,0 +1,67 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from refresh_lock import RefreshLock
+
+
+class TestRefreshLock(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "locks", "refresh.lock")
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_excludes_other_holders_until_released(self):
+        """Test that a second lock on the same file waits for the first to be released."""
+        first = RefreshLock(self.path)
+        second = RefreshLock(self.path)
+        self.assertTrue(first.acquire(timeout=0))
+        self.assertFalse(second.acquire(timeout=0.05))
+        
+        first.release()
+        self.assertTrue(second.acquire(timeout=0))
+        self.assertTrue(second.held)
+        second.release()
+        self.assertFalse(second.held)
+    
+    def test_waiter_gets_lock_when_holder_finishes(self):
+        """Test that a waiting thread takes the lock as soon as the holder releases it."""
+        holder = RefreshLock(self.path)
+        holder.acquire()
+        threading.Timer(0.1, holder.release).start()
+        
+        started = time.monotonic()
+        with RefreshLock(self.path) as waiter:
+            self.assertTrue(waiter.held)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+    
+    def test_excludes_other_processes(self):
+        """Test that the lock is held across processes and freed when the holder exits."""
+        script = ("import sys; from refresh_lock import RefreshLock; lock = RefreshLock(sys.argv[1]); "
+                  "lock.acquire(); print('locked', flush=True); sys.stdin.read()")
+        child = subprocess.Popen([sys.executable, "-c", script, self.path], stdin=subprocess.PIPE,
+                                 stdout=subprocess.PIPE, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+        try:
+            self.assertEqual(child.stdout.readline().strip(), "locked")
+            self.assertFalse(RefreshLock(self.path).acquire(timeout=0.05))
+        finally:
+            child.stdin.close()
+            child.wait(5)
+            child.stdout.close()
+        
+        lock = RefreshLock(self.path)
+        self.assertTrue(lock.acquire(timeout=1))
+        lock.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
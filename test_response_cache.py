@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+from reddit_scraper import RedditScraper
+from response_cache import ResponseCache
+
+
+LISTING_URL = "https://www.reddit.com/r/wallstreetbets/hot.json?limit=10"
+COMMENTS_URL = "https://www.reddit.com/comments/abc.json?limit=20"
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.cache_dir, listing_ttl=60, comments_ttl=120,
+                                   old_comments_ttl=3600, old_post_age=86400)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def test_store_and_lookup_fresh_entry(self):
+        """Test that stored responses are served fresh and persist across instances."""
+        self.cache.store(LISTING_URL, {'data': {'children': []}}, {'ETag': '"v1"'})
+        
+        entry = self.cache.lookup(LISTING_URL)
+        self.assertTrue(entry.is_fresh())
+        self.assertEqual(entry.body, {'data': {'children': []}})
+        self.assertEqual(entry.conditional_headers(), {'If-None-Match': '"v1"'})
+        
+        # A new instance rebuilds its index from disk
+        reopened = ResponseCache(self.cache_dir)
+        self.assertIsNotNone(reopened.lookup(LISTING_URL))
+        self.assertIsNone(reopened.lookup(COMMENTS_URL))
+    
+    def test_ttl_per_endpoint_class(self):
+        """Test that old posts' comment threads get a longer TTL than listings."""
+        old_thread = [{'data': {'children': [{'data': {'created_utc': time.time() - 2 * 86400}}]}}, {}]
+        new_thread = [{'data': {'children': [{'data': {'created_utc': time.time() - 60}}]}}, {}]
+        
+        self.assertEqual(self.cache.ttl_for(LISTING_URL, {}), 60)
+        self.assertEqual(self.cache.ttl_for(COMMENTS_URL, new_thread), 120)
+        self.assertEqual(self.cache.ttl_for(COMMENTS_URL, old_thread), 3600)
+    
+    def test_lru_eviction_by_size(self):
+        """Test that the byte cap evicts the least recently used entries and their files."""
+        cache = ResponseCache(self.cache_dir, max_bytes=600)
+        for i in range(5):
+            cache.store(f"{LISTING_URL}&page={i}", {'payload': 'x' * 100}, {})
+        
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["bytes"], 600)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertIsNone(cache.lookup(f"{LISTING_URL}&page=0"))
+        self.assertIsNotNone(cache.lookup(f"{LISTING_URL}&page=4"))
+        self.assertEqual(len(os.listdir(self.cache_dir)), stats["entries"])
+    
+    @patch('reddit_scraper.requests.Session.get')
+    def test_scraper_serves_fresh_and_revalidates_stale(self, mock_get):
+        """Test that the scraper skips fresh requests and sends conditional GETs when stale."""
+        ok = Mock(status_code=200, headers={'ETag': '"v1"'})
+        ok.json.return_value = {'data': {'children': []}}
+        not_modified = Mock(status_code=304, headers={})
+        mock_get.side_effect = [ok, not_modified]
+        
+        scraper = RedditScraper(response_cache=self.cache)
+        scraper.rate_limiter.current_delay = 0
+        
+        self.assertEqual(scraper._make_request(LISTING_URL), {'data': {'children': []}})
+        self.assertEqual(scraper._make_request(LISTING_URL), {'data': {'children': []}})
+        self.assertEqual(mock_get.call_count, 1)  # Second call was a fresh hit
+        
+        # Expire the entry and check that the next request is conditional
+        entry = self.cache.lookup(LISTING_URL)
+        entry.ttl = 0
+        self.cache._write(entry)
+        
+        self.assertEqual(scraper._make_request(LISTING_URL), {'data': {'children': []}})
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        
+        stats = scraper.get_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)  # Includes the lookup above
+        self.assertEqual(stats["revalidated"], 1)
+
+
+if __name__ == '__main__':
+    # Run the tests
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+from models import RedditPost
+from score_cache import ScoreCache
+from sentiment_analyzer import SentimentAnalyzer
+from stock_extractor import StockExtractor
+
+
+class TestScoreCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "scores.sqlite")
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_scores_persist_per_version(self):
+        """Test that scores survive a restart but not a lexicon change."""
+        cache = ScoreCache(self.path, version="v1")
+        cache.put("AAPL to the moon", (0.5, 0.4, 0.0, 0.6))
+        cache.close()
+        
+        reopened = ScoreCache(self.path, version="v1")
+        self.assertEqual(reopened.get("AAPL to the moon"), (0.5, 0.4, 0.0, 0.6))
+        self.assertEqual(reopened.get_stats()["disk_hits"], 1)
+        
+        # Second lookup is served from memory
+        reopened.get("AAPL to the moon")
+        self.assertEqual(reopened.get_stats()["memory_hits"], 1)
+        
+        self.assertIsNone(ScoreCache(self.path, version="v2").get("AAPL to the moon"))
+    
+    def test_memory_entries_are_per_version(self):
+        """Test that a version stamped after construction never serves another version's scores."""
+        cache = ScoreCache(self.path, version="v1")
+        cache.put("AAPL to the moon", (0.5, 0.4, 0.0, 0.6))
+        
+        cache.version = "v2"
+        self.assertIsNone(cache.get("AAPL to the moon"))
+        cache.put("AAPL to the moon", (0.1, 0.1, 0.0, 0.9))
+        
+        cache.version = "v1"
+        self.assertEqual(cache.get("AAPL to the moon"), (0.5, 0.4, 0.0, 0.6))
+    
+    def test_least_recently_used_rows_are_evicted(self):
+        """Test that the table is trimmed to its cap, oldest rows first."""
+        cache = ScoreCache(self.path, version="v1", memory_entries=1, max_entries=10, touch_interval=0)
+        for i in range(10):
+            cache.put(f"text {i}", (0.0, 0.0, 0.0, 1.0))
+        cache.get("text 0")  # Refresh so it survives eviction
+        cache.put("text 10", (0.0, 0.0, 0.0, 1.0))
+        
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["entries"], 10)
+        self.assertEqual(stats["evictions"], 11 - stats["entries"])
+        self.assertIsNotNone(cache.get("text 0"))
+        self.assertIsNone(cache.get("text 1"))
+    
+    def test_reads_only_write_stale_recency(self):
+        """Test that disk hits leave fresh rows alone and the database runs in WAL mode."""
+        cache = ScoreCache(self.path, version="v1", memory_entries=1)
+        cache.put_many([("a", (0.1, 0.0, 0.0, 1.0)), ("b", (0.2, 0.0, 0.0, 1.0))])
+        connection = cache._get_connection()
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        
+        writes = connection.total_changes
+        for _ in range(3):
+            self.assertEqual(len(cache.get_many(["a", "b"])), 2)
+        self.assertEqual(connection.total_changes, writes)
+        
+        cache.touch_interval = 0
+        cache.get_many(["a", "b"])
+        self.assertGreater(connection.total_changes, writes)
+    
+    def test_analyzer_serves_repeat_texts_from_cache(self):
+        """Test that cached scores are identical and VADER runs once per text."""
+        analyzer = SentimentAnalyzer(score_cache=ScoreCache(self.path))
+        first = analyzer.get_sentiment_score("I love this stock, great earnings!")
+        
+        restarted = SentimentAnalyzer(score_cache=ScoreCache(self.path))
+        with patch.object(restarted.kernel, 'polarity_scores') as polarity_scores:
+            second = restarted.get_sentiment_score("I love this stock, great earnings!")
+        
+        polarity_scores.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(restarted.get_cache_stats()["hit_rate"], 1.0)
+    
+    def test_score_snippets_only_scores_new_texts(self):
+        """Test that a refresh with mostly old text only runs VADER on the new text."""
+        extractor = StockExtractor()
+        posts = [RedditPost("1", "AAPL is great", "", ["AAPL is terrible", "TSLA ok"], datetime.now(), 1)]
+        
+        analyzer = SentimentAnalyzer(score_cache=ScoreCache(self.path))
+        index = extractor.build_index(posts)
+        analyzer.score_snippets(index, ["AAPL", "TSLA"])
+        expected = analyzer.analyze_indexed_sentiment(index, "AAPL")
+        
+        posts[0].comments.append("AAPL new comment, awful")
+        refreshed = SentimentAnalyzer(score_cache=ScoreCache(self.path))
+        index = extractor.build_index(posts)
+        scored = []
+        refreshed.score_snippets(index, ["AAPL", "TSLA"],
+                                 score_batch=lambda texts: scored.extend(texts) or
+                                 [refreshed.get_sentiment_score(text) for text in texts])
+        
+        self.assertEqual(scored, ["AAPL new comment, awful"])
+        self.assertNotEqual(refreshed.analyze_indexed_sentiment(index, "AAPL"), expected)
+        self.assertEqual(index.snippet_scores[0], analyzer.get_sentiment_score("AAPL is great"))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
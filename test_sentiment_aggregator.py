@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from models import RedditPost
+from score_cache import text_key
+from sentiment_aggregator import SentimentAggregator
+from sentiment_analyzer import SentimentAnalyzer
+from stock_extractor import StockExtractor
+
+
+class TestSentimentAggregator(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "aggregates.json")
+        self.extractor = StockExtractor()
+        self.analyzer = SentimentAnalyzer()
+        self.posts = [
+            RedditPost("1", "AAPL is great", "", ["AAPL is terrible", "TSLA ok, AAPL fine"], datetime.now(), 1),
+            RedditPost("2", "TSLA to the moon", "Love TSLA", [], datetime.now(), 1)
+        ]
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def assertMatchesRecompute(self, aggregator, posts, ticker):
+        index = self.extractor.build_index(posts)
+        expected = self.analyzer.analyze_indexed_sentiment(index, ticker)
+        actual = aggregator.get_sentiment(ticker)
+        self.assertAlmostEqual(actual.compound_score, expected.compound_score, places=9)
+        self.assertAlmostEqual(actual.positive, expected.positive, places=9)
+        self.assertAlmostEqual(actual.neutral, expected.neutral, places=9)
+        self.assertEqual(actual.category, expected.category)
+    
+    def test_sync_matches_full_recompute(self):
+        """Test that running sums give the same averages as analyzing the whole window."""
+        aggregator = SentimentAggregator()
+        self.assertEqual(aggregator.sync_posts(self.posts, self.extractor, self.analyzer), 5)
+        
+        self.assertMatchesRecompute(aggregator, self.posts, "AAPL")
+        self.assertMatchesRecompute(aggregator, self.posts, "TSLA")
+        self.assertEqual(aggregator.get_mention_counts(), {"AAPL": 3, "TSLA": 3})
+        self.assertEqual(aggregator.get_sentiment("MSFT").category, "Neutral")
+    
+    def test_edits_and_deletions_are_retracted(self):
+        """Test that only changed texts are rescored and removed texts leave the totals."""
+        aggregator = SentimentAggregator()
+        aggregator.sync_posts(self.posts, self.extractor, self.analyzer)
+        
+        self.posts[0].comments = ["AAPL is absolutely wonderful"]
+        self.assertEqual(aggregator.sync_posts(self.posts[:1], self.extractor, self.analyzer), 1)
+        self.assertMatchesRecompute(aggregator, self.posts, "AAPL")
+        self.assertMatchesRecompute(aggregator, self.posts, "TSLA")
+        
+        self.assertEqual(aggregator.retract_post("2"), 2)
+        self.assertMatchesRecompute(aggregator, self.posts[:1], "AAPL")
+        self.assertEqual(aggregator.get_mention_counts(), {"AAPL": 2})
+        
+        comment_id = f"1/comment/{text_key('AAPL is absolutely wonderful').hex()[:16]}"
+        self.assertTrue(aggregator.retract(comment_id))
+        self.assertFalse(aggregator.retract(comment_id))
+        self.assertEqual(aggregator.get_mention_counts(), {"AAPL": 1})
+    
+    def test_reordered_and_deleted_comments_keep_their_ids(self):
+        """Test that comments are keyed by content, so only a removed comment leaves the totals."""
+        aggregator = SentimentAggregator()
+        self.posts[0].comments = ["TSLA ok, AAPL fine", "AAPL is terrible", "AAPL is terrible"]
+        self.assertEqual(aggregator.sync_posts(self.posts, self.extractor, self.analyzer), 6)
+        self.assertEqual(aggregator.get_mention_counts(), {"AAPL": 4, "TSLA": 3})
+        
+        # Reordering rescores nothing; deleting one of the duplicates retracts only it
+        self.posts[0].comments = ["AAPL is terrible", "TSLA ok, AAPL fine"]
+        self.assertEqual(aggregator.sync_posts(self.posts, self.extractor, self.analyzer), 0)
+        self.assertEqual(aggregator.get_mention_counts(), {"AAPL": 3, "TSLA": 3})
+        self.assertMatchesRecompute(aggregator, self.posts, "AAPL")
+    
+    def test_checkpoint_round_trip(self):
+        """Test that a restored aggregator keeps its totals and can still retract."""
+        aggregator = SentimentAggregator(self.path)
+        aggregator.sync_posts(self.posts, self.extractor, self.analyzer)
+        aggregator.checkpoint()
+        
+        restored = SentimentAggregator(self.path)
+        self.assertEqual(restored.get_sentiment("AAPL"), aggregator.get_sentiment("AAPL"))
+        self.assertEqual(restored.sync_posts(self.posts, self.extractor, self.analyzer), 0)
+        self.assertEqual(restored.retract_post("1"), 3)
+        self.assertMatchesRecompute(restored, self.posts[1:], "TSLA")
+    
+    def test_corrupt_checkpoint_starts_empty(self):
+        """Test that a corrupted checkpoint file is ignored."""
+        with open(self.path, 'w') as f:
+            f.write("not json")
+        
+        aggregator = SentimentAggregator(self.path)
+        self.assertEqual(aggregator.get_mention_counts(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
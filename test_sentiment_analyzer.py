@@ -1,7 +1,9 @@
 import unittest
 from datetime import datetime
+from unittest.mock import patch
 from sentiment_analyzer import SentimentAnalyzer
 from models import RedditPost, SentimentResult
+from stock_extractor import StockExtractor
 
 
 class TestSentimentAnalyzer(unittest.TestCase):
@@ -128,6 +130,81 @@ class TestSentimentAnalyzer(unittest.TestCase):
         self.assertEqual(result_lower.category, "Positive")
         self.assertEqual(result_mixed.category, "Positive")
     
+    def test_analyze_indexed_sentiment_scores_each_snippet_once(self):
+        """Test that indexed analysis scores shared snippets only once across tickers."""
+        posts = [
+            RedditPost("1", "AAPL and TSLA are amazing", "", ["TSLA is terrible"], datetime.now(), 100),
+            RedditPost("2", "Loving AAPL", "", [], datetime.now(), 50)
+        ]
+        index = StockExtractor().build_index(posts)
+        
+        with patch.object(self.analyzer, 'get_sentiment_score', wraps=self.analyzer.get_sentiment_score) as mock_score:
+            aapl = self.analyzer.analyze_indexed_sentiment(index, "AAPL")
+            tsla = self.analyzer.analyze_indexed_sentiment(index, "tsla")
+        
+        self.assertEqual(mock_score.call_count, 3)
+        self.assertEqual(aapl, self.analyzer.analyze_stock_sentiment(posts, "AAPL"))
+        self.assertEqual(tsla, self.analyzer.analyze_stock_sentiment(posts, "TSLA"))
+        
+        # Unknown tickers fall back to a neutral result
+        result = self.analyzer.analyze_indexed_sentiment(index, "MSFT")
+        self.assertEqual(result.category, "Neutral")
+        self.assertEqual(result.neutral, 1.0)
+    
+    def test_score_batch_matches_single_scores(self):
+        """Test that batch scoring returns packed arrays equal to per-text scoring."""
+        texts = ["This stock is amazing!", "", "Awful earnings, terrible guidance", "AAPL", "This stock is amazing!"]
+        batch = self.analyzer.score_batch(texts)
+        
+        self.assertEqual(len(batch), len(texts))
+        self.assertEqual(batch.compound.typecode, 'd')
+        for i, text in enumerate(texts):
+            result = self.analyzer.get_sentiment_score(text)
+            self.assertEqual((batch.compound[i], batch.positive[i], batch.negative[i], batch.neutral[i]),
+                             (result.compound_score, result.positive, result.negative, result.neutral))
+    
+    def test_window_sentiment_scores_sentences_around_mention(self):
+        """Test that window mode scores only the sentences near the ticker."""
+        text = "TSLA earnings were amazing. I love the product.\nThe weather is awful. AAPL is terrible and horrible."
+        
+        result = self.analyzer.get_window_sentiment(text, "TSLA", window=1)
+        self.assertEqual(result.category, "Positive")
+        self.assertEqual(result, self.analyzer._aggregate_sentiments([
+            self.analyzer.get_sentiment_score("TSLA earnings were amazing."),
+            self.analyzer.get_sentiment_score("I love the product.")
+        ]))
+        self.assertEqual(self.analyzer.get_window_sentiment(text, "AAPL", window=0).category, "Negative")
+        
+        # Windows covering every sentence fall back to scoring the whole text
+        self.assertEqual(self.analyzer.get_window_sentiment(text, "TSLA", window=3),
+                         self.analyzer.get_sentiment_score(text))
+    
+    def test_window_sentiment_ignores_tickers_inside_words(self):
+        """Test that a ticker inside another word does not select a sentence."""
+        text = "AI is a great buy. I said nothing about it. Markets were flat today."
+        self.assertEqual(self.analyzer.get_window_sentiment(text, "AI", window=0),
+                         self.analyzer.get_sentiment_score("AI is a great buy."))
+        
+        # With the extractor's matcher, short tickers spelled like words need upper case too
+        analyzer = SentimentAnalyzer(find_tickers=StockExtractor().extract_tickers)
+        text = "NVDA is great. It was done on time. ON is awful."
+        self.assertEqual(analyzer.get_window_sentiment(text, "ON", window=0),
+                         analyzer.get_sentiment_score("ON is awful."))
+    
+    def test_window_mode_sentence_scores_are_memoized(self):
+        """Test that each sentence of a text is scored once across tickers."""
+        analyzer = SentimentAnalyzer(sentence_window=0)
+        text = "TSLA is great. Nothing else. AAPL is bad. TSLA and AAPL both move."
+        posts = [RedditPost("1", text, "", [], datetime.now(), 1)]
+        
+        with patch.object(analyzer, 'get_sentiment_score', wraps=analyzer.get_sentiment_score) as score:
+            tsla = analyzer.analyze_stock_sentiment(posts, "TSLA")
+            aapl = analyzer.analyze_stock_sentiment(posts, "AAPL")
+        
+        self.assertEqual(score.call_count, 3)
+        self.assertEqual(tsla.category, "Positive")
+        self.assertEqual(aapl.category, "Negative")
+    
     def test_analyze_multiple_stocks(self):
         """Test analyzing sentiment for multiple stocks at once."""
         posts = [
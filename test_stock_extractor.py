@@ -123,6 +123,40 @@ class TestStockExtractor(unittest.TestCase):
         result = self.extractor.get_top_mentioned(posts)
         self.assertEqual(result, {})
     
+    def test_build_index_maps_tickers_to_snippets(self):
+        """Test that the index maps each ticker to the texts that mention it."""
+        posts = [
+            RedditPost("1", "AAPL vs TSLA", "No tickers in here", ["AAPL calls printing"], datetime.now(), 100),
+            RedditPost("2", "Thoughts?", "", ["AAPL calls printing", "GME"], datetime.now(), 50)
+        ]
+        
+        index = self.extractor.build_index(posts)
+        
+        # Identical comment text is stored once but referenced per occurrence
+        self.assertEqual(index.snippets, ["AAPL vs TSLA", "AAPL calls printing", "GME"])
+        self.assertEqual(index.ticker_snippets['AAPL'], [0, 1, 1])
+        self.assertEqual(index.ticker_snippets['TSLA'], [0])
+        self.assertEqual(index.ticker_snippets['GME'], [2])
+        self.assertEqual(index.top_mentioned(), {'AAPL': 2, 'TSLA': 1, 'GME': 1})
+    
+    def test_extraction_memo_hits_and_invalidation(self):
+        """Test that repeated texts are served from the memo until the universe changes."""
+        text = "ZZZZ and AAPL calls"
+        self.assertEqual(self.extractor.extract_tickers(text), {'AAPL'})
+        
+        # Callers get their own copy of a memoized result
+        self.extractor.extract_tickers(text).add('MUTATED')
+        self.assertEqual(self.extractor.extract_tickers(text), {'AAPL'})
+        
+        stats = self.extractor.get_memo_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        
+        self.extractor.add_custom_tickers(['ZZZZ'])
+        self.assertEqual(self.extractor.extract_tickers(text), {'ZZZZ', 'AAPL'})
+        self.assertEqual(self.extractor.get_memo_stats()["misses"], 2)
+        
+        self.assertEqual(StockExtractor(memo_size=0).get_memo_stats(), {})
+    
     def test_add_custom_tickers(self):
         """Test adding custom tickers to the valid set."""
         original_count = len(self.extractor.valid_tickers)
@@ -137,6 +171,16 @@ class TestStockExtractor(unittest.TestCase):
         tickers = self.extractor.extract_tickers(text)
         self.assertIn('CUSTOM', tickers)
     
+    def test_english_word_tickers_need_cashtag_or_upper_case(self):
+        """Test that tickers spelled like English words are not matched in plain prose."""
+        text = "so i think it is going up on monday, or be real low, play it now"
+        for engine in ("auto", "trie", "token", "regex"):
+            with self.subTest(engine=engine):
+                extractor = StockExtractor(matcher=engine)
+                extractor.add_custom_tickers(['IT', 'ON', 'SO', 'BE', 'UP', 'OR', 'LOW', 'REAL', 'PLAY'])
+                self.assertEqual(extractor.extract_tickers(text), set())
+                self.assertEqual(extractor.extract_tickers("Bought $so and IT, play NVDA"), {'SO', 'IT', 'NVDA'})
+    
     def test_remove_tickers(self):
         """Test removing tickers from the valid set."""
         # Add a ticker first
@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import unittest
+from stock_extractor import StockExtractor
+from ticker_list import (DEFAULT_TICKER_FILE, DEFAULT_WORD_FILE, load_ticker_list, parse_sec_listing,
+                         parse_source, parse_symbol_directory, write_ticker_list)
+
+
+NASDAQ_LISTED = """Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares
+AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N
+QQQ|Invesco QQQ Trust, Series 1|G|N|N|100|Y|N
+ZXZZT|NASDAQ TEST STOCK|G|Y|N|100|N|N
+File Creation Time: 0101202500:00|||||||"""
+
+OTHER_LISTED = """ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol
+BRK.B|Berkshire Hathaway Inc. Class B|N|BRK.B|N|100|N|BRK.B
+SPY|SPDR S&P 500 ETF Trust|P|SPY|Y|100|N|SPY
+F|Ford Motor Company Common Stock|N|F|N|100|N|F
+File Creation Time: 0101202500:00|||||||"""
+
+SEC_LISTING = """{"fields": ["cik", "name", "ticker", "exchange"], "data": [
+[320193, "Apple Inc.", "AAPL", "Nasdaq"],
+[884394, "SPDR S&P 500 ETF Trust", "SPY", "NYSE"],
+[1067983, "Berkshire Hathaway Inc", "BRK-B", "NYSE"],
+[1000045, "Some Pink Sheet Co", "PNKS", "OTC"],
+[1000046, "Unlisted Fund", "UNLF", null]]}"""
+
+
+class TestTickerList(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "tickers.txt")
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_parse_symbol_directories(self):
+        """Test that listings and ETFs are kept while test issues and suffixes are dropped."""
+        self.assertEqual(parse_symbol_directory(NASDAQ_LISTED), {'AAPL', 'QQQ'})
+        self.assertEqual(parse_symbol_directory(OTHER_LISTED), {'SPY', 'F'})
+    
+    def test_parse_sec_listing_and_symbol_lists(self):
+        """Test that SEC listings keep exchange listings only and every format is detected."""
+        self.assertEqual(parse_sec_listing(SEC_LISTING), {'AAPL', 'SPY'})
+        self.assertEqual(parse_source(SEC_LISTING), {'AAPL', 'SPY'})
+        self.assertEqual(parse_source(NASDAQ_LISTED), {'AAPL', 'QQQ'})
+        self.assertEqual(parse_source("# ETFs\nvoo\nQQQ\n\nBRK.B\n"), {'VOO', 'QQQ'})
+    
+    def test_write_and_load_round_trip(self):
+        """Test that a written ticker file loads back as the same set, shared between calls."""
+        write_ticker_list({'TSLA', 'AAPL', 'GME'}, self.path, source="test")
+        
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "# test\nAAPL\nGME\nTSLA\n")
+        
+        tickers = load_ticker_list(self.path)
+        self.assertEqual(tickers, frozenset({'AAPL', 'GME', 'TSLA'}))
+        self.assertIs(load_ticker_list(self.path), tickers)
+    
+    def test_missing_file_raises(self):
+        """Test that a missing ticker file is reported."""
+        with self.assertRaises(Exception) as context:
+            load_ticker_list(os.path.join(self.temp_dir, "missing.txt"))
+        self.assertIn("Failed to load ticker list", str(context.exception))
+    
+    def test_bundled_file_is_sorted(self):
+        """Test that the bundled file is sorted and covers the classic WSB tickers."""
+        with open(DEFAULT_TICKER_FILE) as f:
+            symbols = [line for line in f.read().split('\n') if line and not line.startswith('#')]
+        self.assertEqual(symbols, sorted(set(symbols)))
+        self.assertTrue({'AAPL', 'GME', 'SPY', 'TSLA'} <= set(symbols))
+    
+    def test_bundled_file_covers_listed_universe(self):
+        """Test that the bundled file holds the full listed universe, ETFs included."""
+        tickers = load_ticker_list(DEFAULT_TICKER_FILE)
+        self.assertGreaterEqual(len(tickers), 10000)
+        self.assertTrue({'SPY', 'QQQ', 'VOO', 'IWM', 'TQQQ', 'SOXL', 'ARKK', 'PLTR', 'F'} <= tickers)
+        
+        words = load_ticker_list(DEFAULT_WORD_FILE)
+        self.assertTrue({'IT', 'ON', 'SO', 'PLAY', 'REAL'} <= words)
+        self.assertFalse({'AAPL', 'TSLA', 'NVDA', 'GME', 'PLTR'} & words)
+    
+    def test_extractor_uses_ticker_file(self):
+        """Test that the extractor reads its universe from the given file."""
+        write_ticker_list({'AAPL', 'ZZZZ'}, self.path)
+        extractor = StockExtractor(ticker_file=self.path)
+        
+        self.assertEqual(extractor.extract_tickers("ZZZZ AAPL TSLA"), {'ZZZZ', 'AAPL'})
+        
+        # Instances get their own copy of the shared universe
+        extractor.add_custom_tickers(['TSLA'])
+        self.assertNotIn('TSLA', load_ticker_list(self.path))
+    
+    def test_auto_engine_uses_token_hash_for_large_universes(self):
+        """Test that large universes skip compiling a trie."""
+        self.assertEqual(StockExtractor().extract_tickers("AAPL"), {'AAPL'})
+        self.assertEqual(StockExtractor()._get_matcher().name, "token")
+        
+        write_ticker_list({'AAPL'}, self.path)
+        extractor = StockExtractor(ticker_file=self.path)
+        extractor.extract_tickers("AAPL")
+        self.assertEqual(extractor._matcher.name, "trie")
+        
+        extractor.add_custom_tickers([f"ZZ{letter}" for letter in "ABCDEFGHIJ"])
+        extractor.AUTO_TRIE_MAX_TICKERS = 10
+        self.assertEqual(extractor.extract_tickers("AAPL"), {'AAPL'})
+        self.assertEqual(extractor._matcher.name, "token")
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import unittest
+from stock_extractor import StockExtractor
+from ticker_matcher import TokenHashMatcher, TrieMatcher, build_matcher, ticker_universe
+
+
+class TestTickerMatcher(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.texts = [
+            "I'm bullish on AAPL and TSLA for the long term",
+            "Bought $GME at $150 and $AMC at $20",
+            "Looking at aapl, Tsla, and gme today",
+            "I CAN see THE stock going UP but NOT down",
+            "GOOG or GOOGL? (MSFT) [NVDA], SPY/QQQ. AAPL123 123AAPL XAAPL AAPLX",
+            "AAPL.TSLA AAPL!\nGME;\tAMC: straße ﬁne Straße 🚀 TSLA🚀 🚀 NVDA",
+            "so it is going up on monday, or be real low. $so, IT and (ON) but It Real",
+            "",
+        ]
+    
+    def test_engines_match_regex_path(self):
+        """Test that every engine returns exactly what the regex path returns."""
+        reference = StockExtractor(matcher="regex")
+        for engine in ("trie", "token"):
+            extractor = StockExtractor(matcher=engine)
+            for text in self.texts:
+                with self.subTest(engine=engine, text=text):
+                    self.assertEqual(extractor.extract_tickers(text), reference.extract_tickers(text))
+    
+    def test_universe_excludes_unmatchable_symbols(self):
+        """Test that the universe drops false positives, single letters and odd shapes."""
+        universe = ticker_universe({'AAPL', 'C', 'DD', 'BRK.B', 'TOOLONGX'}, {'DD'})
+        self.assertEqual(universe, {'AAPL'})
+    
+    def test_matchers_share_results(self):
+        """Test both matcher classes directly on overlapping prefixes."""
+        universe = {'GOOG', 'GOOGL', 'GM', 'GME'}
+        for matcher in (TrieMatcher(universe), TokenHashMatcher(universe)):
+            with self.subTest(matcher=matcher.name):
+                self.assertEqual(matcher.find("goog GOOGL gm, $GME GMEX"), {'GOOG', 'GOOGL', 'GM', 'GME'})
+        self.assertEqual(TrieMatcher(set()).find("AAPL"), set())
+    
+    def test_ambiguous_tickers_need_cashtag_or_upper_case(self):
+        """Test that tickers spelled like words only match as cashtags or in upper case."""
+        universe = {'SO', 'IT', 'AAPL'}
+        for matcher in (TrieMatcher(universe, {'SO', 'IT', 'THE'}), TokenHashMatcher(universe, {'SO', 'IT', 'THE'})):
+            with self.subTest(matcher=matcher.name):
+                self.assertEqual(matcher.ambiguous, {'SO', 'IT'})
+                self.assertEqual(matcher.find("so it goes, aapl"), {'AAPL'})
+                self.assertEqual(matcher.find("It is $so"), {'SO'})
+                self.assertEqual(matcher.find("so IT goes"), {'IT'})
+                self.assertEqual(matcher.find("So (it)? $It"), {'IT'})
+    
+    def test_custom_tickers_rebuild_matcher(self):
+        """Test that changing the universe recompiles the matcher."""
+        extractor = StockExtractor()
+        self.assertEqual(extractor.extract_tickers("ZZZZ and AAPL"), {'AAPL'})
+        
+        extractor.add_custom_tickers(['ZZZZ'])
+        self.assertEqual(extractor.extract_tickers("ZZZZ and AAPL"), {'ZZZZ', 'AAPL'})
+        self.assertEqual(extractor.universe_version, 1)
+        
+        extractor.remove_tickers(['AAPL'])
+        self.assertEqual(extractor.extract_tickers("ZZZZ and AAPL"), {'ZZZZ'})
+    
+    def test_unknown_engine(self):
+        """Test that an unknown engine name is rejected."""
+        with self.assertRaises(ValueError):
+            build_matcher("automaton", {'AAPL'})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
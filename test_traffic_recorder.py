@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock
+import requests
+from reddit_scraper import RedditScraper
+from traffic_recorder import TrafficRecorder, attach_replay, load_archive
+
+
+def make_response(body, headers=None, status=200):
+    """Build a requests.Response carrying a JSON body."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.encoding = 'utf-8'
+    response._content = json.dumps(body).encode('utf-8')
+    return response
+
+
+class TestTrafficRecorder(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive = os.path.join(self.temp_dir, "fixtures", "wsb.jsonl.gz")
+        self.listing = {
+            "data": {
+                "after": None,
+                "children": [{
+                    "kind": "t3",
+                    "data": {
+                        "id": "abc",
+                        "title": "TSLA to the moon",
+                        "selftext": "",
+                        "score": 10,
+                        "num_comments": 0,
+                        "created_utc": 1700000000,
+                        "url": "https://reddit.com/abc",
+                        "author": "someone",
+                        "subreddit": "wallstreetbets"
+                    }
+                }]
+            }
+        }
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def record_listing(self, latency=0.0):
+        """Record one hot listing fetch through a mocked network session."""
+        scraper = RedditScraper()
+        scraper.rate_limiter.default_delay = 0.0
+        scraper.rate_limiter.current_delay = 0.0
+        
+        def slow_get(url, **kwargs):
+            time.sleep(latency)
+            return make_response(self.listing, {'ETag': '"v1"', 'X-Ratelimit-Remaining': '99',
+                                                'Server': 'snooserv'})
+        
+        scraper.session.get = Mock(side_effect=slow_get)
+        recorder = TrafficRecorder()
+        recorder.attach(scraper)
+        posts = scraper.get_hot_posts("wallstreetbets", limit=1)
+        recorder.save(self.archive)
+        return posts, recorder
+    
+    def test_record_and_replay_round_trip(self):
+        """Test that replayed traffic yields the same parsed posts without the network."""
+        recorded_posts, recorder = self.record_listing()
+        
+        records = load_archive(self.archive)
+        self.assertEqual(len(records), 1)
+        self.assertIn("hot.json", records[0]["url"])
+        self.assertEqual(records[0]["headers"], {'ETag': '"v1"', 'X-Ratelimit-Remaining': '99'})
+        
+        replay = attach_replay(RedditScraper(), self.archive, latency_scale=0)
+        replayed_posts = replay.get_hot_posts("wallstreetbets", limit=1)
+        
+        self.assertEqual(replayed_posts, recorded_posts)
+        self.assertEqual(replay.session.replayed, 1)
+    
+    def test_replay_latency_modes(self):
+        """Test that replay honours recorded, scaled and fixed latency."""
+        self.record_listing(latency=0.05)
+        
+        start = time.perf_counter()
+        attach_replay(RedditScraper(), self.archive).get_hot_posts("wallstreetbets", limit=1)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.04)
+        
+        start = time.perf_counter()
+        attach_replay(RedditScraper(), self.archive, latency_scale=0).get_hot_posts("wallstreetbets", limit=1)
+        self.assertLess(time.perf_counter() - start, 0.04)
+        
+        start = time.perf_counter()
+        attach_replay(RedditScraper(), self.archive, fixed_latency=0.1).get_hot_posts("wallstreetbets", limit=1)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+    
+    def test_unrecorded_url_fails_like_network_error(self):
+        """Test that requesting traffic missing from the archive raises."""
+        self.record_listing()
+        replay = attach_replay(RedditScraper(), self.archive, latency_scale=0)
+        
+        with self.assertRaises(Exception) as context:
+            replay.get_hot_posts("stocks", limit=1)
+        self.assertIn("Failed to fetch posts from r/stocks", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,113 @@
+import random
+import string
+import unittest
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, NEGATE, SentimentIntensityAnalyzer
+from vader_kernel import VaderKernel
+
+
+class TestVaderKernel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Load the VADER lexicons once for all tests."""
+        cls.analyzer = SentimentIntensityAnalyzer()
+        cls.kernel = VaderKernel(cls.analyzer)
+    
+    def assertMatchesVader(self, text):
+        scores = self.analyzer.polarity_scores(text)
+        self.assertEqual(self.kernel.polarity_scores(text),
+                         (scores['compound'], scores['pos'], scores['neg'], scores['neu']), repr(text))
+    
+    def test_rule_examples_match_vader(self):
+        """Test the texts that exercise each VADER rule score identically."""
+        texts = [
+            "", "   ", "lol", "https://i.redd.it/abc123.png",
+            "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+            "VADER is not smart, handsome, nor funny.",
+            "At least it isn't a horrible book.",
+            "The book was only kind of good.",
+            "The plot was good, but the characters are uncompelling and the dialog is not great.",
+            "good but good but bad good",
+            "Today only kinda sux! But I'll get by, lol",
+            "Make sure you :) or :D today!",
+            "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+            "TSLA🚀🚀🚀 to the moon",
+            "Not bad at all",
+            "no good, no problem, no or nor bad",
+            "never so happy, without doubt great, this is the shit, bad ass calls",
+            "least good, at least good, very least good",
+            "yeah right this is kind of the bomb???",
+            "sort of great, just enough love, kiss of death",
+            "GREAT great !!!!!!! ????",
+        ]
+        for text in texts:
+            self.assertMatchesVader(text)
+    
+    def test_random_texts_match_vader(self):
+        """Test randomly assembled texts built from rule-triggering words score identically."""
+        rng = random.Random(7)
+        lexicon = sorted(self.analyzer.lexicon)
+        emojis = sorted(self.kernel.emojis)
+        rule_words = (["but", "kind", "of", "no", "or", "nor", "never", "so", "this", "without", "doubt",
+                       "least", "at", "very", "the", "shit", "bad", "ass", "sort", "!!!", "??", ":)"]
+                      + sorted(BOOSTER_DICT) + NEGATE)
+        
+        for _ in range(3000):
+            words = []
+            for _ in range(rng.randint(0, 20)):
+                roll = rng.random()
+                if roll < 0.4:
+                    word = rng.choice(rule_words)
+                elif roll < 0.75:
+                    word = rng.choice(lexicon)
+                elif roll < 0.8:
+                    word = rng.choice(emojis)
+                else:
+                    word = ''.join(rng.choice(string.ascii_letters) for _ in range(rng.randint(1, 6)))
+                if rng.random() < 0.15:
+                    word = word.upper()
+                if rng.random() < 0.1:
+                    word += rng.choice(",.!?")
+                words.append(word)
+            self.assertMatchesVader(rng.choice([" ", "  ", "\n", ""]).join(words))
+
+    
+    def test_lexicon_free_fast_path_matches_vader(self):
+        """Test that texts skipping the rule pipeline score exactly as VADER scores them."""
+        kernel = VaderKernel(self.analyzer)
+        texts = ["https://i.redd.it/abc123.png", "AAPL TSLA GME", "...", "?!?!", "very", "barely",
+                 "not ... never", "Σ.", "  \n  ", "bought 10 calls @ $420.69"]
+        for text in texts:
+            scores = self.analyzer.polarity_scores(text)
+            self.assertEqual(kernel.lexicon_free_scores(text),
+                             (scores['compound'], scores['pos'], scores['neg'], scores['neu']), repr(text))
+        
+        # A lexicon word, even behind punctuation, or an emoji needs the full pipeline
+        for text in ["(great)", "GOOD!!!", ":)", "to the moon 🚀"]:
+            self.assertIsNone(kernel.lexicon_free_scores(text), repr(text))
+        
+        stats = kernel.get_stats()
+        self.assertEqual(stats["fast_path_checks"], len(texts) + 4)
+        self.assertEqual(stats["fast_path_hits"], len(texts))
+    
+    def test_fast_path_never_disagrees_with_vader(self):
+        """Test random texts: whenever the fast path answers, VADER gives the same scores."""
+        rng = random.Random(11)
+        lexicon = sorted(self.analyzer.lexicon)
+        filler = sorted(BOOSTER_DICT) + NEGATE + ["AAPL", "$TSLA", "10", "--", "...", "http://x.co"]
+        
+        hits = 0
+        for _ in range(3000):
+            words = [rng.choice(filler) if rng.random() < 0.97 else rng.choice(lexicon)
+                     for _ in range(rng.randint(0, 12))]
+            words = [word.upper() if rng.random() < 0.2 else word for word in words]
+            text = " ".join(words)
+            fast = self.kernel.lexicon_free_scores(text)
+            if fast is not None:
+                hits += 1
+                self.assertMatchesVader(text)
+                self.assertEqual(fast, self.kernel.polarity_scores(text))
+        self.assertGreater(hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+from watermark_store import WatermarkStore
+
+
+class TestWatermarkStore(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "watermarks.json")
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_watermarks_persist_across_instances(self):
+        """Test that ingested fullnames survive a process restart."""
+        store = WatermarkStore(self.path)
+        store.add_seen("wallstreetbets/new", ["t3_b", "t3_a"])
+        
+        reopened = WatermarkStore(self.path)
+        self.assertEqual(reopened.get_seen("wallstreetbets/new"), {"t3_a", "t3_b"})
+        self.assertEqual(reopened.get_seen("stocks/new"), set())
+    
+    def test_keeps_most_recent_ids_up_to_cap(self):
+        """Test that only the newest fullnames are kept per feed."""
+        store = WatermarkStore(self.path, max_ids_per_key=3)
+        store.add_seen("wsb/new", ["t3_2", "t3_1"])
+        store.add_seen("wsb/new", ["t3_4", "t3_3", "t3_2"])
+        
+        self.assertEqual(store.get_seen("wsb/new"), {"t3_4", "t3_3", "t3_2"})
+        
+        store.clear("wsb/new")
+        self.assertEqual(store.get_seen("wsb/new"), set())
+    
+    def test_corrupt_file_starts_empty(self):
+        """Test that a corrupted watermark file is ignored."""
+        with open(self.path, 'w') as f:
+            f.write("not json")
+        
+        self.assertEqual(WatermarkStore(self.path).get_seen("wsb/new"), set())
+
+
+if __name__ == '__main__':
+    # Run the tests
+    unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import tempfile
+import urllib.request
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Set
+
+
+# Sorted, one symbol per line; lines starting with '#' are comments
+DEFAULT_TICKER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tickers.txt")
+
+# Common English words, one per line; tickers spelled like one are only
+# reported as cashtags or when written in upper case (see ticker_matcher.py)
+DEFAULT_WORD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "english_words.txt")
+
+# Exchanges of an SEC listing kept in the universe (OTC quotes are dropped)
+LISTED_EXCHANGES = frozenset({'NASDAQ', 'NYSE', 'CBOE'})
+
+# NASDAQ Trader symbol directory: every NASDAQ listing, and NYSE/AMEX/ARCA/BATS listings
+NASDAQ_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt"
+OTHER_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt"
+
+# SEC ticker/exchange listing of every reporting company (includes OTC quotes)
+SEC_LISTING_URL = "https://www.sec.gov/files/company_tickers_exchange.json"
+
+
+@lru_cache(maxsize=8)
+def load_ticker_list(path: str = DEFAULT_TICKER_FILE) -> FrozenSet[str]:
+    """
+    Load a ticker universe file.
+    
+    The parsed set is cached per path, so every StockExtractor in a process
+    shares one copy and only the first construction reads the file.
+    
+    Args:
+        path: Ticker file (sorted, one symbol per line)
+    
+    Returns:
+        Frozen set of uppercase ticker symbols
+    
+    Raises:
+        Exception: If the file cannot be read
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+    except OSError as e:
+        raise Exception(f"Failed to load ticker list {path}: {str(e)}")
+    
+    return frozenset(line.strip().upper() for line in lines
+                     if line.strip() and not line.startswith('#'))
+
+
+def parse_symbol_directory(text: str) -> Set[str]:
+    """
+    Parse a NASDAQ Trader symbol directory file (nasdaqlisted.txt or otherlisted.txt).
+    
+    Test issues are skipped, and so are symbols with share-class suffixes
+    (e.g. "BRK.B"), which the extractor could never match anyway.
+    
+    Args:
+        text: Pipe-delimited file content with a header row
+    
+    Returns:
+        Set of ticker symbols (ETFs included)
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return set()
+    
+    header = lines[0].split('|')
+    symbol_column = header.index('Symbol') if 'Symbol' in header else header.index('ACT Symbol')
+    test_column = header.index('Test Issue') if 'Test Issue' in header else None
+    
+    symbols = set()
+    for line in lines[1:]:
+        if line.startswith('File Creation Time'):
+            continue
+        fields = line.split('|')
+        if len(fields) <= symbol_column:
+            continue
+        if test_column is not None and len(fields) > test_column and fields[test_column] == 'Y':
+            continue
+        symbol = fields[symbol_column].strip().upper()
+        if symbol.isalpha() and symbol.isascii():
+            symbols.add(symbol)
+    return symbols
+
+
+def parse_sec_listing(text: str) -> Set[str]:
+    """
+    Parse the SEC company_tickers_exchange.json listing.
+    
+    Only symbols listed on an exchange in LISTED_EXCHANGES are kept.
+    
+    Args:
+        text: JSON document with "fields" and "data" rows
+    
+    Returns:
+        Set of ticker symbols
+    """
+    document = json.loads(text)
+    fields = document['fields']
+    ticker_column, exchange_column = fields.index('ticker'), fields.index('exchange')
+    
+    symbols = set()
+    for row in document['data']:
+        exchange = row[exchange_column]
+        if not exchange or exchange.upper() not in LISTED_EXCHANGES:
+            continue
+        symbol = str(row[ticker_column]).strip().upper()
+        if symbol.isalpha() and symbol.isascii():
+            symbols.add(symbol)
+    return symbols
+
+
+def parse_symbol_list(text: str) -> Set[str]:
+    """
+    Parse a plain symbol list, one symbol per line ('#' lines are comments).
+    
+    Args:
+        text: File content
+    
+    Returns:
+        Set of ticker symbols
+    """
+    symbols = set()
+    for line in text.splitlines():
+        symbol = line.strip().upper()
+        if symbol and not symbol.startswith('#') and symbol.isalpha() and symbol.isascii():
+            symbols.add(symbol)
+    return symbols
+
+
+def parse_source(text: str) -> Set[str]:
+    """
+    Parse a symbol source in any supported format.
+    
+    Args:
+        text: An SEC listing (JSON), a NASDAQ Trader directory (pipe-delimited)
+            or a plain symbol list
+    
+    Returns:
+        Set of ticker symbols
+    """
+    stripped = text.lstrip()
+    if stripped.startswith('{'):
+        return parse_sec_listing(stripped)
+    first_line = stripped.split('\n', 1)[0]
+    if '|' in first_line:
+        return parse_symbol_directory(text)
+    return parse_symbol_list(text)
+
+
+def write_ticker_list(symbols: Iterable[str], path: str, source: str = "") -> None:
+    """Write symbols as a sorted ticker file, atomically."""
+    lines = [f"# {source}"] if source else []
+    lines.extend(sorted(set(symbols)))
+    
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        # Bundled data, readable by everyone (mkstemp creates files owner-only)
+        os.chmod(temp_path, 0o644)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _read_source(source: str) -> str:
+    if source.startswith(('http://', 'https://')):
+        # sec.gov rejects requests without a descriptive User-Agent
+        request = urllib.request.Request(source, headers={'User-Agent': 'reddit-stock-sentiment ticker_list.py'})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.read().decode('utf-8', errors='replace')
+    with open(source, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild tickers.txt from exchange symbol listings")
+    parser.add_argument("sources", nargs="*", default=[NASDAQ_LISTED_URL, OTHER_LISTED_URL],
+                        help="Local files or URLs of nasdaqlisted.txt / otherlisted.txt, "
+                             "company_tickers_exchange.json or plain symbol lists")
+    parser.add_argument("-o", "--output", default=DEFAULT_TICKER_FILE, help="Ticker file to write")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Drop symbols of the existing file instead of merging them in")
+    args = parser.parse_args()
+    
+    symbols: Set[str] = set()
+    for source in args.sources:
+        symbols |= parse_source(_read_source(source))
+    if not args.fresh and os.path.exists(args.output):
+        symbols |= load_ticker_list(args.output)
+    
+    names: List[str] = [os.path.basename(source) for source in args.sources]
+    write_ticker_list(symbols, args.output, source=f"Built from {', '.join(names)}")
+    print(f"Wrote {len(symbols)} symbols to {args.output}")
\ No newline at end of file
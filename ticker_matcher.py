@@ -0,0 +1,164 @@
+import re
+from typing import AbstractSet, Dict, Iterable, Set
+
+
+# Characters allowed directly before and after a ticker (mirrors StockExtractor.ticker_pattern)
+BOUNDARY_BEFORE = r'\s$\(\)\[\],/'
+BOUNDARY_AFTER = r'\s$\(\)\[\],/.!?;:'
+
+_TICKER_SHAPE = re.compile(r'[A-Z]{2,6}')
+
+# Tokens of the original text, with the cashtag "$" captured when present
+_ORIGINAL_TOKEN = re.compile(rf'(?:(\$)|[{BOUNDARY_BEFORE}])([A-Za-z]{{2,6}})(?![^{BOUNDARY_AFTER}])')
+
+
+def ticker_universe(valid_tickers: Iterable[str], false_positives: Iterable[str]) -> Set[str]:
+    """
+    Reduce the ticker lists to the symbols the legacy regex path can ever return.
+    
+    Args:
+        valid_tickers: Known ticker symbols
+        false_positives: Words never reported as tickers
+    
+    Returns:
+        Set of 2-6 letter uppercase symbols that are valid and not false positives
+    """
+    excluded = set(false_positives)
+    return {ticker for ticker in valid_tickers
+            if _TICKER_SHAPE.fullmatch(ticker) and ticker not in excluded}
+
+
+def confirm_ambiguous(found: Set[str], text: str, ambiguous: AbstractSet[str]) -> Set[str]:
+    """
+    Drop tickers spelled like English words unless the text really means the ticker.
+    
+    Matching runs on upper-cased text, so "so", "it" or "play" would all be
+    tickers. A ticker in ambiguous is kept only if some mention of it in the
+    original text is a cashtag ("$so") or written in upper case ("SO").
+    
+    Args:
+        found: Tickers matched in the upper-cased text
+        text: Original text
+        ambiguous: Tickers that are also English words
+    
+    Returns:
+        The found tickers that are unambiguous or confirmed
+    """
+    suspects = found & ambiguous
+    if not suspects:
+        return found
+    confirmed = {token.upper() for cashtag, token in _ORIGINAL_TOKEN.findall(' ' + text)
+                 if cashtag or token.isupper()}
+    return found - (suspects - confirmed)
+
+
+def _scan_view(text: str) -> str:
+    """
+    Prepare text for scanning: upper-cased, with a leading space standing in for "^".
+    
+    Starting every pattern with the boundary character class lets the regex
+    engine skip ahead with its fast character-set search. Matching the original
+    text case-insensitively instead measured about three times slower in CPython,
+    and upper-casing first keeps results identical for non-ASCII text too.
+    """
+    return ' ' + text.upper()
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a prefix trie, so each scan position is a single walk."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        optional = '' in node
+        if not branches:
+            return ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        body = branches[0] if len(branches) == 1 and len(branches[0]) == 1 else f"(?:{'|'.join(branches)})"
+        return f"{body}?" if optional else body
+    
+    return render(trie)
+
+
+class TokenHashMatcher:
+    name = "token"
+    
+    def __init__(self, universe: Iterable[str], ambiguous: Iterable[str] = ()):
+        """
+        Initialize a matcher that hashes every boundary-delimited 2-6 letter token.
+        
+        Args:
+            universe: Ticker symbols to report (see ticker_universe)
+            ambiguous: Words only reported as cashtags or in upper case (see confirm_ambiguous)
+        """
+        self.universe = frozenset(universe)
+        self.ambiguous = frozenset(ambiguous) & self.universe
+        self._pattern = re.compile(rf'[{BOUNDARY_BEFORE}]([A-Z]{{2,6}})(?![^{BOUNDARY_AFTER}])')
+    
+    def find(self, text: str) -> Set[str]:
+        """Return the tickers mentioned in text."""
+        universe = self.universe
+        found = {token for token in self._pattern.findall(_scan_view(text)) if token in universe}
+        return confirm_ambiguous(found, text, self.ambiguous) if self.ambiguous else found
+
+
+class TrieMatcher:
+    name = "trie"
+    
+    def __init__(self, universe: Iterable[str], ambiguous: Iterable[str] = ()):
+        """
+        Initialize a matcher with the ticker universe compiled into one automaton.
+        
+        The universe becomes a trie-shaped regex alternation, so the scan only
+        yields actual tickers instead of every capitalised word.
+        
+        Args:
+            universe: Ticker symbols to report (see ticker_universe)
+            ambiguous: Words only reported as cashtags or in upper case (see confirm_ambiguous)
+        """
+        self.universe = frozenset(universe)
+        self.ambiguous = frozenset(ambiguous) & self.universe
+        if self.universe:
+            trie = _trie_pattern(sorted(self.universe))
+            self._pattern = re.compile(rf'[{BOUNDARY_BEFORE}]({trie})(?![^{BOUNDARY_AFTER}])')
+        else:
+            self._pattern = None
+    
+    def find(self, text: str) -> Set[str]:
+        """Return the tickers mentioned in text."""
+        if self._pattern is None:
+            return set()
+        found = set(self._pattern.findall(_scan_view(text)))
+        return confirm_ambiguous(found, text, self.ambiguous) if self.ambiguous else found
+
+
+MATCHERS = {
+    TokenHashMatcher.name: TokenHashMatcher,
+    TrieMatcher.name: TrieMatcher,
+}
+
+
+def build_matcher(engine: str, universe: Iterable[str], ambiguous: Iterable[str] = ()):
+    """
+    Create a ticker matcher by engine name.
+    
+    Args:
+        engine: "trie" or "token"
+        universe: Ticker symbols to report
+        ambiguous: Words only reported as cashtags or in upper case
+    
+    Returns:
+        Matcher with a find(text) -> Set[str] method
+    
+    Raises:
+        ValueError: If the engine name is unknown
+    """
+    if engine not in MATCHERS:
+        raise ValueError(f"Unknown ticker matcher engine: {engine}")
+    return MATCHERS[engine](universe, ambiguous)
\ No newline at end of file
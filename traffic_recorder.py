@@ -0,0 +1,221 @@
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional
+import requests
+from reddit_scraper import RedditScraper
+
+
+# Response headers worth keeping: caching validators and rate-limit budget
+RECORDED_HEADERS = (
+    'Content-Type', 'ETag', 'Last-Modified', 'Retry-After',
+    'X-Ratelimit-Remaining', 'X-Ratelimit-Reset', 'X-Ratelimit-Used'
+)
+
+
+def load_archive(path: str) -> List[Dict[str, Any]]:
+    """
+    Load recorded exchanges from a gzip-compressed JSON-lines archive.
+    
+    Args:
+        path: Archive file written by TrafficRecorder.save
+    
+    Returns:
+        List of records with url, status, headers, latency and body
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TrafficRecorder:
+    def __init__(self):
+        """Initialize an empty recorder of Reddit HTTP exchanges."""
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+    
+    def attach(self, scraper: RedditScraper) -> RedditScraper:
+        """
+        Record every HTTP exchange made by a scraper's _make_request.
+        
+        The session's get() is wrapped, so latency covers only the network
+        round trip and excludes rate-limiter waits. Disable the scraper's
+        response cache while recording, otherwise cache hits are not captured.
+        
+        Args:
+            scraper: Scraper to record
+        
+        Returns:
+            The same scraper, for chaining
+        """
+        original_get = scraper.session.get
+        
+        def recording_get(url, **kwargs):
+            start = time.perf_counter()
+            response = original_get(url, **kwargs)
+            latency = time.perf_counter() - start
+            with self._lock:
+                self.records.append({
+                    "url": url,
+                    "status": response.status_code,
+                    "headers": {name: response.headers[name] for name in RECORDED_HEADERS
+                                if name in response.headers},
+                    "latency": latency,
+                    "body": response.text
+                })
+            return response
+        
+        scraper.session.get = recording_get
+        return scraper
+    
+    def save(self, path: str) -> None:
+        """Write the recorded exchanges to a gzip-compressed JSON-lines archive atomically."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                with self._lock:
+                    for record in self.records:
+                        f.write(json.dumps(record) + "\n")
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class ReplaySession:
+    def __init__(self, records: List[Dict[str, Any]], latency_scale: float = 1.0,
+                 fixed_latency: Optional[float] = None):
+        """
+        Initialize a stand-in for requests.Session that serves recorded responses.
+        
+        Repeated requests for a URL are served in recorded order; once exhausted,
+        the last recording for that URL keeps being served.
+        
+        Args:
+            records: Records loaded with load_archive
+            latency_scale: Multiplier applied to the recorded latency (0 = no delay)
+            fixed_latency: If set, every response is delayed by this many seconds instead
+        """
+        self.latency_scale = latency_scale
+        self.fixed_latency = fixed_latency
+        self.headers: Dict[str, str] = {}
+        self.replayed = 0
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for record in records:
+            self._responses[record["url"]].append(record)
+    
+    def mount(self, prefix: str, adapter: Any) -> None:
+        """Accept adapters like requests.Session does (no-op)."""
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Serve the next recorded response for url, delayed like the original."""
+        with self._lock:
+            queue = self._responses.get(url)
+            if not queue:
+                raise requests.exceptions.ConnectionError(f"No recorded response for {url}")
+            record = queue.popleft() if len(queue) > 1 else queue[0]
+            self.replayed += 1
+        
+        delay = self.fixed_latency if self.fixed_latency is not None else record["latency"] * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        
+        response = requests.Response()
+        response.url = url
+        response.status_code = record["status"]
+        response.headers.update(record["headers"])
+        response.encoding = 'utf-8'
+        response._content = record["body"].encode('utf-8')
+        return response
+
+
+def attach_replay(scraper: RedditScraper, archive_path: str, latency_scale: float = 1.0,
+                  fixed_latency: Optional[float] = None) -> RedditScraper:
+    """
+    Make a scraper serve recorded traffic instead of contacting Reddit.
+    
+    The response cache and rate-limit pacing are turned off so replays are
+    deterministic and only the configured latency is paid.
+    
+    Args:
+        scraper: Scraper to redirect
+        archive_path: Archive written by TrafficRecorder.save
+        latency_scale: Multiplier applied to the recorded latency (0 = no delay)
+        fixed_latency: If set, every response is delayed by this many seconds instead
+    
+    Returns:
+        The same scraper, for chaining
+    """
+    scraper.session = ReplaySession(load_archive(archive_path), latency_scale, fixed_latency)
+    scraper.response_cache = None
+    scraper.rate_limiter.default_delay = 0.0
+    scraper.rate_limiter.min_delay = 0.0
+    scraper.rate_limiter.current_delay = 0.0
+    return scraper
+
+
+def _benchmark_controller(directory: str, subreddits: Optional[List[str]]):
+    """Build a DataController whose caches, post store and cache file all live in directory."""
+    from data_controller import DataController
+    
+    controller = DataController(response_cache_dir=os.path.join(directory, "responses"),
+                                subreddits=subreddits,
+                                score_cache_path=os.path.join(directory, "scores.sqlite"),
+                                store_path=os.path.join(directory, "store.sqlite"))
+    controller.cache_file = os.path.join(directory, "data_cache.json")
+    return controller
+
+
+def _benchmark(args: argparse.Namespace) -> None:
+    """Run DataController.process_reddit_data end to end against a recording."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.command == "record":
+            controller = _benchmark_controller(temp_dir, args.subreddits)
+            recorder = TrafficRecorder()
+            controller.reddit_scraper.response_cache = None
+            recorder.attach(controller.reddit_scraper)
+            controller.process_reddit_data(args.posts, args.stocks)
+            recorder.save(args.archive)
+            print(f"Recorded {len(recorder.records)} responses to {args.archive}")
+            return
+        
+        # Every run gets a new controller with empty score cache, post store and
+        # extraction memo, so each timing is a cold replay rather than a cache hit
+        timings = []
+        for run in range(args.runs):
+            controller = _benchmark_controller(os.path.join(temp_dir, f"run{run}"), args.subreddits)
+            attach_replay(controller.reddit_scraper, args.archive, args.latency_scale, args.fixed_latency)
+            start = time.perf_counter()
+            result = controller.process_reddit_data(args.posts, args.stocks)
+            timings.append(time.perf_counter() - start)
+            controller.post_store.close()
+            controller.sentiment_analyzer.score_cache.close()
+        
+        print(f"{len(result)} stocks, {args.runs} runs: "
+              f"best {min(timings):.3f}s, mean {sum(timings) / len(timings):.3f}s")
+        kernel_stats = controller.sentiment_analyzer.get_kernel_stats()
+        print(f"{kernel_stats['fast_path_hits']} of {kernel_stats['fast_path_checks']} texts per run "
+              f"({kernel_stats['fast_path_rate']:.1%}) had no lexicon word and skipped VADER's rules")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record Reddit traffic or replay it to benchmark the pipeline")
+    parser.add_argument("command", choices=["record", "replay"])
+    parser.add_argument("archive", help="Path of the .jsonl.gz fixture archive")
+    parser.add_argument("--posts", type=int, default=200, help="post_limit passed to the pipeline")
+    parser.add_argument("--stocks", type=int, default=20, help="top_stocks_limit passed to the pipeline")
+    parser.add_argument("--subreddits", nargs="+", default=None, help="Subreddits to ingest")
+    parser.add_argument("--runs", type=int, default=3, help="Replay runs to time")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier for recorded latency (0 disables delays)")
+    parser.add_argument("--fixed-latency", type=float, default=None,
+                        help="Serve every response after this many seconds instead")
+    _benchmark(parser.parse_args())
\ No newline at end of file
@@ -0,0 +1,323 @@
+import math
+import string
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from vaderSentiment.vaderSentiment import (BOOSTER_DICT, C_INCR, N_SCALAR, NEGATE, SPECIAL_CASES,
+                                           SentimentIntensityAnalyzer, normalize)
+
+
+# (compound, positive, negative, neutral), rounded exactly like polarity_scores
+Scores = Tuple[float, float, float, float]
+
+_NEGATE = frozenset(NEGATE)
+_SO_THIS = ("so", "this")
+
+# Words that can take part in a SPECIAL_CASES phrase or a multi-word booster;
+# a window without any of them cannot match one, so no n-grams are built for it
+_IDIOM_WORDS: FrozenSet[str] = frozenset(
+    word for phrase in list(SPECIAL_CASES) + [key for key in BOOSTER_DICT if ' ' in key]
+    for word in phrase.split(' ')
+)
+
+
+def _negated(word_lower: str) -> bool:
+    """vaderSentiment.negated for a single already lower-cased word."""
+    return word_lower in _NEGATE or "n't" in word_lower
+
+
+class VaderKernel:
+    def __init__(self, analyzer: SentimentIntensityAnalyzer):
+        """
+        Precompile an analyzer's lexicons into a faster polarity_scores.
+        
+        VADER lower-cases and re-joins the token list inside every rule it
+        applies, and rebuilds the text character by character to replace
+        emojis. This kernel tokenizes and lower-cases once, looks words up in
+        the analyzer's lexicon dict directly and only rewrites texts that
+        actually contain an emoji. Scores are identical to polarity_scores.
+        
+        Args:
+            analyzer: Analyzer whose lexicon and emoji lexicon are used
+        """
+        self.lexicon: Dict[str, float] = analyzer.lexicon
+        # polarity_scores looks emojis up one character at a time, so longer keys never match
+        self.emojis: Dict[str, str] = {emoji: description for emoji, description in analyzer.emojis.items()
+                                       if len(emoji) == 1}
+        self._emoji_chars = frozenset(self.emojis)
+        self.fast_path_checks = 0
+        self.fast_path_hits = 0
+    
+    def _replace_emojis(self, text: str) -> str:
+        """Swap emojis for their descriptions, spaced exactly like polarity_scores does."""
+        emojis = self.emojis
+        parts = []
+        prev_space = True
+        for char in text:
+            description = emojis.get(char)
+            if description is not None:
+                if not prev_space:
+                    parts.append(' ')
+                parts.append(description)
+                prev_space = False
+            else:
+                parts.append(char)
+                prev_space = char == ' '
+        return ''.join(parts)
+    
+    def lexicon_free_scores(self, text: str) -> Optional[Scores]:
+        """
+        Cheaply score a text that contains no lexicon word and no emoji.
+        
+        Only a word found in the lexicon can get a non-zero valence, and
+        boosters, negations and idioms merely adjust such a valence, so every
+        token of such a text scores 0 and VADER returns compound 0 and neu 1
+        (all zeros if there are no tokens). Lower-casing never creates or
+        removes punctuation or whitespace, so checking each lower-cased token
+        with and without its surrounding punctuation covers the token VADER
+        would look up.
+        
+        Args:
+            text: Text to check
+        
+        Returns:
+            The scores polarity_scores would return, or None if the text needs
+            the full rule pipeline
+        """
+        self.fast_path_checks += 1
+        if not self._emoji_chars.isdisjoint(text):
+            return None
+        
+        lexicon = self.lexicon
+        punctuation = string.punctuation
+        tokens = text.lower().split()
+        for token in tokens:
+            if token in lexicon or token.strip(punctuation) in lexicon:
+                return None
+        
+        self.fast_path_hits += 1
+        return (0.0, 0.0, 0.0, 1.0) if tokens else (0.0, 0.0, 0.0, 0.0)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get fast path statistics.
+        
+        Returns:
+            Dictionary with texts checked, texts that skipped the rule pipeline
+            and the resulting skip rate
+        """
+        checks = self.fast_path_checks
+        return {
+            "fast_path_checks": checks,
+            "fast_path_hits": self.fast_path_hits,
+            "fast_path_rate": self.fast_path_hits / checks if checks else 0.0
+        }
+    
+    def polarity_scores(self, text: str) -> Scores:
+        """
+        Score one text.
+        
+        Args:
+            text: Text to analyze
+        
+        Returns:
+            (compound, positive, negative, neutral), equal to the values of
+            SentimentIntensityAnalyzer.polarity_scores(text)
+        """
+        if not self._emoji_chars.isdisjoint(text):
+            text = self._replace_emojis(text)
+        text = text.strip()
+        
+        punctuation = string.punctuation
+        words = []
+        for token in text.split():
+            stripped = token.strip(punctuation)
+            words.append(token if len(stripped) <= 2 else stripped)
+        lower = [word.lower() for word in words]
+        
+        count = len(words)
+        allcap_words = 0
+        for word in words:
+            if word.isupper():
+                allcap_words += 1
+        is_cap_diff = 0 < count - allcap_words < count
+        
+        lexicon = self.lexicon
+        sentiments: List[float] = []
+        for i in range(count):
+            item_lower = lower[i]
+            if item_lower in BOOSTER_DICT or (item_lower == "kind" and i < count - 1 and lower[i + 1] == "of"):
+                sentiments.append(0)
+                continue
+            
+            base_valence = lexicon.get(item_lower)
+            if base_valence is None:
+                sentiments.append(0)
+                continue
+            
+            valence = base_valence
+            if item_lower == "no" and i != count - 1 and lower[i + 1] in lexicon:
+                valence = 0.0
+            if (i > 0 and lower[i - 1] == "no") \
+                    or (i > 1 and lower[i - 2] == "no") \
+                    or (i > 2 and lower[i - 3] == "no" and lower[i - 1] in ("or", "nor")):
+                valence = base_valence * N_SCALAR
+            
+            if is_cap_diff and words[i].isupper():
+                if valence > 0:
+                    valence += C_INCR
+                else:
+                    valence -= C_INCR
+            
+            for start_i in range(0, 3):
+                if i <= start_i:
+                    break
+                j = i - (start_i + 1)
+                previous = lower[j]
+                if previous in lexicon:
+                    continue
+                
+                # Booster / dampener just before the word (scalar_inc_dec)
+                scalar = 0.0
+                booster = BOOSTER_DICT.get(previous)
+                if booster is not None:
+                    scalar = booster
+                    if valence < 0:
+                        scalar *= -1
+                    if is_cap_diff and words[j].isupper():
+                        if valence > 0:
+                            scalar += C_INCR
+                        else:
+                            scalar -= C_INCR
+                if start_i == 1 and scalar != 0:
+                    scalar = scalar * 0.95
+                if start_i == 2 and scalar != 0:
+                    scalar = scalar * 0.9
+                valence = valence + scalar
+                
+                # Negation (_negation_check)
+                if start_i == 0:
+                    if _negated(previous):
+                        valence = valence * N_SCALAR
+                elif start_i == 1:
+                    if lower[i - 2] == "never" and lower[i - 1] in _SO_THIS:
+                        valence = valence * 1.25
+                    elif lower[i - 2] == "without" and lower[i - 1] == "doubt":
+                        pass
+                    elif _negated(previous):
+                        valence = valence * N_SCALAR
+                else:
+                    if (lower[i - 3] == "never" and lower[i - 2] in _SO_THIS) or lower[i - 1] in _SO_THIS:
+                        valence = valence * 1.25
+                    elif lower[i - 3] == "without" and (lower[i - 2] == "doubt" or lower[i - 1] == "doubt"):
+                        pass
+                    elif _negated(previous):
+                        valence = valence * N_SCALAR
+                    valence = self._special_idioms_check(valence, lower, i)
+            
+            # "least" (_least_check)
+            if i > 1 and lower[i - 1] not in lexicon and lower[i - 1] == "least":
+                if lower[i - 2] != "at" and lower[i - 2] != "very":
+                    valence = valence * N_SCALAR
+            elif i > 0 and lower[i - 1] not in lexicon and lower[i - 1] == "least":
+                valence = valence * N_SCALAR
+            
+            sentiments.append(valence)
+        
+        if "but" in lower:
+            self._but_check(lower, sentiments)
+        
+        return self._score_valence(sentiments, text)
+    
+    @staticmethod
+    def _special_idioms_check(valence: float, lower: List[str], i: int) -> float:
+        """SentimentIntensityAnalyzer._special_idioms_check, skipped when no idiom word is near."""
+        count = len(lower)
+        window = lower[i - 3:i + 3]
+        if _IDIOM_WORDS.isdisjoint(window):
+            return valence
+        
+        onezero = f"{lower[i - 1]} {lower[i]}"
+        twoonezero = f"{lower[i - 2]} {lower[i - 1]} {lower[i]}"
+        twoone = f"{lower[i - 2]} {lower[i - 1]}"
+        threetwoone = f"{lower[i - 3]} {lower[i - 2]} {lower[i - 1]}"
+        threetwo = f"{lower[i - 3]} {lower[i - 2]}"
+        
+        for sequence in (onezero, twoonezero, twoone, threetwoone, threetwo):
+            if sequence in SPECIAL_CASES:
+                valence = SPECIAL_CASES[sequence]
+                break
+        
+        if count - 1 > i:
+            zeroone = f"{lower[i]} {lower[i + 1]}"
+            if zeroone in SPECIAL_CASES:
+                valence = SPECIAL_CASES[zeroone]
+        if count - 1 > i + 1:
+            zeroonetwo = f"{lower[i]} {lower[i + 1]} {lower[i + 2]}"
+            if zeroonetwo in SPECIAL_CASES:
+                valence = SPECIAL_CASES[zeroonetwo]
+        
+        for n_gram in (threetwoone, threetwo, twoone):
+            if n_gram in BOOSTER_DICT:
+                valence = valence + BOOSTER_DICT[n_gram]
+        return valence
+    
+    @staticmethod
+    def _but_check(lower: List[str], sentiments: List[float]) -> None:
+        """
+        SentimentIntensityAnalyzer._but_check, in place.
+        
+        VADER locates each score with sentiments.index(), i.e. by value, so
+        repeated values rescale the first equal entry instead of the current
+        one. That behaviour is kept as is to stay score-for-score identical.
+        """
+        but_index = lower.index('but')
+        for sentiment in sentiments:
+            position = sentiments.index(sentiment)
+            if position < but_index:
+                sentiments.pop(position)
+                sentiments.insert(position, sentiment * 0.5)
+            elif position > but_index:
+                sentiments.pop(position)
+                sentiments.insert(position, sentiment * 1.5)
+    
+    @staticmethod
+    def _score_valence(sentiments: List[float], text: str) -> Scores:
+        """SentimentIntensityAnalyzer.score_valence, returning a tuple instead of a dict."""
+        if not sentiments:
+            return (0.0, 0.0, 0.0, 0.0)
+        
+        sum_s = float(sum(sentiments))
+        
+        ep_count = min(text.count("!"), 4)
+        qm_count = text.count("?")
+        qm_amplifier = 0
+        if qm_count > 1:
+            qm_amplifier = qm_count * 0.18 if qm_count <= 3 else 0.96
+        punct_emph_amplifier = ep_count * 0.292 + qm_amplifier
+        
+        if sum_s > 0:
+            sum_s += punct_emph_amplifier
+        elif sum_s < 0:
+            sum_s -= punct_emph_amplifier
+        compound = normalize(sum_s)
+        
+        pos_sum = 0.0
+        neg_sum = 0.0
+        neu_count = 0
+        for sentiment in sentiments:
+            if sentiment > 0:
+                pos_sum += (float(sentiment) + 1)
+            if sentiment < 0:
+                neg_sum += (float(sentiment) - 1)
+            if sentiment == 0:
+                neu_count += 1
+        
+        if pos_sum > math.fabs(neg_sum):
+            pos_sum += punct_emph_amplifier
+        elif pos_sum < math.fabs(neg_sum):
+            neg_sum -= punct_emph_amplifier
+        
+        total = pos_sum + math.fabs(neg_sum) + neu_count
+        return (round(compound, 4),
+                round(math.fabs(pos_sum / total), 3),
+                round(math.fabs(neg_sum / total), 3),
+                round(math.fabs(neu_count / total), 3))
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Set
+
+
+class WatermarkStore:
+    def __init__(self, path: str = "watermarks.json", max_ids_per_key: int = 500):
+        """
+        Initialize a persistent store of recently ingested post fullnames.
+        
+        Several recent fullnames are kept per feed rather than a single newest
+        one, so a deleted or removed post does not lose the watermark.
+        
+        Args:
+            path: JSON file the watermarks are persisted to
+            max_ids_per_key: Number of most recent fullnames remembered per feed
+        """
+        self.path = path
+        self.max_ids_per_key = max_ids_per_key
+        self._lock = threading.Lock()
+        self._watermarks: Dict[str, List[str]] = self._load()
+    
+    def _load(self) -> Dict[str, List[str]]:
+        """Load watermarks from disk, starting empty if the file is missing or corrupt."""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return {key: list(value) for key, value in data.items()}
+        except Exception:
+            pass
+        return {}
+    
+    def _save(self) -> None:
+        """Persist watermarks atomically so a crash never leaves a torn file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._watermarks, f)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def get_seen(self, key: str) -> Set[str]:
+        """
+        Get the fullnames already ingested for a feed.
+        
+        Args:
+            key: Feed identifier, e.g. "wallstreetbets/new"
+        
+        Returns:
+            Set of post fullnames (e.g. "t3_abc123")
+        """
+        with self._lock:
+            return set(self._watermarks.get(key, []))
+    
+    def add_seen(self, key: str, fullnames: List[str]) -> None:
+        """
+        Record newly ingested fullnames (newest first) and persist the store.
+        
+        Args:
+            key: Feed identifier, e.g. "wallstreetbets/new"
+            fullnames: Post fullnames in listing order (newest first)
+        """
+        if not fullnames:
+            return
+        
+        with self._lock:
+            known = self._watermarks.get(key, [])
+            known_set = set(known)
+            new_ids = [name for name in fullnames if name not in known_set]
+            self._watermarks[key] = (new_ids + known)[:self.max_ids_per_key]
+            self._save()
+    
+    def clear(self, key: str) -> None:
+        """Forget the watermark for a feed so the next fetch is a full crawl."""
+        with self._lock:
+            if self._watermarks.pop(key, None) is not None:
+                self._save()
\ No newline at end of file